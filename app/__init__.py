@@ -1,14 +1,13 @@
 import os
-import shutil
-from datetime import datetime
 
 from dotenv import load_dotenv
 from flask import Flask
 from flask_wtf.csrf import generate_csrf
-from sqlalchemy import text
 from werkzeug.middleware.proxy_fix import ProxyFix
 
+from app.cli import register_cli
 from app.config import config_by_env
+from app.db_routing import REPLICA_BIND
 from app.errors import register_error_handlers
 from app.extensions import bcrypt, cache, csrf, db, limiter, login_manager, migrate
 from app.models import User
@@ -16,8 +15,11 @@ from app.routes.api.v1 import api_v1_bp
 from app.routes.web.admin import web_admin_bp
 from app.routes.web.auth import web_auth_bp
 from app.routes.web.dashboard import web_dashboard_bp
+from app.routes.web.media import web_media_bp
 from app.routes.web.receipt import web_receipt_bp
-from app.services import NotificationService
+from app.schema_compat import apply_schema_fixes, schema_fixes_pending
+from app.services import MediaStorage, NotificationService
+from app.sqlite_profile import register_sqlite_profile
 
 
 @login_manager.user_loader
@@ -42,18 +44,22 @@ def create_app():
     app.config.from_object(config_by_env.get(env, config_by_env["development"]))
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_port=1)
 
-    db_uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
-    if db_uri.startswith("sqlite:///") and not db_uri.startswith("sqlite:////") and db_uri != "sqlite:///:memory:":
-        relative_path = db_uri.replace("sqlite:///", "", 1)
-        absolute_path = os.path.join(project_root, relative_path)
-        os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
-        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{absolute_path}"
+    app.config["SQLALCHEMY_DATABASE_URI"] = _resolve_sqlite_uri(app.config.get("SQLALCHEMY_DATABASE_URI", ""), project_root)
+    replica_uri = app.config.get("DATABASE_REPLICA_URL")
+    if replica_uri:
+        binds = dict(app.config.get("SQLALCHEMY_BINDS") or {})
+        binds[REPLICA_BIND] = _resolve_sqlite_uri(replica_uri, project_root)
+        app.config["SQLALCHEMY_BINDS"] = binds
 
     upload_dir = app.config["UPLOAD_DIR"]
     if not os.path.isabs(upload_dir):
         upload_dir = os.path.join(project_root, upload_dir)
     app.config["UPLOAD_DIR"] = upload_dir
 
+    pincode_index_path = app.config.get("PINCODE_INDEX_PATH")
+    if pincode_index_path and not os.path.isabs(pincode_index_path):
+        app.config["PINCODE_INDEX_PATH"] = os.path.join(project_root, pincode_index_path)
+
     os.makedirs(app.instance_path, exist_ok=True)
     os.makedirs(app.config["UPLOAD_DIR"], exist_ok=True)
 
@@ -68,20 +74,20 @@ def create_app():
     _init_sentry(app)
 
     register_error_handlers(app)
+    register_cli(app)
 
     app.register_blueprint(web_auth_bp)
     app.register_blueprint(web_dashboard_bp)
+    app.register_blueprint(web_media_bp)
     app.register_blueprint(web_receipt_bp)
     app.register_blueprint(web_admin_bp)
     app.register_blueprint(api_v1_bp, url_prefix="/api/v1")
 
-    if env == "development":
-        with app.app_context():
-            _ensure_dev_schema(app)
-            _ensure_sqlite_runtime_compat(app)
-    else:
-        with app.app_context():
-            _ensure_sqlite_runtime_compat(app)
+    with app.app_context():
+        register_sqlite_profile(app)
+        _check_schema_fixes(app, env)
+
+    app.jinja_env.globals["media_url"] = MediaStorage.url
 
     @app.context_processor
     def inject_csrf_token():
@@ -91,8 +97,9 @@ def create_app():
             from flask_login import current_user
 
             if current_user.is_authenticated:
-                unread_count = NotificationService.unread_count(current_user.id)
-                notifications = NotificationService.latest_for_user(current_user.id, limit=8)
+                summary = NotificationService.navbar_summary(current_user.id)
+                unread_count = summary["unread_count"]
+                notifications = summary["notifications"]
         except Exception:
             pass
         return {
@@ -104,6 +111,33 @@ def create_app():
     return app
 
 
+def _resolve_sqlite_uri(db_uri, project_root):
+    """Relative SQLite paths are taken from the project root rather than the working directory."""
+    if db_uri.startswith("sqlite:///") and not db_uri.startswith("sqlite:////") and db_uri != "sqlite:///:memory:":
+        relative_path = db_uri.replace("sqlite:///", "", 1)
+        absolute_path = os.path.join(project_root, relative_path)
+        os.makedirs(os.path.dirname(absolute_path), exist_ok=True)
+        return f"sqlite:///{absolute_path}"
+    return db_uri
+
+
+def _check_schema_fixes(app, env):
+    """
+    Boot only reads the recorded fix version; table scans and ALTERs run from
+    `flask apply-schema-fixes`, except in development where they run automatically.
+    """
+    try:
+        if not schema_fixes_pending(app):
+            return
+        if env == "development":
+            apply_schema_fixes(app, allow_legacy_reset=True)
+        else:
+            app.logger.warning("SQLite schema fixes are pending; run `flask apply-schema-fixes`.")
+    except Exception as exc:
+        db.session.rollback()
+        app.logger.warning("SQLite schema compatibility check skipped: %s", exc)
+
+
 def _init_sentry(app):
     dsn = app.config.get("SENTRY_DSN")
     if not dsn:
@@ -121,157 +155,3 @@ def _init_sentry(app):
         app.logger.info("Sentry initialized.")
     except Exception as exc:
         app.logger.warning("Sentry initialization failed: %s", exc)
-
-
-def _ensure_dev_schema(app):
-    """
-    Development convenience:
-    - If legacy SQLite schema is detected (old MVP columns), backup DB and recreate.
-    - Otherwise just ensure tables exist.
-    """
-    db_uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
-    db_file = None
-    if db_uri.startswith("sqlite:////"):
-        db_file = db_uri.replace("sqlite:////", "/", 1)
-
-    if db_file and os.path.exists(db_file):
-        try:
-            result = db.session.execute(text("PRAGMA table_info(users)"))
-            rows = result.fetchall()
-            columns = {row[1] for row in rows}
-            id_type = next((row[2] for row in rows if row[1] == "id"), "")
-            # New schema expects full_name + updated_at.
-            is_legacy_users = (
-                "full_name" not in columns
-                or "phone" not in columns
-                or "updated_at" not in columns
-                or str(id_type).upper() != "INTEGER"
-            )
-            tractor_columns = {row[1] for row in db.session.execute(text("PRAGMA table_info(tractors)")).fetchall()}
-            booking_columns = {row[1] for row in db.session.execute(text("PRAGMA table_info(bookings)")).fetchall()}
-            payment_table_exists = (
-                db.session.execute(
-                    text("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name='payments'")
-                ).scalar()
-                > 0
-            )
-            missing_new_columns = (
-                "average_rating" not in tractor_columns
-                or "pincode" not in tractor_columns
-                or "village" not in tractor_columns
-                or "district" not in tractor_columns
-                or "paid_at" not in booking_columns
-                or "owner_id" not in booking_columns
-                or not payment_table_exists
-            )
-
-            if is_legacy_users or missing_new_columns:
-                backup = f"{db_file}.legacy-backup-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
-                shutil.copy2(db_file, backup)
-                app.logger.warning("Legacy DB detected. Backed up to %s and recreating schema.", backup)
-                db.drop_all()
-                db.create_all()
-                return
-        except Exception:
-            # If introspection fails, continue with best effort create_all.
-            pass
-
-    db.create_all()
-
-
-def _ensure_sqlite_runtime_compat(app):
-    """
-    Production-safe SQLite compatibility guard.
-    Adds missing columns required by newer models without destructive resets.
-    """
-    db_uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
-    if not db_uri.startswith("sqlite:"):
-        return
-
-    def table_exists(table_name):
-        return (
-            db.session.execute(
-                text("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name=:name"),
-                {"name": table_name},
-            ).scalar()
-            > 0
-        )
-
-    def column_exists(table_name, column_name):
-        rows = db.session.execute(text(f"PRAGMA table_info({table_name})")).fetchall()
-        return any(row[1] == column_name for row in rows)
-
-    def sanitize_datetime_columns(table_name, columns):
-        if not table_exists(table_name):
-            return
-        table_info = {row[1]: row for row in db.session.execute(text(f"PRAGMA table_info({table_name})")).fetchall()}
-        for col in columns:
-            if col not in table_info:
-                continue
-            # PRAGMA table_info: row[3] => 1 means NOT NULL
-            is_not_null = bool(table_info[col][3])
-            replacement = "datetime('now')" if is_not_null else "NULL"
-            db.session.execute(
-                text(
-                    f"""
-                    UPDATE {table_name}
-                    SET {col} = {replacement}
-                    WHERE {col} IS NOT NULL
-                      AND typeof({col}) != 'text'
-                    """
-                )
-            )
-
-    try:
-        if table_exists("users"):
-            if not column_exists("users", "phone"):
-                db.session.execute(text("ALTER TABLE users ADD COLUMN phone TEXT NOT NULL DEFAULT ''"))
-            if not column_exists("users", "is_verified_owner"):
-                db.session.execute(text("ALTER TABLE users ADD COLUMN is_verified_owner INTEGER NOT NULL DEFAULT 0"))
-            if not column_exists("users", "last_login"):
-                db.session.execute(text("ALTER TABLE users ADD COLUMN last_login DATETIME"))
-            # Guard against legacy/bad datetime storage that breaks SQLAlchemy DateTime parsing.
-            sanitize_datetime_columns("users", ["created_at", "updated_at", "last_login"])
-
-        if table_exists("tractors"):
-            if not column_exists("tractors", "pincode"):
-                db.session.execute(text("ALTER TABLE tractors ADD COLUMN pincode TEXT NOT NULL DEFAULT ''"))
-            if not column_exists("tractors", "village"):
-                db.session.execute(text("ALTER TABLE tractors ADD COLUMN village TEXT"))
-            if not column_exists("tractors", "district"):
-                db.session.execute(text("ALTER TABLE tractors ADD COLUMN district TEXT"))
-            if not column_exists("tractors", "equipment_type"):
-                db.session.execute(
-                    text("ALTER TABLE tractors ADD COLUMN equipment_type TEXT NOT NULL DEFAULT 'Tractor'")
-                )
-            if not column_exists("tractors", "availability_status"):
-                db.session.execute(
-                    text("ALTER TABLE tractors ADD COLUMN availability_status TEXT NOT NULL DEFAULT 'available'")
-                )
-            sanitize_datetime_columns("tractors", ["created_at", "updated_at"])
-
-        sanitize_datetime_columns(
-            "bookings",
-            [
-                "start_time",
-                "end_time",
-                "accepted_at",
-                "en_route_at",
-                "started_at",
-                "completed_at",
-                "farmer_confirmed_at",
-                "cancelled_at",
-                "paid_at",
-                "created_at",
-                "updated_at",
-            ],
-        )
-        sanitize_datetime_columns("notifications", ["created_at", "updated_at"])
-        sanitize_datetime_columns("payments", ["created_at", "updated_at"])
-        sanitize_datetime_columns("reviews", ["created_at", "updated_at"])
-        sanitize_datetime_columns("owner_earnings", ["created_at", "updated_at"])
-
-        db.session.commit()
-    except Exception as exc:
-        db.session.rollback()
-        app.logger.warning("SQLite runtime compatibility migration skipped: %s", exc)
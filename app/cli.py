@@ -0,0 +1,85 @@
+import click
+
+from app.extensions import db
+from app.schema_compat import SCHEMA_FIX_VERSION, apply_schema_fixes, repair_sqlite_datetimes
+
+from app.services import AnalyticsService, DemandService, EarningService, JobService, MediaStorage, PincodeIndex, TractorService
+
+
+def register_cli(app):
+    @app.cli.command("run-jobs")
+    @click.option("--once", is_flag=True, help="Run one batch of due jobs and exit.")
+    def run_jobs(once):
+        """Process queued background jobs (same loop as worker.py)."""
+        if once:
+            ran = JobService.run_pending(limit=app.config["JOB_BATCH_SIZE"])
+            click.echo(f"Ran {ran} job(s).")
+            return
+        JobService.run_worker()
+
+    @app.cli.command("rebuild-demand")
+    def rebuild_demand():
+        """Recount active bookings per pincode to repair surge counter drift."""
+        pincodes = DemandService.rebuild()
+        click.echo(f"Demand counters rebuilt: {pincodes} pincode(s) with active bookings.")
+
+    @app.cli.command("rebuild-owner-earnings")
+    def rebuild_owner_earnings():
+        """Recompute per-owner earnings totals from owner_earnings."""
+        owners = EarningService.rebuild()
+        click.echo(f"Owner earnings summaries rebuilt for {owners} owner(s).")
+
+    @app.cli.command("rebuild-analytics")
+    def rebuild_analytics():
+        """Recompute the daily revenue/booking rollups behind the admin analytics pages."""
+        rows = AnalyticsService.rebuild()
+        click.echo(f"Analytics rollups rebuilt: {rows} day/owner/tractor row(s).")
+
+    @app.cli.command("rebuild-geo-cells")
+    def rebuild_geo_cells():
+        """Backfill tractors.geo_cell from listing coordinates."""
+        changed = TractorService.rebuild_geo_cells()
+        click.echo(f"Geo cells updated for {changed} listing(s).")
+
+    @app.cli.command("rebuild-image-variants")
+    def rebuild_image_variants():
+        """Create resized, metadata-free renditions for listings uploaded before variants existed."""
+        built = TractorService.rebuild_image_variants(app.config["UPLOAD_DIR"])
+        click.echo(f"Image variants generated for {built} listing(s).")
+
+    @app.cli.command("gc-media")
+    @click.option("--dry-run", is_flag=True, help="List what would be deleted without deleting it.")
+    def gc_media(dry_run):
+        """Recount media references and delete stored images no listing uses."""
+        grace_seconds = app.config["MEDIA_GC_GRACE_HOURS"] * 3600
+        removed = MediaStorage.collect_garbage(grace_seconds, dry_run=dry_run)
+        for key in removed:
+            click.echo(key)
+        click.echo(f"{'Would delete' if dry_run else 'Deleted'} {len(removed)} media object(s).")
+
+    @app.cli.command("build-pincode-index")
+    @click.argument("source", type=click.Path(exists=True, dir_okay=False))
+    @click.option("--output", default=None, help="Defaults to PINCODE_INDEX_PATH.")
+    def build_pincode_index(source, output):
+        """Build the offline lat/lon -> pincode index from a pincode centroid CSV."""
+        output = output or app.config["PINCODE_INDEX_PATH"]
+        count = PincodeIndex.build(source, output)
+        click.echo(f"Pincode index written to {output} with {count} pincode(s).")
+
+    @app.cli.command("apply-schema-fixes")
+    def apply_schema_fixes_command():
+        """Create missing tables and apply SQLite column/data fixes, then record the fix version."""
+        if apply_schema_fixes(app):
+            click.echo(f"Schema fixes applied (version {SCHEMA_FIX_VERSION}).")
+        else:
+            click.echo("Not a SQLite database; nothing to do. Its schema is managed by `flask db upgrade`.")
+
+    @app.cli.command("repair-datetimes")
+    def repair_datetimes():
+        """One-time fix for legacy non-text datetime values on SQLite."""
+        if db.engine.url.get_backend_name() != "sqlite":
+            click.echo("Not a SQLite database; nothing to repair.")
+            return
+        changed = repair_sqlite_datetimes(db.session)
+        db.session.commit()
+        click.echo(f"Repaired {changed} datetime value(s).")
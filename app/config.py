@@ -13,13 +13,54 @@ class BaseConfig:
     SQLALCHEMY_DATABASE_URI = normalize_database_url(
         os.getenv("DATABASE_URL", "sqlite:///instance/uzhavango.db")
     )
+    # Optional read replica for GET-only dashboards (see app.decorators.read_replica).
+    DATABASE_REPLICA_URL = normalize_database_url(os.getenv("DATABASE_REPLICA_URL", ""))
+    REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "5"))
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ENGINE_OPTIONS = {
         "pool_pre_ping": True,
         "pool_recycle": 300,
     }
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_FOREIGN_KEYS = os.getenv("SQLITE_FOREIGN_KEYS", "true").lower() == "true"
     CACHE_TYPE = os.getenv("CACHE_TYPE", "SimpleCache")
     CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "120"))
+    PLATFORM_SETTINGS_TTL = int(os.getenv("PLATFORM_SETTINGS_TTL", "30"))
+    ADMIN_KPI_CACHE_TTL = int(os.getenv("ADMIN_KPI_CACHE_TTL", "60"))
+    # "local" fans out inside one process; "postgres" uses LISTEN/NOTIFY across every worker.
+    EVENT_BROKER = os.getenv("EVENT_BROKER", "local")
+    EVENT_BROKER_URL = normalize_database_url(os.getenv("EVENT_BROKER_URL", ""))
+    EVENT_STREAM_MAX_SECONDS = int(os.getenv("EVENT_STREAM_MAX_SECONDS", "55"))
+    EVENT_STREAM_HEARTBEAT_SECONDS = int(os.getenv("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+    PINCODE_INDEX_PATH = os.getenv("PINCODE_INDEX_PATH", "instance/pincode_index.bin")
+    PINCODE_INDEX_MAX_KM = float(os.getenv("PINCODE_INDEX_MAX_KM", "15"))
+    TRACTOR_SEARCH_RADIUS_KM = float(os.getenv("TRACTOR_SEARCH_RADIUS_KM", "25"))
+    WEATHER_API_URL = os.getenv("WEATHER_API_URL", "https://api.open-meteo.com/v1/forecast")
+    WEATHER_CACHE_TTL = int(os.getenv("WEATHER_CACHE_TTL", "1800"))
+    WEATHER_CACHE_STALE_SECONDS = int(os.getenv("WEATHER_CACHE_STALE_SECONDS", "3600"))
+    WEATHER_COORD_PRECISION = int(os.getenv("WEATHER_COORD_PRECISION", "2"))
+    WEATHER_TIMEOUT_SECONDS = float(os.getenv("WEATHER_TIMEOUT_SECONDS", "3"))
+    GEOCODE_TIMEOUT_SECONDS = float(os.getenv("GEOCODE_TIMEOUT_SECONDS", "4"))
+    LOCATION_SEARCH_BUDGET_SECONDS = float(os.getenv("LOCATION_SEARCH_BUDGET_SECONDS", "5"))
+    IO_POOL_WORKERS = int(os.getenv("IO_POOL_WORKERS", "8"))
+    IO_POOL_MAX_PENDING = int(os.getenv("IO_POOL_MAX_PENDING", "64"))
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+    HTTP_PER_HOST_LIMIT = int(os.getenv("HTTP_PER_HOST_LIMIT", "8"))
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+    HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.2"))
+    HTTP_BREAKER_THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+    HTTP_BREAKER_COOLDOWN = float(os.getenv("HTTP_BREAKER_COOLDOWN", "30"))
+    JOBS_EAGER = os.getenv("JOBS_EAGER", "false").lower() == "true"
+    JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "2"))
+    JOB_BATCH_SIZE = int(os.getenv("JOB_BATCH_SIZE", "10"))
+    JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+    JOB_RETRY_BASE_SECONDS = float(os.getenv("JOB_RETRY_BASE_SECONDS", "10"))
+    JOB_LOCK_TIMEOUT_SECONDS = int(os.getenv("JOB_LOCK_TIMEOUT_SECONDS", "300"))
+    JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
     RATELIMIT_STORAGE_URI = os.getenv("RATELIMIT_STORAGE_URI", "memory://")
     RATELIMIT_DEFAULT = os.getenv("RATELIMIT_DEFAULT", "200 per day;80 per hour")
 
@@ -30,16 +71,22 @@ class BaseConfig:
     REMEMBER_COOKIE_HTTPONLY = True
 
     MAX_CONTENT_LENGTH = int(os.getenv("MAX_UPLOAD_MB", "5")) * 1024 * 1024
+    MAX_IMAGE_BYTES = int(float(os.getenv("MAX_IMAGE_MB", "4")) * 1024 * 1024)
     UPLOAD_DIR = os.getenv("UPLOAD_DIR", "static/uploads")
     MEDIA_BACKEND = os.getenv("MEDIA_BACKEND", "local")
     S3_BUCKET = os.getenv("S3_BUCKET")
     S3_REGION = os.getenv("S3_REGION")
+    S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")
+    MEDIA_URL_BASE = os.getenv("MEDIA_URL_BASE")
+    MEDIA_GC_GRACE_HOURS = int(os.getenv("MEDIA_GC_GRACE_HOURS", "24"))
     SENTRY_DSN = os.getenv("SENTRY_DSN")
 
 
 class DevelopmentConfig(BaseConfig):
     DEBUG = True
     SESSION_COOKIE_SECURE = False
+    # `flask run` alone has no job worker, so side effects run inline unless one is started.
+    JOBS_EAGER = os.getenv("JOBS_EAGER", "true").lower() == "true"
 
 
 class ProductionConfig(BaseConfig):
@@ -51,6 +98,7 @@ class ProductionConfig(BaseConfig):
 class TestingConfig(BaseConfig):
     TESTING = True
     WTF_CSRF_ENABLED = False
+    JOBS_EAGER = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
 
 
@@ -0,0 +1,53 @@
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+
+UPSERT_ATTEMPTS = 3
+
+
+def insert_unless_exists(instance):
+    """
+    Insert `instance` in a savepoint; returns False instead of raising when a
+    unique key says another transaction already inserted the same row.
+    """
+    try:
+        with db.session.begin_nested():
+            db.session.add(instance)
+    except IntegrityError:
+        return False
+    return True
+
+
+def upsert_counter(model, keys, deltas, returning=None, attempts=UPSERT_ATTEMPTS):
+    """
+    Add `deltas` to the counter columns of the `model` row matching `keys`, creating
+    the row with `deltas` as its initial values when there is none yet.
+
+    The atomic UPDATE makes concurrent writers queue on the row lock; only the first
+    write for a key inserts, and losing that insert race retries the UPDATE. Returns
+    the new value of the `returning` column, if one is named.
+    """
+    columns = {name: getattr(model, name) for name in deltas}
+    for attempt in range(attempts):
+        statement = (
+            update(model)
+            .where(*(getattr(model, name) == value for name, value in keys.items()))
+            .values({column: column + deltas[name] for name, column in columns.items()})
+            .execution_options(synchronize_session=False)
+        )
+        if returning is not None:
+            value = db.session.execute(statement.returning(getattr(model, returning))).scalar()
+            if value is not None:
+                return value
+        elif db.session.execute(statement).rowcount:
+            return None
+        try:
+            with db.session.begin_nested():
+                db.session.add(model(**keys, **deltas))
+        except IntegrityError:
+            # Another transaction created the row first; retry the UPDATE against it.
+            if attempt + 1 == attempts:
+                raise
+            continue
+        return deltas.get(returning) if returning is not None else None
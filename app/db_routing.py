@@ -0,0 +1,60 @@
+import time
+from contextlib import contextmanager
+
+from flask import current_app, has_request_context, session as http_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+REPLICA_BIND = "replica"
+PRIMARY_UNTIL_KEY = "_db_primary_until"
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the "replica" bind while the current request is marked
+    replica-safe (see app.decorators.read_replica). Flushes, and every statement after
+    the first write in the same session, stay on the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self.info.get("use_replica") and not self.info.get("wrote") and not self._flushing:
+            replica = self._db.engines.get(REPLICA_BIND)
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_wrote(db_session, _flush_context):
+    db_session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _stick_to_primary(db_session):
+    # Read-your-writes across requests: this browser reads from the primary until the
+    # replica has had time to catch up with what it just committed.
+    if not db_session.info.get("wrote") or not has_request_context() or not replica_configured():
+        return
+    http_session[PRIMARY_UNTIL_KEY] = time.time() + current_app.config.get("REPLICA_STICKY_SECONDS", 5)
+
+
+@contextmanager
+def primary_reads(db_session):
+    """Send the enclosed reads to the primary, even inside a read_replica view."""
+    routed = db_session.info.pop("use_replica", None)
+    try:
+        yield
+    finally:
+        if routed is not None:
+            db_session.info["use_replica"] = routed
+
+
+def replica_configured():
+    return REPLICA_BIND in (current_app.config.get("SQLALCHEMY_BINDS") or {})
+
+
+def replica_allowed():
+    """False while this client is pinned to the primary after its own writes."""
+    if not replica_configured():
+        return False
+    return not has_request_context() or http_session.get(PRIMARY_UNTIL_KEY, 0) <= time.time()
@@ -3,6 +3,9 @@ from functools import wraps
 from flask import abort
 from flask_login import current_user
 
+from app.db_routing import replica_allowed
+from app.extensions import db
+
 
 def role_required(*roles):
     def wrapper(func):
@@ -17,3 +20,19 @@ def role_required(*roles):
         return inner
 
     return wrapper
+
+
+def read_replica(func):
+    """Run a GET-only view's queries against DATABASE_REPLICA_URL when one is configured."""
+
+    @wraps(func)
+    def inner(*args, **kwargs):
+        if not replica_allowed():
+            return func(*args, **kwargs)
+        db.session.info["use_replica"] = True
+        try:
+            return func(*args, **kwargs)
+        finally:
+            db.session.info.pop("use_replica", None)
+
+    return inner
@@ -4,6 +4,8 @@ from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 from flask_wtf import CSRFProtect
 
+from app.db_routing import RoutingSession
+
 try:
     from flask_caching import Cache
 except Exception:  # pragma: no cover - fallback for minimal local envs
@@ -19,6 +21,18 @@ except Exception:  # pragma: no cover - fallback for minimal local envs
 
             return decorator
 
+        def get(self, key):
+            _ = key
+            return None
+
+        def set(self, key, value, timeout=None):
+            _ = key, value, timeout
+            return True
+
+        def delete(self, key):
+            _ = key
+            return True
+
 try:
     from flask_limiter import Limiter
     from flask_limiter.util import get_remote_address
@@ -36,11 +50,14 @@ except Exception:  # pragma: no cover - fallback for minimal local envs
 
             return decorator
 
+        def exempt(self, func):
+            return func
+
     def get_remote_address():  # type: ignore[override]
         return "127.0.0.1"
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
 bcrypt = Bcrypt()
 csrf = CSRFProtect()
@@ -1,23 +1,37 @@
 from app.models.booking import Booking
 from app.models.booking_addon import BookingAddon
 from app.models.chat_message import ChatMessage
+from app.models.daily_revenue_rollup import DailyRevenueRollup
 from app.models.earning import OwnerEarning
+from app.models.job import Job
+from app.models.media_object import MediaObject
 from app.models.notification import Notification
+from app.models.owner_earning_summary import OwnerEarningSummary
 from app.models.payment import Payment
+from app.models.pincode_demand import PincodeDemand
 from app.models.platform_setting import PlatformSetting
+from app.models.receipt_sequence import ReceiptSequence
 from app.models.review import Review
 from app.models.tractor import Tractor
+from app.models.tractor_reservation import TractorReservation
 from app.models.user import User
 
 __all__ = [
     "User",
     "Tractor",
+    "TractorReservation",
     "Booking",
     "BookingAddon",
     "ChatMessage",
+    "DailyRevenueRollup",
+    "Job",
+    "MediaObject",
     "Review",
     "Notification",
     "OwnerEarning",
+    "OwnerEarningSummary",
     "Payment",
+    "PincodeDemand",
     "PlatformSetting",
+    "ReceiptSequence",
 ]
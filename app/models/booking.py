@@ -45,5 +45,7 @@ class Booking(TimestampMixin, db.Model):
     __table_args__ = (
         db.Index("ix_bookings_farmer_status", "farmer_id", "status"),
         db.Index("ix_bookings_tractor_status", "tractor_id", "status"),
+        db.Index("ix_bookings_owner_status", "owner_id", "status"),
+        db.Index("ix_bookings_owner_created", "owner_id", "created_at", "id"),
         db.CheckConstraint("hours > 0", name="ck_booking_hours_positive"),
     )
@@ -13,3 +13,7 @@ class ChatMessage(TimestampMixin, db.Model):
     booking = db.relationship("Booking")
     sender = db.relationship("User", back_populates="sent_messages", foreign_keys=[sender_id])
 
+    __table_args__ = (
+        # Matches the id cursor in ChatService.list_messages (after_id / before_id / latest page).
+        db.Index("ix_chat_messages_booking_cursor", "booking_id", "id"),
+    )
@@ -0,0 +1,24 @@
+from app.extensions import db
+from app.models.base import PKType, TimestampMixin
+from app.time_buckets import time_bucket
+
+
+class DailyRevenueRollup(TimestampMixin, db.Model):
+    """Per-day booking and payment totals for one owner's tractor, kept in step by AnalyticsService."""
+
+    __tablename__ = "daily_revenue_rollups"
+
+    day = db.Column(db.Date, primary_key=True)
+    owner_id = db.Column(PKType, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True, index=True)
+    tractor_id = db.Column(PKType, db.ForeignKey("tractors.id", ondelete="CASCADE"), primary_key=True, index=True)
+    bookings_count = db.Column(db.Integer, nullable=False, default=0)
+    paid_count = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    commission = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    payout = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+
+    # Match AnalyticsService's weekly/monthly GROUP BY expressions on each dialect.
+    __table_args__ = (
+        db.Index("ix_daily_revenue_rollups_week", time_bucket(day, "week")),
+        db.Index("ix_daily_revenue_rollups_month", time_bucket(day, "month")),
+    )
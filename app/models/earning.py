@@ -13,3 +13,8 @@ class OwnerEarning(TimestampMixin, db.Model):
     net_amount = db.Column(db.Numeric(12, 2), nullable=False)
 
     owner = db.relationship("User", back_populates="earnings")
+    booking = db.relationship("Booking")
+
+    __table_args__ = (
+        db.Index("ix_owner_earnings_owner_created", "owner_id", "created_at"),
+    )
@@ -0,0 +1,22 @@
+from app.extensions import db
+from app.models.base import PKType, TimestampMixin
+
+
+class Job(TimestampMixin, db.Model):
+    """Queued side effect, run by worker.py after the request that enqueued it has committed."""
+
+    __tablename__ = "jobs"
+
+    id = db.Column(PKType, primary_key=True, autoincrement=True)
+    name = db.Column(db.String(64), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default="{}")
+    idempotency_key = db.Column(db.String(160), nullable=True, unique=True)
+    status = db.Column(db.String(16), nullable=False, default="pending")
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    run_at = db.Column(db.DateTime(timezone=True), nullable=False)
+    locked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    locked_by = db.Column(db.String(64), nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+
+    __table_args__ = (db.Index("ix_jobs_status_run_at", "status", "run_at"),)
@@ -0,0 +1,15 @@
+from app.extensions import db
+from app.models.base import TimestampMixin
+
+
+class MediaObject(TimestampMixin, db.Model):
+    """A content-addressed file in media storage and how many columns pointed at it at the last gc-media."""
+
+    __tablename__ = "media_objects"
+
+    key = db.Column(db.String(255), primary_key=True)
+    content_type = db.Column(db.String(64), nullable=False)
+    size_bytes = db.Column(db.Integer, nullable=False, default=0)
+    ref_count = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (db.Index("ix_media_objects_ref_count", "ref_count"),)
@@ -0,0 +1,14 @@
+from app.extensions import db
+from app.models.base import PKType, TimestampMixin
+
+
+class OwnerEarningSummary(TimestampMixin, db.Model):
+    """Running totals of owner_earnings per owner, kept in step by EarningService."""
+
+    __tablename__ = "owner_earning_summaries"
+
+    owner_id = db.Column(PKType, db.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    earnings_count = db.Column(db.Integer, nullable=False, default=0)
+    gross_total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    platform_fee_total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
+    net_total = db.Column(db.Numeric(14, 2), nullable=False, default=0)
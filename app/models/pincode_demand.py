@@ -0,0 +1,13 @@
+from app.extensions import db
+from app.models.base import TimestampMixin
+
+
+class PincodeDemand(TimestampMixin, db.Model):
+    __tablename__ = "pincode_demand"
+
+    pincode = db.Column(db.String(6), primary_key=True)
+    active_bookings = db.Column(db.Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        db.CheckConstraint("active_bookings >= 0", name="ck_pincode_demand_non_negative"),
+    )
@@ -0,0 +1,10 @@
+from app.extensions import db
+from app.models.base import TimestampMixin
+
+
+class ReceiptSequence(TimestampMixin, db.Model):
+    __tablename__ = "receipt_sequences"
+
+    # UTC date in YYYYMMDD form, matching the receipt number prefix.
+    day = db.Column(db.String(8), primary_key=True)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
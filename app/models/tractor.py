@@ -11,10 +11,14 @@ class Tractor(TimestampMixin, db.Model):
     description = db.Column(db.Text, nullable=True)
     price_per_hour = db.Column(db.Numeric(10, 2), nullable=False)
     image_path = db.Column(db.String(500), nullable=True)
+    image_card_path = db.Column(db.String(500), nullable=True)
+    image_thumb_path = db.Column(db.String(500), nullable=True)
 
     latitude = db.Column(db.Numeric(10, 7), nullable=True)
     longitude = db.Column(db.Numeric(10, 7), nullable=True)
     location_label = db.Column(db.String(255), nullable=True)
+    # Grid cell of (latitude, longitude); see GeoService.cell_for.
+    geo_cell = db.Column(db.Integer, nullable=True, index=True)
     pincode = db.Column(db.String(6), nullable=False, index=True, default="")
     village = db.Column(db.String(120), nullable=True)
     district = db.Column(db.String(120), nullable=True)
@@ -30,6 +34,15 @@ class Tractor(TimestampMixin, db.Model):
     bookings = db.relationship("Booking", back_populates="tractor", lazy="dynamic")
     reviews = db.relationship("Review", back_populates="tractor", lazy="dynamic")
 
+    @property
+    def card_image(self):
+        # Listings uploaded before variants existed only have the original.
+        return self.image_card_path or self.image_path
+
+    @property
+    def thumb_image(self):
+        return self.image_thumb_path or self.image_card_path or self.image_path
+
     __table_args__ = (
         db.Index("ix_tractors_owner_available", "owner_id", "is_available"),
         db.Index("ix_tractors_created_at", "created_at"),
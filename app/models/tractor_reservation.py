@@ -0,0 +1,52 @@
+from sqlalchemy import DDL, event
+
+from app.extensions import db
+from app.models.base import PKType, TimestampMixin
+
+
+class TractorReservation(TimestampMixin, db.Model):
+    """Time slot held by a live booking; cancelled bookings release their row."""
+
+    __tablename__ = "tractor_reservations"
+
+    id = db.Column(PKType, primary_key=True, autoincrement=True)
+    tractor_id = db.Column(PKType, db.ForeignKey("tractors.id", ondelete="CASCADE"), nullable=False)
+    booking_id = db.Column(PKType, db.ForeignKey("bookings.id", ondelete="CASCADE"), nullable=False, unique=True)
+    start_time = db.Column(db.DateTime(timezone=True), nullable=False)
+    end_time = db.Column(db.DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        # Overlap probes scan forward from the requested start, so only later slots are touched.
+        db.Index("ix_tractor_reservations_tractor_end", "tractor_id", "end_time"),
+        db.CheckConstraint("end_time > start_time", name="ck_tractor_reservation_range"),
+    )
+
+
+# Double booking is rejected by the database itself: an exclusion constraint on
+# PostgreSQL and an equivalent trigger on SQLite (which serializes writers).
+event.listen(
+    TractorReservation.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS btree_gist").execute_if(dialect="postgresql"),
+)
+event.listen(
+    TractorReservation.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE tractor_reservations ADD CONSTRAINT ex_tractor_reservations_overlap "
+        "EXCLUDE USING gist (tractor_id WITH =, tstzrange(start_time, end_time) WITH &&)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    TractorReservation.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER trg_tractor_reservations_overlap "
+        "BEFORE INSERT ON tractor_reservations "
+        "WHEN EXISTS ("
+        "SELECT 1 FROM tractor_reservations r "
+        "WHERE r.tractor_id = NEW.tractor_id AND r.end_time > NEW.start_time AND r.start_time < NEW.end_time"
+        ") "
+        "BEGIN SELECT RAISE(ABORT, 'tractor reservation overlap'); END"
+    ).execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,44 @@
+import base64
+import binascii
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from app.errors import AppError
+
+
+def encode_cursor(row):
+    """Opaque, URL-safe token for the (created_at, id) position of `row`."""
+    raw = f"{row.created_at.isoformat()}|{row.id}".encode("ascii")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, label="page"):
+    try:
+        padded = (cursor or "") + "=" * (-len(cursor or "") % 4)
+        created_raw, id_raw = base64.urlsafe_b64decode(padded).decode("ascii").rsplit("|", 1)
+        return datetime.fromisoformat(created_raw), int(id_raw)
+    except (ValueError, binascii.Error) as exc:
+        raise AppError(f"Invalid {label} cursor.", 400) from exc
+
+
+def keyset_page(query, model, cursor=None, limit=20, label="page"):
+    """
+    One page of `query`, newest first, ordered by (created_at, id) and continued from
+    `cursor` without OFFSET. Returns (rows, next_cursor); next_cursor is None on the last page.
+    A limit of None returns every remaining row.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor, label)
+        query = query.filter(
+            or_(
+                model.created_at < created_at,
+                and_(model.created_at == created_at, model.id < row_id),
+            )
+        )
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if limit is None:
+        return query.all(), None
+    rows = query.limit(limit + 1).all()
+    next_cursor = encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+    return rows[:limit], next_cursor
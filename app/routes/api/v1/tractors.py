@@ -2,7 +2,8 @@ from flask import Blueprint, current_app, jsonify, request
 from flask_login import current_user, login_required
 
 from app.decorators import role_required
-from app.services import FileService, TractorService
+from app.errors import AppError
+from app.services import FileService, MediaStorage, TractorService
 
 api_tractor_bp = Blueprint("api_tractor", __name__)
 
@@ -27,6 +28,9 @@ def list_tractors():
                     "average_rating": float(t.average_rating),
                     "rating_count": t.rating_count,
                     "image_path": t.image_path,
+                    "image_url": MediaStorage.url(t.image_path),
+                    "image_card_url": MediaStorage.url(t.card_image),
+                    "image_thumb_url": MediaStorage.url(t.thumb_image),
                 }
                 for t in paginated.items
             ],
@@ -41,6 +45,45 @@ def list_tractors():
     )
 
 
+@api_tractor_bp.get("/nearby")
+def nearby_tractors():
+    lat = request.args.get("lat", type=float)
+    lon = request.args.get("lon", type=float)
+    if lat is None or lon is None:
+        raise AppError("lat and lon are required.", 400)
+    radius_km = min(max(request.args.get("radius_km", default=25.0, type=float), 0.5), 100.0)
+    limit = min(max(request.args.get("limit", default=20, type=int), 1), 50)
+    matches = TractorService.nearby(
+        lat,
+        lon,
+        radius_km=radius_km,
+        limit=limit,
+        equipment_type=(request.args.get("equipment_type") or "").strip().title() or None,
+    )
+    return jsonify(
+        {
+            "items": [
+                {
+                    "id": t.id,
+                    "title": t.title,
+                    "price_per_hour": str(t.price_per_hour),
+                    "pincode": t.pincode,
+                    "equipment_type": t.equipment_type,
+                    "availability_status": t.availability_status,
+                    "average_rating": float(t.average_rating),
+                    "image_path": t.image_path,
+                    "image_url": MediaStorage.url(t.image_path),
+                    "image_card_url": MediaStorage.url(t.card_image),
+                    "image_thumb_url": MediaStorage.url(t.thumb_image),
+                    "distance_km": round(distance_km, 2),
+                }
+                for t, distance_km in matches
+            ],
+            "meta": {"radius_km": radius_km, "limit": limit},
+        }
+    )
+
+
 @api_tractor_bp.post("")
 @login_required
 @role_required("owner")
@@ -48,7 +91,7 @@ def create_tractor():
     payload = dict(request.form)
     image = request.files.get("tractor_image")
     if image:
-        payload["image_path"] = FileService.save_image(image, current_app.config["UPLOAD_DIR"])
+        payload.update(FileService.save_image(image, current_app.config["UPLOAD_DIR"]) or {})
     tractor = TractorService.create_tractor(current_user.id, payload)
     return jsonify({"id": tractor.id, "title": tractor.title}), 201
 
@@ -4,9 +4,9 @@ from flask import Blueprint, flash, jsonify, redirect, render_template, request,
 from flask_login import current_user, login_required
 from sqlalchemy import case, func
 
-from app.decorators import role_required
-from app.models import Booking, Payment, Review, Tractor, User
-from app.services import PlatformService
+from app.decorators import read_replica, role_required
+from app.models import Booking, Payment, Review, User
+from app.services import AnalyticsService, HttpClient, PlatformService
 
 web_admin_bp = Blueprint("web_admin", __name__)
 
@@ -14,74 +14,22 @@ web_admin_bp = Blueprint("web_admin", __name__)
 @web_admin_bp.get("/admin")
 @login_required
 @role_required("admin")
+@read_replica
 def admin_dashboard():
-    total_users = User.query.count()
-    total_tractors = Tractor.query.count()
-    total_bookings = Booking.query.count()
-    total_revenue = float(db_scalar(func.coalesce(func.sum(Payment.amount), 0)))
-    avg_rating = float(db_scalar(func.coalesce(func.avg(Tractor.average_rating), 0)))
-    commission_total = float(db_scalar(func.coalesce(func.sum(Booking.commission_amount), 0)))
-    owner_payout_total = float(db_scalar(func.coalesce(func.sum(Booking.owner_payout_amount), 0)))
-
-    top_tractors = (
-        db_rows(
-            Booking.query.with_entities(
-                Tractor.title.label("tractor_title"),
-                func.count(Booking.id).label("booking_count"),
-            )
-            .join(Tractor, Tractor.id == Booking.tractor_id)
-            .group_by(Tractor.id)
-            .order_by(func.count(Booking.id).desc())
-            .limit(5)
-        )
-    )
-
+    kpis = AnalyticsService.admin_kpis()
     recent_transactions = (
         Payment.query.order_by(Payment.created_at.desc())
         .limit(10)
         .all()
     )
 
-    demand_by_district = db_rows(
-        db_session_query(
-            Tractor.district.label("district"),
-            func.count(Booking.id).label("bookings"),
-        )
-        .join(Booking, Booking.tractor_id == Tractor.id)
-        .filter(Tractor.district.isnot(None))
-        .filter(Tractor.district != "")
-        .group_by(Tractor.district)
-        .order_by(func.count(Booking.id).desc())
-        .limit(12)
-    )
-    supply_by_district = db_rows(
-        db_session_query(
-            Tractor.district.label("district"),
-            func.count(Tractor.id).label("supply"),
-        )
-        .filter(Tractor.district.isnot(None))
-        .filter(Tractor.district != "")
-        .group_by(Tractor.district)
-        .order_by(func.count(Tractor.id).asc())
-        .limit(12)
-    )
-
     fraud_alerts = build_fraud_alerts()
     owners = User.query.filter_by(role="owner").order_by(User.created_at.desc()).limit(30).all()
 
     return render_template(
         "admin_dashboard.html",
-        total_users=total_users,
-        total_tractors=total_tractors,
-        total_bookings=total_bookings,
-        total_revenue=total_revenue,
-        commission_total=commission_total,
-        owner_payout_total=owner_payout_total,
-        avg_rating=avg_rating,
-        top_tractors=top_tractors,
+        **kpis,
         recent_transactions=recent_transactions,
-        demand_by_district=demand_by_district,
-        supply_by_district=supply_by_district,
         fraud_alerts=fraud_alerts,
         owners=owners,
         commission_pct=float(PlatformService.get_decimal("commission_pct", 10)),
@@ -92,95 +40,33 @@ def admin_dashboard():
 @web_admin_bp.get("/admin/analytics")
 @login_required
 @role_required("admin")
+@read_replica
 def analytics_dashboard():
-    daily = db_rows(
-        Payment.query.with_entities(
-            func.date(Payment.created_at).label("period"),
-            func.sum(Payment.amount).label("revenue"),
-        )
-        .group_by(func.date(Payment.created_at))
-        .order_by(func.date(Payment.created_at))
-        .limit(30)
-    )
-
-    weekly = db_rows(
-        Payment.query.with_entities(
-            func.strftime("%Y-W%W", Payment.created_at).label("period"),
-            func.sum(Payment.amount).label("revenue"),
-        )
-        .group_by(func.strftime("%Y-W%W", Payment.created_at))
-        .order_by(func.strftime("%Y-W%W", Payment.created_at))
-        .limit(12)
-    )
-
-    monthly = db_rows(
-        Payment.query.with_entities(
-            func.strftime("%Y-%m", Payment.created_at).label("period"),
-            func.sum(Payment.amount).label("revenue"),
-        )
-        .group_by(func.strftime("%Y-%m", Payment.created_at))
-        .order_by(func.strftime("%Y-%m", Payment.created_at))
-        .limit(12)
-    )
-
-    by_tractor = db_rows(
-        Payment.query.with_entities(
-            Tractor.title.label("name"),
-            func.sum(Payment.amount).label("revenue"),
-        )
-        .join(Booking, Booking.id == Payment.booking_id)
-        .join(Tractor, Tractor.id == Booking.tractor_id)
-        .group_by(Tractor.id)
-        .order_by(func.sum(Payment.amount).desc())
-        .limit(10)
-    )
-
-    by_owner = db_rows(
-        Payment.query.with_entities(
-            User.full_name.label("name"),
-            func.sum(Payment.amount).label("revenue"),
-        )
-        .join(User, User.id == Payment.owner_id)
-        .group_by(User.id)
-        .order_by(func.sum(Payment.amount).desc())
-        .limit(10)
-    )
-
-    growth = db_rows(
-        Booking.query.with_entities(
-            func.date(Booking.created_at).label("period"),
-            func.count(Booking.id).label("bookings"),
-        )
-        .group_by(func.date(Booking.created_at))
-        .order_by(func.date(Booking.created_at))
-        .limit(30)
-    )
-
     return render_template(
         "analytics.html",
-        daily=daily,
-        weekly=weekly,
-        monthly=monthly,
-        by_tractor=by_tractor,
-        by_owner=by_owner,
-        growth=growth,
+        daily=AnalyticsService.daily_revenue(limit=30),
+        weekly=AnalyticsService.weekly_revenue(limit=12),
+        monthly=AnalyticsService.monthly_revenue(limit=12),
+        by_tractor=AnalyticsService.revenue_by_tractor(limit=10),
+        by_owner=AnalyticsService.revenue_by_owner(limit=10),
+        growth=AnalyticsService.booking_growth(limit=30),
     )
 
 
 @web_admin_bp.get("/admin/analytics/data")
 @login_required
 @role_required("admin")
+@read_replica
 def analytics_data():
-    rows = db_rows(
-        Payment.query.with_entities(
-            func.date(Payment.created_at).label("period"),
-            func.sum(Payment.amount).label("revenue"),
-        )
-        .group_by(func.date(Payment.created_at))
-        .order_by(func.date(Payment.created_at))
-        .limit(60)
-    )
-    return jsonify(rows)
+    return jsonify(AnalyticsService.daily_revenue(limit=60))
+
+
+@web_admin_bp.get("/admin/upstreams")
+@login_required
+@role_required("admin")
+def upstream_metrics():
+    # Counters are per worker process.
+    return jsonify(HttpClient.metrics())
 
 
 @web_admin_bp.post("/admin/settings")
@@ -195,8 +81,7 @@ def update_platform_settings():
     if surge_threshold is None or surge_threshold < 1:
         flash("Surge threshold must be at least 1.", "error")
         return redirect(url_for("web_admin.admin_dashboard"))
-    PlatformService.set_setting("commission_pct", commission_pct)
-    PlatformService.set_setting("surge_threshold", surge_threshold)
+    PlatformService.set_settings({"commission_pct": commission_pct, "surge_threshold": surge_threshold})
     flash("Platform settings updated.", "success")
     return redirect(url_for("web_admin.admin_dashboard"))
 
@@ -214,17 +99,6 @@ def verify_owner(owner_id):
     return redirect(url_for("web_admin.admin_dashboard"))
 
 
-def db_scalar(expr):
-    from app.extensions import db
-
-    value = db.session.query(expr).scalar()
-    return value or 0
-
-
-def db_rows(query):
-    return [dict(row._mapping) for row in query.all()]
-
-
 def db_session_query(*cols):
     from app.extensions import db
 
@@ -1,15 +1,23 @@
-from flask import Blueprint, flash, redirect, render_template, request, url_for, jsonify
+from flask import Blueprint, current_app, flash, redirect, render_template, request, url_for, jsonify
 from flask_login import current_user, login_required, login_user, logout_user
 from sqlalchemy import func
-from urllib.parse import urlencode
-from urllib.request import Request, urlopen
-import json
-import math
 
+from app.decorators import read_replica
 from app.errors import AppError
 from app.extensions import cache, limiter
 from app.models import Booking, Review, Tractor, User
-from app.services import AuthService, PlatformService
+from app.services import (
+    AuthService,
+    DemandService,
+    HttpClient,
+    IOPool,
+    MediaStorage,
+    PincodeIndex,
+    TractorService,
+    WeatherService,
+)
+
+SEARCH_LIMIT = 50
 
 web_auth_bp = Blueprint("web_auth", __name__)
 
@@ -21,6 +29,7 @@ def landing():
 
 @web_auth_bp.get("/api/platform-stats")
 @cache.cached(timeout=120)
+@read_replica
 def platform_stats():
     avg_rating = (
         float(db_value(func.avg(Review.rating)) or 0)
@@ -53,68 +62,62 @@ def location_search():
         return jsonify({"error": "Unable to detect pincode."}), 400
 
     try:
-        query = urlencode(
-            {
-                "lat": lat,
-                "lon": lon,
-                "format": "json",
-            }
-        )
-        req = Request(
-            f"https://nominatim.openstreetmap.org/reverse?{query}",
-            headers={"User-Agent": "UzhavanGo/1.0"},
-        )
-        with urlopen(req, timeout=8) as response:
-            data = json.loads(response.read().decode("utf-8"))
-        postcode = ((data.get("address") or {}).get("postcode") or "").strip()
-        digits = "".join(ch for ch in postcode if ch.isdigit())[:6]
-        if len(digits) != 6:
+        lat, lon = float(lat), float(lon)
+        deadline = IOPool.deadline(current_app.config.get("LOCATION_SEARCH_BUDGET_SECONDS", 5.0))
+        # Weather only needs coordinates, so it runs while the pincode and listings are resolved.
+        rain_future = WeatherService.rain_probability_async(lat, lon)
+        located = resolve_pincode(lat, lon, deadline=deadline)
+        if not located:
             return jsonify({"error": "Unable to detect pincode."}), 404
+        digits = located["pincode"]
 
-        threshold = int(PlatformService.get_decimal("surge_threshold", 5))
-        high_demand = (
-            Booking.query.join(Tractor, Tractor.id == Booking.tractor_id)
-            .filter(Tractor.pincode == digits)
-            .filter(Booking.status.in_(["pending", "accepted", "en_route", "working"]))
-            .count()
-            > threshold
-        )
+        high_demand = DemandService.is_high_demand(digits)
 
-        tractors_query = Tractor.query.filter_by(pincode=digits).filter(Tractor.availability_status != "offline")
-        if equipment_type:
-            tractors_query = tractors_query.filter(Tractor.equipment_type == equipment_type)
-        if listing_mode == "addon":
-            tractors_query = tractors_query.filter(Tractor.equipment_type != "Tractor")
-        tractors = tractors_query.order_by(Tractor.created_at.desc()).limit(50).all()
-        payload = []
-        for t in tractors:
-            distance_km = None
-            if t.latitude is not None and t.longitude is not None:
-                distance_km = round(haversine_km(float(lat), float(lon), float(t.latitude), float(t.longitude)), 1)
-            payload.append(
-                {
-                    "tractor_id": t.id,
-                    "name": t.title,
-                    "price": str(t.price_per_hour),
-                    "pincode": t.pincode,
-                    "image": t.image_path,
-                    "rating": float(t.average_rating or t.rating_avg or 0),
-                    "distance_km": distance_km,
-                    "status": t.availability_status,
-                }
+        matches = TractorService.nearby(
+            lat,
+            lon,
+            radius_km=current_app.config.get("TRACTOR_SEARCH_RADIUS_KM", 25.0),
+            limit=SEARCH_LIMIT,
+            equipment_type=equipment_type or None,
+            addon_only=listing_mode == "addon",
+        )
+        if len(matches) < SEARCH_LIMIT:
+            # Listings without coordinates can only be matched on their pincode.
+            unplaced_query = Tractor.query.filter(
+                Tractor.pincode == digits,
+                Tractor.geo_cell.is_(None),
+                Tractor.availability_status != "offline",
             )
-        payload.sort(key=lambda item: item["distance_km"] if item["distance_km"] is not None else 10_000)
+            if equipment_type:
+                unplaced_query = unplaced_query.filter(Tractor.equipment_type == equipment_type)
+            if listing_mode == "addon":
+                unplaced_query = unplaced_query.filter(Tractor.equipment_type != "Tractor")
+            unplaced = unplaced_query.order_by(Tractor.created_at.desc()).limit(SEARCH_LIMIT - len(matches)).all()
+            matches.extend((t, None) for t in unplaced)
+        payload = [
+            {
+                "tractor_id": t.id,
+                "name": t.title,
+                "price": str(t.price_per_hour),
+                "pincode": t.pincode,
+                "image": MediaStorage.url(t.card_image),
+                "thumb": MediaStorage.url(t.thumb_image),
+                "rating": float(t.average_rating or t.rating_avg or 0),
+                "distance_km": round(distance_km, 1) if distance_km is not None else None,
+                "status": t.availability_status,
+            }
+            for t, distance_km in matches
+        ]
         return jsonify(
             {
                 "pincode": digits,
                 "high_demand": bool(high_demand),
-                "message": f"{len(payload)} {(equipment_type or ('Add-on equipment' if listing_mode == 'addon' else 'Tractors')).lower()} available in {digits}",
+                "message": f"{len(payload)} {(equipment_type or ('Add-on equipment' if listing_mode == 'addon' else 'Tractors')).lower()} available near {digits}",
                 "equipment_label": equipment_type or ("Add-on equipment" if listing_mode == "addon" else "Tractors"),
                 "listing_mode": listing_mode,
-                "weather_alert": weather_demand_hint(
-                    lat=lat,
-                    lon=lon,
-                    district=(data.get("address") or {}).get("state_district"),
+                "weather_alert": WeatherService.hint_for(
+                    IOPool.result(rain_future, deadline),
+                    located.get("district"),
                 ),
                 "tractors": payload,
             }
@@ -161,44 +164,36 @@ def equipment_recommendation():
     )
 
 
-def haversine_km(lat1, lon1, lat2, lon2):
-    r = 6371.0
-    d_lat = math.radians(lat2 - lat1)
-    d_lon = math.radians(lon2 - lon1)
-    a = (
-        math.sin(d_lat / 2) ** 2
-        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(d_lon / 2) ** 2
+def resolve_pincode(lat, lon, deadline=None):
+    """Pincode and district for a coordinate: local index first, Nominatim only on a miss."""
+    index = PincodeIndex.for_app()
+    if index is not None:
+        located = index.lookup(lat, lon, max_km=current_app.config.get("PINCODE_INDEX_MAX_KM", 15.0))
+        if located:
+            return located
+    timeout = current_app.config.get("GEOCODE_TIMEOUT_SECONDS", 4.0)
+    if deadline is not None:
+        timeout = IOPool.remaining(deadline, cap=timeout)
+        if timeout <= 0:
+            return None
+    return nominatim_reverse(lat, lon, timeout=timeout)
+
+
+def nominatim_reverse(lat, lon, timeout=8):
+    data = HttpClient.get_json(
+        "https://nominatim.openstreetmap.org/reverse",
+        params={
+            "lat": lat,
+            "lon": lon,
+            "format": "json",
+        },
+        timeout=timeout,
     )
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-    return r * c
-
-
-def weather_demand_hint(lat, lon, district):
-    if not district:
+    address = data.get("address") or {}
+    digits = "".join(ch for ch in (address.get("postcode") or "").strip() if ch.isdigit())[:6]
+    if len(digits) != 6:
         return None
-    try:
-        weather_query = urlencode(
-            {
-                "latitude": lat,
-                "longitude": lon,
-                "daily": "precipitation_probability_max",
-                "timezone": "auto",
-                "forecast_days": 2,
-            }
-        )
-        weather_req = Request(
-            f"https://api.open-meteo.com/v1/forecast?{weather_query}",
-            headers={"User-Agent": "UzhavanGo/1.0"},
-        )
-        with urlopen(weather_req, timeout=8) as response:
-            weather_data = json.loads(response.read().decode("utf-8"))
-        probs = (weather_data.get("daily") or {}).get("precipitation_probability_max") or []
-        tomorrow_prob = probs[1] if len(probs) > 1 else (probs[0] if probs else 0)
-        if int(tomorrow_prob or 0) >= 60:
-            return f"High demand expected tomorrow due to rain forecast in {district}."
-    except Exception:
-        pass
-    return None
+    return {"pincode": digits, "district": address.get("state_district")}
 
 
 @web_auth_bp.route("/register", methods=["GET", "POST"])
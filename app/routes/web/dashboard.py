@@ -1,19 +1,25 @@
 from datetime import datetime, timezone
+import queue
+import time
 
-from flask import Blueprint, current_app, flash, jsonify, redirect, render_template, request, url_for
+from flask import Blueprint, Response, current_app, flash, jsonify, redirect, render_template, request, url_for
 from flask_login import current_user, login_required
-from sqlalchemy import func, or_
+from sqlalchemy.orm import joinedload
 
-from app.decorators import role_required
+from app.decorators import read_replica, role_required
 from app.errors import AppError
-from app.extensions import db
+from app.extensions import db, limiter
 import json
 
-from app.models import Booking, Notification, OwnerEarning, Review, Tractor, User
+from app.models import Booking, Notification, Review, Tractor, User
 from app.services import (
     BookingService,
     ChatService,
+    DemandService,
+    EarningService,
+    EventService,
     FileService,
+    MediaStorage,
     NotificationService,
     PlatformService,
     ReviewService,
@@ -23,28 +29,6 @@ from app.services import (
 web_dashboard_bp = Blueprint("web_dashboard", __name__)
 
 
-def _is_sqlite():
-    try:
-        return db.engine.url.get_backend_name() == "sqlite"
-    except Exception:
-        return False
-
-
-def _safe_datetime_query(query, model, *column_names):
-    """
-    SQLite guard: old rows may contain numeric datetime values that break SQLAlchemy parsing.
-    Keep only NULL or text datetime storage on affected columns.
-    """
-    if not _is_sqlite():
-        return query
-    for column_name in column_names:
-        if not hasattr(model, column_name):
-            continue
-        col = getattr(model, column_name)
-        query = query.filter(or_(col.is_(None), func.typeof(col) == "text"))
-    return query
-
-
 @web_dashboard_bp.get("/dashboard")
 @login_required
 def dashboard():
@@ -64,6 +48,90 @@ def mark_notifications_read():
     return redirect(next_url)
 
 
+def _parse_stream_cursor(raw):
+    """Stream event ids are "<notification_id>-<chat_message_id>"."""
+    try:
+        notification_id, message_id = (int(part) for part in (raw or "").split("-", 1))
+    except ValueError:
+        return None
+    return {"notification": notification_id, "chat_message": message_id}
+
+
+@web_dashboard_bp.get("/events/stream")
+@limiter.exempt
+@login_required
+def event_stream():
+    """
+    Server-Sent Events for the signed-in user's notifications and chat messages.
+    Streams are closed after EVENT_STREAM_MAX_SECONDS; EventSource reconnects with
+    Last-Event-ID and anything published on another worker is replayed from the DB.
+    """
+    user_id = current_user.id
+    broker = EventService.broker()
+    channel = EventService.user_channel(user_id)
+    # Subscribe before the catch-up queries so nothing falls between them.
+    subscription = broker.subscribe(channel)
+
+    cursors = _parse_stream_cursor(request.headers.get("Last-Event-ID") or request.args.get("cursor"))
+    backlog = []
+    if cursors is None:
+        cursors = {
+            "notification": NotificationService.latest_id_for_user(user_id),
+            "chat_message": ChatService.latest_message_id_for_user(user_id),
+        }
+    else:
+        backlog.extend(
+            ("notification", NotificationService.serialize(row))
+            for row in NotificationService.notifications_after(user_id, cursors["notification"])
+        )
+        backlog.extend(
+            ("chat_message", ChatService.serialize(row))
+            for row in ChatService.messages_for_user_after(user_id, cursors["chat_message"])
+        )
+    db.session.remove()
+
+    max_seconds = current_app.config.get("EVENT_STREAM_MAX_SECONDS", 55)
+    heartbeat = current_app.config.get("EVENT_STREAM_HEARTBEAT_SECONDS", 15)
+
+    def stream_id():
+        return f"{cursors['notification']}-{cursors['chat_message']}"
+
+    def emit(event_type, payload):
+        if event_type not in cursors or payload["id"] <= cursors[event_type]:
+            return None
+        cursors[event_type] = payload["id"]
+        return EventService.format_sse(event_type, payload, event_id=stream_id())
+
+    def generate():
+        try:
+            yield "retry: 3000\n" + EventService.format_sse("ready", {}, event_id=stream_id())
+            for event_type, payload in backlog:
+                chunk = emit(event_type, payload)
+                if chunk:
+                    yield chunk
+            deadline = time.monotonic() + max_seconds
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    event = subscription.get(timeout=min(heartbeat, remaining))
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                chunk = emit(event["type"], event["data"])
+                if chunk:
+                    yield chunk
+        finally:
+            broker.unsubscribe(channel, subscription)
+
+    response = Response(generate(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    response.headers["X-Accel-Buffering"] = "no"
+    response.call_on_close(lambda: broker.unsubscribe(channel, subscription))
+    return response
+
+
 @web_dashboard_bp.get("/owner")
 @login_required
 @role_required("owner")
@@ -71,66 +139,35 @@ def owner_dashboard():
     listings = Tractor.query.filter_by(owner_id=current_user.id).order_by(Tractor.created_at.desc()).all()
     tractor_listings = [item for item in listings if (item.equipment_type or "Tractor") == "Tractor"]
     equipment_listings = [item for item in listings if (item.equipment_type or "Tractor") != "Tractor"]
-    bookings_q = (
-        Booking.query.join(Tractor, Tractor.id == Booking.tractor_id)
-        .filter(Tractor.owner_id == current_user.id)
-        .order_by(Booking.created_at.desc())
+    booking_status = (request.args.get("status") or "").strip().lower() or None
+    bookings, bookings_next_cursor = BookingService.owner_bookings_page(
+        current_user.id,
+        status=booking_status,
+        cursor=request.args.get("bookings_before"),
     )
-    bookings_q = _safe_datetime_query(
-        bookings_q,
-        Booking,
-        "created_at",
-        "updated_at",
-        "start_time",
-        "end_time",
-        "accepted_at",
-        "completed_at",
-        "paid_at",
-    )
-    bookings = bookings_q.all()
 
-    notifications_q = Notification.query.filter_by(user_id=current_user.id, is_read=False).order_by(
-        Notification.created_at.desc()
-    )
-    notifications_q = _safe_datetime_query(notifications_q, Notification, "created_at", "updated_at")
-    notifications = notifications_q.limit(5).all()
-    revenue_rows = (
-        db.session.query(OwnerEarning, Booking, Tractor)
-        .join(Booking, Booking.id == OwnerEarning.booking_id)
-        .join(Tractor, Tractor.id == Booking.tractor_id)
-        .filter(OwnerEarning.owner_id == current_user.id)
-        .order_by(OwnerEarning.created_at.desc())
+    notifications = (
+        Notification.query.filter_by(user_id=current_user.id, is_read=False)
+        .order_by(Notification.created_at.desc())
+        .limit(5)
         .all()
     )
-    gross_total = sum(float(row[0].gross_amount or 0) for row in revenue_rows)
-    platform_fee_total = sum(float(row[0].platform_fee or 0) for row in revenue_rows)
-    total_earnings = sum(float(row[0].net_amount or 0) for row in revenue_rows)
-
-    revenue_breakdown = [
-        {
-            "booking_id": booking.id,
-            "tractor_title": tractor.title,
-            "farmer_name": booking.farmer.full_name if booking.farmer else "Farmer",
-            "hours": booking.hours,
-            "gross_amount": float(earning.gross_amount or 0),
-            "platform_fee": float(earning.platform_fee or 0),
-            "net_amount": float(earning.net_amount or 0),
-            "receipt_number": booking.payment.receipt_number if booking.payment else None,
-            "created_at": earning.created_at,
-        }
-        for earning, booking, tractor in revenue_rows
-    ]
+    earnings = EarningService.totals_for_owner(current_user.id)
+    revenue_page = EarningService.breakdown_page(current_user.id, cursor=request.args.get("revenue_before"))
 
     return render_template(
         "owner_dashboard.html",
         tractor_listings=tractor_listings,
         equipment_listings=equipment_listings,
         bookings=bookings,
+        bookings_next_cursor=bookings_next_cursor,
+        booking_status=booking_status,
         notifications=notifications,
-        total_earnings=total_earnings,
-        gross_total=gross_total,
-        platform_fee_total=platform_fee_total,
-        revenue_breakdown=revenue_breakdown,
+        total_earnings=earnings["net_total"],
+        gross_total=earnings["gross_total"],
+        platform_fee_total=earnings["platform_fee_total"],
+        revenue_breakdown=revenue_page["items"],
+        revenue_page=revenue_page,
         equipment_types=sorted(TractorService.EQUIPMENT_TYPES),
     )
 
@@ -159,9 +196,16 @@ def create_tractor():
     try:
         payload["image_path"] = None
         if image_file and image_file.filename:
-            payload["image_path"] = FileService.save_image(image_file, current_app.config["UPLOAD_DIR"])
+            payload.update(FileService.save_image(image_file, current_app.config["UPLOAD_DIR"]) or {})
         elif camera_image:
-            payload["image_path"] = FileService.save_camera_data_url(camera_image, current_app.config["UPLOAD_DIR"])
+            payload.update(
+                FileService.save_camera_data_url(
+                    camera_image,
+                    current_app.config["UPLOAD_DIR"],
+                    max_bytes=current_app.config["MAX_IMAGE_BYTES"],
+                )
+                or {}
+            )
 
         listing = TractorService.create_tractor(current_user.id, payload)
         listing_type = (listing.equipment_type or "Equipment").strip()
@@ -241,25 +285,19 @@ def farmer_dashboard():
     for row in addon_rows:
         addons_by_owner.setdefault(row.owner_id, []).append(row)
 
-    history_q = Booking.query.filter_by(farmer_id=current_user.id).order_by(Booking.created_at.desc())
-    history_q = _safe_datetime_query(
-        history_q,
-        Booking,
-        "created_at",
-        "updated_at",
-        "start_time",
-        "end_time",
-        "accepted_at",
-        "completed_at",
-        "paid_at",
+    history = (
+        Booking.query.filter_by(farmer_id=current_user.id)
+        .order_by(Booking.created_at.desc())
+        .limit(12)
+        .all()
     )
-    history = history_q.limit(12).all()
 
-    notifications_q = Notification.query.filter_by(user_id=current_user.id, is_read=False).order_by(
-        Notification.created_at.desc()
+    notifications = (
+        Notification.query.filter_by(user_id=current_user.id, is_read=False)
+        .order_by(Notification.created_at.desc())
+        .limit(5)
+        .all()
     )
-    notifications_q = _safe_datetime_query(notifications_q, Notification, "created_at", "updated_at")
-    notifications = notifications_q.limit(5).all()
     my_reviews = Review.query.filter_by(farmer_id=current_user.id).all()
     my_review_map = {r.tractor_id: r for r in my_reviews}
     return render_template(
@@ -367,6 +405,7 @@ def create_review_legacy():
 
 
 @web_dashboard_bp.get("/tractors")
+@read_replica
 def tractors_catalog():
     pincode = (request.args.get("pincode") or "").strip()
     village = (request.args.get("village") or "").strip()
@@ -394,21 +433,13 @@ def tractors_catalog():
     if listing_mode == "addon":
         query = query.filter(Tractor.equipment_type != "Tractor")
 
-    threshold = int(PlatformService.get_decimal("surge_threshold", 5))
-    local_bookings = 0
-    if pincode:
-        local_bookings = (
-            Booking.query.join(Tractor, Tractor.id == Booking.tractor_id)
-            .filter(Tractor.pincode == pincode)
-            .filter(Booking.status.in_(["pending", "accepted", "en_route", "working"]))
-            .count()
-        )
-    high_demand = pincode and local_bookings > threshold
+    high_demand = DemandService.is_high_demand(pincode)
 
-    rows = query.order_by(Tractor.created_at.desc()).limit(50).all()
+    rows = query.options(joinedload(Tractor.owner)).order_by(Tractor.created_at.desc()).limit(50).all()
+    completed_jobs_by_owner = BookingService.completed_jobs_by_owner({t.owner_id for t in rows})
     payload = []
     for t in rows:
-        completed_jobs = Booking.query.filter_by(owner_id=t.owner_id, status="paid").count()
+        completed_jobs = completed_jobs_by_owner.get(t.owner_id, 0)
         badges = []
         if getattr(t.owner, "is_verified_owner", False):
             badges.append("Verified Owner")
@@ -423,7 +454,8 @@ def tractors_catalog():
                 "price": str(t.price_per_hour),
                 "pincode": t.pincode,
                 "village": t.village,
-                "image": t.image_path,
+                "image": MediaStorage.url(t.card_image),
+                "thumb": MediaStorage.url(t.thumb_image),
                 "rating": float(t.average_rating or t.rating_avg or 0),
                 "status": t.availability_status,
                 "equipment_type": t.equipment_type,
@@ -480,8 +512,22 @@ def tractor_detail(tractor_id):
 @web_dashboard_bp.get("/bookings/<int:booking_id>/messages")
 @login_required
 def booking_messages(booking_id):
+    since = None
+    raw_since = (request.args.get("since") or "").strip()
     try:
-        rows = ChatService.list_messages(booking_id, current_user)
+        if raw_since:
+            try:
+                since = datetime.fromisoformat(raw_since)
+            except ValueError as exc:
+                raise AppError("Invalid since cursor.", 400) from exc
+        rows = ChatService.list_messages(
+            booking_id,
+            current_user,
+            after_id=request.args.get("after_id", type=int),
+            before_id=request.args.get("before_id", type=int),
+            since=since,
+            limit=request.args.get("limit", type=int),
+        )
     except AppError as exc:
         return jsonify({"error": exc.message}), exc.status_code
     return jsonify(
@@ -528,13 +574,11 @@ def send_booking_message(booking_id):
 def owner_bookings(owner_id):
     if owner_id != current_user.id:
         return jsonify({"error": "Forbidden"}), 403
-    rows = (
-        Booking.query.join(Tractor, Tractor.id == Booking.tractor_id)
-        .filter(Tractor.owner_id == owner_id)
-        .order_by(Booking.created_at.desc())
-        .all()
-    )
-    return jsonify(
+    try:
+        rows, next_cursor = _owner_bookings_page_from_args(owner_id)
+    except AppError as exc:
+        return jsonify({"error": exc.message}), exc.status_code
+    return _owner_bookings_response(
         [
             {
                 "id": b.id,
@@ -549,7 +593,8 @@ def owner_bookings(owner_id):
                 "created_at": b.created_at.isoformat(),
             }
             for b in rows
-        ]
+        ],
+        next_cursor,
     )
 
 
@@ -557,13 +602,11 @@ def owner_bookings(owner_id):
 @login_required
 @role_required("owner")
 def owner_bookings_direct():
-    rows = (
-        Booking.query.join(Tractor, Tractor.id == Booking.tractor_id)
-        .filter(Tractor.owner_id == current_user.id)
-        .order_by(Booking.created_at.desc())
-        .all()
-    )
-    return jsonify(
+    try:
+        rows, next_cursor = _owner_bookings_page_from_args(current_user.id)
+    except AppError as exc:
+        return jsonify({"error": exc.message}), exc.status_code
+    return _owner_bookings_response(
         [
             {
                 "booking_id": b.id,
@@ -574,5 +617,29 @@ def owner_bookings_direct():
                 "created_at": b.created_at.isoformat(),
             }
             for b in rows
-        ]
+        ],
+        next_cursor,
     )
+
+
+def _owner_bookings_paged():
+    return "limit" in request.args or "cursor" in request.args
+
+
+def _owner_bookings_page_from_args(owner_id):
+    return BookingService.owner_bookings_page(
+        owner_id,
+        status=(request.args.get("status") or "").strip().lower() or None,
+        cursor=request.args.get("cursor"),
+        limit=request.args.get("limit", 50, type=int) if _owner_bookings_paged() else None,
+    )
+
+
+def _owner_bookings_response(items, next_cursor):
+    """
+    Without ?limit= or ?cursor= the body stays the full list existing clients expect;
+    paged requests get {"items": [...], "next_cursor": ...}.
+    """
+    if not _owner_bookings_paged():
+        return jsonify(items)
+    return jsonify({"items": items, "next_cursor": next_cursor})
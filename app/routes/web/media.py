@@ -0,0 +1,17 @@
+import os
+
+from flask import Blueprint, current_app, send_from_directory
+
+from app.services.media_storage import IMMUTABLE_CACHE_CONTROL, MEDIA_KEY_PREFIX
+
+web_media_bp = Blueprint("web_media", __name__)
+
+
+@web_media_bp.get("/media/<path:name>")
+def media_file(name):
+    # Keys are content hashes, so a URL's bytes never change and can be cached indefinitely.
+    response = send_from_directory(
+        os.path.join(current_app.config["UPLOAD_DIR"], MEDIA_KEY_PREFIX.rstrip("/")), name, max_age=31536000
+    )
+    response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
@@ -0,0 +1,230 @@
+import os
+import shutil
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.extensions import db
+
+# Bump whenever a model gains a table/column or a new data fix is added below, so existing
+# SQLite databases are flagged as pending until `flask apply-schema-fixes` runs.
+SCHEMA_FIX_VERSION = 4
+
+# Indexes a model no longer declares, dropped from existing SQLite files.
+OBSOLETE_SQLITE_INDEXES = ("ix_chat_messages_booking",)
+
+# Datetime columns that legacy SQLite builds sometimes stored as numbers.
+SQLITE_DATETIME_COLUMNS = {
+    "users": ["created_at", "updated_at", "last_login"],
+    "tractors": ["created_at", "updated_at"],
+    "bookings": [
+        "start_time",
+        "end_time",
+        "accepted_at",
+        "en_route_at",
+        "started_at",
+        "completed_at",
+        "farmer_confirmed_at",
+        "cancelled_at",
+        "paid_at",
+        "created_at",
+        "updated_at",
+    ],
+    "notifications": ["created_at", "updated_at"],
+    "payments": ["created_at", "updated_at"],
+    "reviews": ["created_at", "updated_at"],
+    "owner_earnings": ["created_at", "updated_at"],
+}
+
+
+def sqlite_table_exists(session, table_name):
+    return (
+        session.execute(
+            text("SELECT COUNT(*) FROM sqlite_master WHERE type='table' AND name=:name"),
+            {"name": table_name},
+        ).scalar()
+        > 0
+    )
+
+
+def repair_sqlite_datetimes(session):
+    """
+    Rewrite non-text datetime values that break SQLAlchemy DateTime parsing.
+    NOT NULL columns get the current time, nullable ones become NULL.
+    Returns the number of rows changed; the caller commits.
+    """
+    changed = 0
+    for table_name, columns in SQLITE_DATETIME_COLUMNS.items():
+        if not sqlite_table_exists(session, table_name):
+            continue
+        table_info = {row[1]: row for row in session.execute(text(f"PRAGMA table_info({table_name})")).fetchall()}
+        for col in columns:
+            if col not in table_info:
+                continue
+            # PRAGMA table_info: row[3] => 1 means NOT NULL
+            is_not_null = bool(table_info[col][3])
+            replacement = "datetime('now')" if is_not_null else "NULL"
+            result = session.execute(
+                text(
+                    f"""
+                    UPDATE {table_name}
+                    SET {col} = {replacement}
+                    WHERE {col} IS NOT NULL
+                      AND typeof({col}) != 'text'
+                    """
+                )
+            )
+            changed += result.rowcount or 0
+    return changed
+
+
+def _sqlite_uri(app):
+    db_uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+    return db_uri.startswith("sqlite:") and db_uri != "sqlite:///:memory:"
+
+
+def recorded_fix_version(session):
+    """Fix version stamped into the SQLite file header (PRAGMA user_version)."""
+    return int(session.execute(text("PRAGMA user_version")).scalar() or 0)
+
+
+def schema_fixes_pending(app):
+    """
+    One PRAGMA read, so every worker can check cheaply at boot.
+    Non-SQLite schemas are owned by Alembic (`flask db upgrade`) and never pending here.
+    """
+    if not _sqlite_uri(app):
+        return False
+    return recorded_fix_version(db.session) < SCHEMA_FIX_VERSION
+
+
+def apply_schema_fixes(app, allow_legacy_reset=False):
+    """
+    Create missing tables, add missing SQLite columns and repair legacy datetimes,
+    then record SCHEMA_FIX_VERSION. Raises on failure without recording the version.
+    Returns False without touching other databases: their tables, and the backfills
+    that fill them, come only from the Alembic migrations (`flask db upgrade`).
+    """
+    if not app.config.get("SQLALCHEMY_DATABASE_URI", "").startswith("sqlite:"):
+        return False
+    if not (allow_legacy_reset and _reset_legacy_sqlite_schema(app)):
+        db.create_all()
+    try:
+        _add_missing_sqlite_columns(db.session)
+        _create_missing_sqlite_indexes(db.session)
+        _drop_obsolete_sqlite_indexes(db.session)
+        # Guard against legacy/bad datetime storage that breaks SQLAlchemy DateTime parsing.
+        repair_sqlite_datetimes(db.session)
+        db.session.execute(text(f"PRAGMA user_version = {int(SCHEMA_FIX_VERSION)}"))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    return True
+
+
+def _reset_legacy_sqlite_schema(app):
+    """
+    Development convenience: if a legacy SQLite schema is detected (old MVP columns),
+    back up the DB file and recreate every table. Returns True when it did so.
+    """
+    db_uri = app.config.get("SQLALCHEMY_DATABASE_URI", "")
+    db_file = None
+    if db_uri.startswith("sqlite:////"):
+        db_file = db_uri.replace("sqlite:////", "/", 1)
+
+    if not db_file or not os.path.exists(db_file):
+        return False
+    try:
+        if not sqlite_table_exists(db.session, "users"):
+            # Empty file (e.g. just created by the fix-version check): nothing legacy to reset.
+            return False
+        result = db.session.execute(text("PRAGMA table_info(users)"))
+        rows = result.fetchall()
+        columns = {row[1] for row in rows}
+        id_type = next((row[2] for row in rows if row[1] == "id"), "")
+        # New schema expects full_name + updated_at.
+        is_legacy_users = (
+            "full_name" not in columns
+            or "phone" not in columns
+            or "updated_at" not in columns
+            or str(id_type).upper() != "INTEGER"
+        )
+        tractor_columns = {row[1] for row in db.session.execute(text("PRAGMA table_info(tractors)")).fetchall()}
+        booking_columns = {row[1] for row in db.session.execute(text("PRAGMA table_info(bookings)")).fetchall()}
+        missing_new_columns = (
+            "average_rating" not in tractor_columns
+            or "pincode" not in tractor_columns
+            or "village" not in tractor_columns
+            or "district" not in tractor_columns
+            or "paid_at" not in booking_columns
+            or "owner_id" not in booking_columns
+            or not sqlite_table_exists(db.session, "payments")
+        )
+    except Exception:
+        # If introspection fails, continue with best effort create_all.
+        return False
+
+    if not (is_legacy_users or missing_new_columns):
+        return False
+    backup = f"{db_file}.legacy-backup-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}"
+    shutil.copy2(db_file, backup)
+    app.logger.warning("Legacy DB detected. Backed up to %s and recreating schema.", backup)
+    db.drop_all()
+    db.create_all()
+    return True
+
+
+def _create_missing_sqlite_indexes(session):
+    """create_all skips tables that already exist, so add model indexes they are missing."""
+    existing = {row[0] for row in session.execute(text("SELECT name FROM sqlite_master WHERE type='index'"))}
+    connection = session.connection()
+    for table in db.metadata.sorted_tables:
+        if not sqlite_table_exists(session, table.name):
+            continue
+        for index in table.indexes:
+            # By name: SQLAlchemy's checkfirst does not see SQLite expression indexes.
+            if index.name not in existing:
+                index.create(connection)
+
+
+def _drop_obsolete_sqlite_indexes(session):
+    for name in OBSOLETE_SQLITE_INDEXES:
+        session.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _add_missing_sqlite_columns(session):
+    """Non-destructive ALTERs for columns newer models expect on older SQLite files."""
+
+    def column_exists(table_name, column_name):
+        rows = session.execute(text(f"PRAGMA table_info({table_name})")).fetchall()
+        return any(row[1] == column_name for row in rows)
+
+    if sqlite_table_exists(session, "users"):
+        if not column_exists("users", "phone"):
+            session.execute(text("ALTER TABLE users ADD COLUMN phone TEXT NOT NULL DEFAULT ''"))
+        if not column_exists("users", "is_verified_owner"):
+            session.execute(text("ALTER TABLE users ADD COLUMN is_verified_owner INTEGER NOT NULL DEFAULT 0"))
+        if not column_exists("users", "last_login"):
+            session.execute(text("ALTER TABLE users ADD COLUMN last_login DATETIME"))
+
+    if sqlite_table_exists(session, "tractors"):
+        if not column_exists("tractors", "pincode"):
+            session.execute(text("ALTER TABLE tractors ADD COLUMN pincode TEXT NOT NULL DEFAULT ''"))
+        if not column_exists("tractors", "village"):
+            session.execute(text("ALTER TABLE tractors ADD COLUMN village TEXT"))
+        if not column_exists("tractors", "district"):
+            session.execute(text("ALTER TABLE tractors ADD COLUMN district TEXT"))
+        if not column_exists("tractors", "equipment_type"):
+            session.execute(text("ALTER TABLE tractors ADD COLUMN equipment_type TEXT NOT NULL DEFAULT 'Tractor'"))
+        if not column_exists("tractors", "availability_status"):
+            session.execute(
+                text("ALTER TABLE tractors ADD COLUMN availability_status TEXT NOT NULL DEFAULT 'available'")
+            )
+        if not column_exists("tractors", "geo_cell"):
+            session.execute(text("ALTER TABLE tractors ADD COLUMN geo_cell INTEGER"))
+            session.execute(text("CREATE INDEX IF NOT EXISTS ix_tractors_geo_cell ON tractors (geo_cell)"))
+        if not column_exists("tractors", "image_card_path"):
+            session.execute(text("ALTER TABLE tractors ADD COLUMN image_card_path TEXT"))
+        if not column_exists("tractors", "image_thumb_path"):
+            session.execute(text("ALTER TABLE tractors ADD COLUMN image_thumb_path TEXT"))
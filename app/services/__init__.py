@@ -1,19 +1,41 @@
+from app.services.analytics_service import AnalyticsService
 from app.services.auth_service import AuthService
 from app.services.booking_service import BookingService
 from app.services.chat_service import ChatService
+from app.services.demand_service import DemandService
+from app.services.earning_service import EarningService
+from app.services.event_service import EventService
 from app.services.file_service import FileService
+from app.services.geo_service import GeoService
+from app.services.http_client import HttpClient
+from app.services.io_pool import IOPool
+from app.services.job_service import JobService
+from app.services.media_storage import MediaStorage
 from app.services.notification_service import NotificationService
+from app.services.pincode_index import PincodeIndex
 from app.services.platform_service import PlatformService
 from app.services.review_service import ReviewService
 from app.services.tractor_service import TractorService
+from app.services.weather_service import WeatherService
 
 __all__ = [
+    "AnalyticsService",
     "AuthService",
     "BookingService",
     "ChatService",
+    "DemandService",
+    "EarningService",
+    "EventService",
     "FileService",
+    "GeoService",
+    "HttpClient",
+    "IOPool",
+    "JobService",
+    "MediaStorage",
     "NotificationService",
+    "PincodeIndex",
     "PlatformService",
     "ReviewService",
     "TractorService",
+    "WeatherService",
 ]
@@ -0,0 +1,260 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+from flask import current_app
+from sqlalchemy import event, func, select, true
+
+from app.counters import upsert_counter
+from app.db_routing import primary_reads
+from app.extensions import cache, db
+from app.models import Booking, DailyRevenueRollup, Payment, Tractor, User
+from app.time_buckets import bucket_label, time_bucket
+
+ROLLUP_COUNTERS = ("bookings_count", "paid_count", "revenue", "commission", "payout")
+ADMIN_KPI_CACHE_KEY = "analytics:admin_kpis"
+
+
+def _as_date(value):
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _rows(query):
+    rows = []
+    for row in query.all():
+        item = dict(row._mapping)
+        if isinstance(item.get("period"), date):
+            item["period"] = item["period"].isoformat()
+        rows.append(item)
+    return rows
+
+
+class AnalyticsService:
+    """
+    Admin analytics read from daily_revenue_rollups, which bookings and payments
+    update in their own transactions, instead of scanning bookings and payments.
+    """
+
+    @staticmethod
+    def _bump(day, owner_id, tractor_id, **deltas):
+        upsert_counter(DailyRevenueRollup, {"day": day, "owner_id": owner_id, "tractor_id": tractor_id}, deltas)
+
+    @staticmethod
+    def record_booking(booking):
+        """Count a newly created booking (same transaction)."""
+        day = _as_date(booking.created_at or datetime.now(timezone.utc))
+        AnalyticsService._bump(day, booking.owner_id, booking.tractor_id, bookings_count=1)
+        db.session.info["admin_kpis_stale"] = True
+
+    @staticmethod
+    def record_payment(payment, booking):
+        """Add a new payment to today's totals for its tractor (same transaction)."""
+        amount = Decimal(str(payment.amount or 0))
+        commission = Decimal(str(booking.commission_amount or 0))
+        AnalyticsService._bump(
+            _as_date(payment.created_at or datetime.now(timezone.utc)),
+            payment.owner_id,
+            booking.tractor_id,
+            paid_count=1,
+            revenue=amount,
+            commission=commission,
+            payout=amount - commission,
+        )
+        db.session.info["admin_kpis_stale"] = True
+
+    @staticmethod
+    def rebuild():
+        """Recompute every rollup row from bookings and payments; returns the number of rows."""
+        totals = defaultdict(lambda: dict.fromkeys(ROLLUP_COUNTERS, 0))
+        booking_day = time_bucket(Booking.created_at, "day")
+        for day, owner_id, tractor_id, count in (
+            db.session.query(booking_day, Booking.owner_id, Booking.tractor_id, func.count(Booking.id))
+            .group_by(booking_day, Booking.owner_id, Booking.tractor_id)
+            .all()
+        ):
+            totals[(_as_date(day), owner_id, tractor_id)]["bookings_count"] = int(count)
+
+        payment_day = time_bucket(Payment.created_at, "day")
+        commission = func.coalesce(Booking.commission_amount, 0)
+        for day, owner_id, tractor_id, count, revenue, fees, payout in (
+            db.session.query(
+                payment_day,
+                Payment.owner_id,
+                Booking.tractor_id,
+                func.count(Payment.id),
+                func.coalesce(func.sum(Payment.amount), 0),
+                func.coalesce(func.sum(commission), 0),
+                func.coalesce(func.sum(Payment.amount - commission), 0),
+            )
+            .join(Booking, Booking.id == Payment.booking_id)
+            .group_by(payment_day, Payment.owner_id, Booking.tractor_id)
+            .all()
+        ):
+            row = totals[(_as_date(day), owner_id, tractor_id)]
+            row.update(paid_count=int(count), revenue=revenue, commission=fees, payout=payout)
+
+        DailyRevenueRollup.query.delete(synchronize_session=False)
+        db.session.add_all(
+            DailyRevenueRollup(day=day, owner_id=owner_id, tractor_id=tractor_id, **counters)
+            for (day, owner_id, tractor_id), counters in totals.items()
+        )
+        db.session.commit()
+        return len(totals)
+
+    @staticmethod
+    def _revenue_by_period(unit, limit):
+        period = DailyRevenueRollup.day if unit == "day" else time_bucket(DailyRevenueRollup.day, unit)
+        rows = (
+            db.session.query(
+                period.label("period"),
+                func.sum(DailyRevenueRollup.revenue).label("revenue"),
+            )
+            .group_by(period)
+            .having(func.sum(DailyRevenueRollup.paid_count) > 0)
+            .order_by(period)
+            .limit(limit)
+            .all()
+        )
+        return [{"period": bucket_label(row.period, unit), "revenue": row.revenue} for row in rows]
+
+    @staticmethod
+    def daily_revenue(limit=30):
+        return AnalyticsService._revenue_by_period("day", limit)
+
+    @staticmethod
+    def weekly_revenue(limit=12):
+        return AnalyticsService._revenue_by_period("week", limit)
+
+    @staticmethod
+    def monthly_revenue(limit=12):
+        return AnalyticsService._revenue_by_period("month", limit)
+
+    @staticmethod
+    def revenue_by_tractor(limit=10):
+        return _rows(
+            db.session.query(
+                Tractor.title.label("name"),
+                func.sum(DailyRevenueRollup.revenue).label("revenue"),
+            )
+            .join(Tractor, Tractor.id == DailyRevenueRollup.tractor_id)
+            .group_by(Tractor.id)
+            .having(func.sum(DailyRevenueRollup.paid_count) > 0)
+            .order_by(func.sum(DailyRevenueRollup.revenue).desc())
+            .limit(limit)
+        )
+
+    @staticmethod
+    def revenue_by_owner(limit=10):
+        return _rows(
+            db.session.query(
+                User.full_name.label("name"),
+                func.sum(DailyRevenueRollup.revenue).label("revenue"),
+            )
+            .join(User, User.id == DailyRevenueRollup.owner_id)
+            .group_by(User.id)
+            .having(func.sum(DailyRevenueRollup.paid_count) > 0)
+            .order_by(func.sum(DailyRevenueRollup.revenue).desc())
+            .limit(limit)
+        )
+
+    @staticmethod
+    def booking_growth(limit=30):
+        return _rows(
+            db.session.query(
+                DailyRevenueRollup.day.label("period"),
+                func.sum(DailyRevenueRollup.bookings_count).label("bookings"),
+            )
+            .group_by(DailyRevenueRollup.day)
+            .having(func.sum(DailyRevenueRollup.bookings_count) > 0)
+            .order_by(DailyRevenueRollup.day)
+            .limit(limit)
+        )
+
+    @staticmethod
+    def _compute_admin_kpis():
+        users = select(func.count(User.id).label("total_users")).subquery()
+        tractors = select(
+            func.count(Tractor.id).label("total_tractors"),
+            func.coalesce(func.avg(Tractor.average_rating), 0).label("avg_rating"),
+        ).subquery()
+        bookings = select(
+            func.count(Booking.id).label("total_bookings"),
+            func.coalesce(func.sum(Booking.commission_amount), 0).label("commission_total"),
+            func.coalesce(func.sum(Booking.owner_payout_amount), 0).label("owner_payout_total"),
+        ).subquery()
+        revenue = select(func.coalesce(func.sum(DailyRevenueRollup.revenue), 0).label("total_revenue")).subquery()
+        # One round trip and one scan per table; payments are summed from the rollups.
+        combined = users.join(tractors, true()).join(bookings, true()).join(revenue, true())
+        totals = db.session.execute(select(users, tractors, bookings, revenue).select_from(combined)).one()._mapping
+
+        booked = func.sum(DailyRevenueRollup.bookings_count)
+        top_tractors = _rows(
+            db.session.query(Tractor.title.label("tractor_title"), booked.label("booking_count"))
+            .join(Tractor, Tractor.id == DailyRevenueRollup.tractor_id)
+            .group_by(Tractor.id)
+            .having(booked > 0)
+            .order_by(booked.desc())
+            .limit(5)
+        )
+        demand_by_district = _rows(
+            db.session.query(Tractor.district.label("district"), booked.label("bookings"))
+            .join(Tractor, Tractor.id == DailyRevenueRollup.tractor_id)
+            .filter(Tractor.district.isnot(None))
+            .filter(Tractor.district != "")
+            .group_by(Tractor.district)
+            .having(booked > 0)
+            .order_by(booked.desc())
+            .limit(12)
+        )
+        supply_by_district = _rows(
+            db.session.query(Tractor.district.label("district"), func.count(Tractor.id).label("supply"))
+            .filter(Tractor.district.isnot(None))
+            .filter(Tractor.district != "")
+            .group_by(Tractor.district)
+            .order_by(func.count(Tractor.id).asc())
+            .limit(12)
+        )
+        return {
+            "total_users": int(totals["total_users"] or 0),
+            "total_tractors": int(totals["total_tractors"] or 0),
+            "total_bookings": int(totals["total_bookings"] or 0),
+            "total_revenue": float(totals["total_revenue"] or 0),
+            "avg_rating": float(totals["avg_rating"] or 0),
+            "commission_total": float(totals["commission_total"] or 0),
+            "owner_payout_total": float(totals["owner_payout_total"] or 0),
+            "top_tractors": [{**row, "booking_count": int(row["booking_count"])} for row in top_tractors],
+            "demand_by_district": [{**row, "bookings": int(row["bookings"])} for row in demand_by_district],
+            "supply_by_district": supply_by_district,
+        }
+
+    @staticmethod
+    def admin_kpis():
+        """Dashboard totals and charts, served from the shared cache for ADMIN_KPI_CACHE_TTL seconds."""
+        snapshot = cache.get(ADMIN_KPI_CACHE_KEY)
+        if snapshot is None:
+            # Computed on the primary: a lagging replica read right after invalidation
+            # would be cached as the current snapshot for the whole TTL.
+            with primary_reads(db.session):
+                snapshot = AnalyticsService._compute_admin_kpis()
+            cache.set(ADMIN_KPI_CACHE_KEY, snapshot, timeout=current_app.config.get("ADMIN_KPI_CACHE_TTL", 60))
+        return snapshot
+
+    @staticmethod
+    def invalidate_admin_kpis():
+        cache.delete(ADMIN_KPI_CACHE_KEY)
+
+
+@event.listens_for(db.session, "after_commit")
+def _drop_stale_admin_kpis(session):
+    if session.info.pop("admin_kpis_stale", False):
+        AnalyticsService.invalidate_admin_kpis()
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _keep_admin_kpis(session, _previous_transaction):
+    if not session.in_transaction():
+        session.info.pop("admin_kpis_stale", None)
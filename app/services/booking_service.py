@@ -1,9 +1,26 @@
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
+
+from app.counters import upsert_counter
 from app.errors import AppError
 from app.extensions import db
-from app.models import Booking, BookingAddon, OwnerEarning, Payment, Tractor
+from app.pagination import keyset_page
+from app.models import (
+    Booking,
+    BookingAddon,
+    OwnerEarning,
+    Payment,
+    ReceiptSequence,
+    Tractor,
+    TractorReservation,
+)
+from app.services.analytics_service import AnalyticsService
+from app.services.demand_service import DemandService
+from app.services.earning_service import EarningService
 from app.services.notification_service import NotificationService
 from app.services.platform_service import PlatformService
 
@@ -27,12 +44,16 @@ class BookingService:
     def _status_label(status):
         return (status or "").replace("_", " ").title()
 
+    @staticmethod
+    def _next_receipt_sequence(day):
+        # Atomic increment on the day's counter row; concurrent payments queue on
+        # that row lock instead of scanning payments and racing on the unique key.
+        return int(upsert_counter(ReceiptSequence, {"day": day}, {"last_value": 1}, returning="last_value"))
+
     @staticmethod
     def _generate_receipt_number():
         today = datetime.now(timezone.utc).strftime("%Y%m%d")
-        prefix = f"UZG-{today}-"
-        count_today = Payment.query.filter(Payment.receipt_number.like(f"{prefix}%")).count() + 1
-        return f"{prefix}{count_today:04d}"
+        return f"UZG-{today}-{BookingService._next_receipt_sequence(today):04d}"
 
     @staticmethod
     def _create_payment_for_booking(booking):
@@ -61,20 +82,75 @@ class BookingService:
                 net_amount=net,
             )
             db.session.add(earning)
+            EarningService.record(earning)
         db.session.add(payment)
+        AnalyticsService.record_payment(payment, booking)
         return payment
 
+    @staticmethod
+    def completed_jobs_by_owner(owner_ids):
+        """Paid booking counts for many owners in one grouped query."""
+        owner_ids = {owner_id for owner_id in owner_ids if owner_id is not None}
+        if not owner_ids:
+            return {}
+        rows = (
+            db.session.query(Booking.owner_id, func.count(Booking.id))
+            .filter(Booking.owner_id.in_(owner_ids))
+            .filter(Booking.status == "paid")
+            .group_by(Booking.owner_id)
+            .all()
+        )
+        return {owner_id: int(count) for owner_id, count in rows}
+
+    @staticmethod
+    def owner_bookings_page(owner_id, status=None, cursor=None, limit=20):
+        """
+        Keyset page of an owner's bookings, newest first, ordered by (created_at, id).
+        Tractor, farmer and payment are joined in the same query.
+        Returns (rows, next_cursor); next_cursor is None on the last page.
+        limit=None returns every matching booking, for callers that predate paging.
+        """
+        if limit is not None:
+            limit = max(1, min(int(limit), 100))
+        query = Booking.query.options(
+            joinedload(Booking.tractor),
+            joinedload(Booking.farmer),
+            joinedload(Booking.payment),
+        ).filter(Booking.owner_id == owner_id)
+        if status:
+            query = query.filter(Booking.status == status)
+        return keyset_page(query, Booking, cursor=cursor, limit=limit, label="bookings")
+
     @staticmethod
     def _has_conflict(tractor_id, start_dt, end_dt):
-        active_statuses = {"pending", "accepted", "en_route", "working", "completed", "paid"}
         return (
-            Booking.query.filter(Booking.tractor_id == tractor_id)
-            .filter(Booking.status.in_(active_statuses))
-            .filter(Booking.start_time < end_dt, Booking.end_time > start_dt)
+            TractorReservation.query.filter(TractorReservation.tractor_id == tractor_id)
+            .filter(TractorReservation.end_time > start_dt, TractorReservation.start_time < end_dt)
             .first()
             is not None
         )
 
+    @staticmethod
+    def _reserve_slot(booking):
+        try:
+            with db.session.begin_nested():
+                db.session.add(
+                    TractorReservation(
+                        tractor_id=booking.tractor_id,
+                        booking_id=booking.id,
+                        start_time=booking.start_time,
+                        end_time=booking.end_time,
+                    )
+                )
+        except IntegrityError as exc:
+            # A parallel booking took the slot between our check and insert.
+            db.session.rollback()
+            raise AppError("Tractor already booked for the selected time slot.", 409) from exc
+
+    @staticmethod
+    def _release_slot(booking):
+        TractorReservation.query.filter_by(booking_id=booking.id).delete(synchronize_session=False)
+
     @staticmethod
     def create_booking(
         farmer_id,
@@ -166,6 +242,9 @@ class BookingService:
         )
         db.session.add(booking)
         db.session.flush()
+        BookingService._reserve_slot(booking)
+        DemandService.adjust(tractor.pincode, 1)
+        AnalyticsService.record_booking(booking)
         for addon_id, qty, row_total in addon_rows:
             db.session.add(
                 BookingAddon(
@@ -193,14 +272,7 @@ class BookingService:
 
     @staticmethod
     def _surge_multiplier_for_pincode(pincode):
-        threshold = int(PlatformService.get_decimal("surge_threshold", Decimal("5")))
-        booking_count = (
-            Booking.query.join(Tractor, Tractor.id == Booking.tractor_id)
-            .filter(Tractor.pincode == pincode)
-            .filter(Booking.status.in_(["pending", "accepted", "en_route", "working"]))
-            .count()
-        )
-        return Decimal("1.10") if booking_count > threshold else Decimal("1.00")
+        return Decimal("1.10") if DemandService.is_high_demand(pincode) else Decimal("1.00")
 
     @staticmethod
     def transition_booking(booking, new_status, actor_user):
@@ -217,6 +289,7 @@ class BookingService:
             raise AppError(f"Invalid status transition from {current} to {new_status}.", 400)
 
         booking.status = new_status
+        DemandService.on_status_change(booking.tractor.pincode, current, new_status)
         now = datetime.now(timezone.utc)
 
         if new_status == "accepted":
@@ -228,6 +301,7 @@ class BookingService:
             )
         elif new_status == "cancelled":
             booking.cancelled_at = now
+            BookingService._release_slot(booking)
             NotificationService.push(
                 booking.farmer_id,
                 "Booking cancelled",
@@ -1,6 +1,13 @@
+from sqlalchemy import func, or_
+from sqlalchemy.orm import joinedload
+
 from app.errors import AppError
 from app.extensions import db
 from app.models import Booking, ChatMessage
+from app.services.event_service import EventService
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 300
 
 
 class ChatService:
@@ -9,18 +16,35 @@ class ChatService:
         return user.role == "admin" or user.id in {booking.farmer_id, booking.owner_id}
 
     @staticmethod
-    def list_messages(booking_id, user):
+    def list_messages(booking_id, user, after_id=None, before_id=None, since=None, limit=DEFAULT_PAGE_SIZE):
+        """
+        One page of a booking chat in ascending order, senders eager-loaded.
+        - after_id / since: only messages newer than the cursor (polling).
+        - before_id: the page just older than the cursor (scroll-back).
+        - no cursor: the latest page.
+        """
         booking = Booking.query.get(booking_id)
         if not booking:
             raise AppError("Booking not found.", 404)
         if not ChatService.can_access_booking_chat(booking, user):
             raise AppError("Forbidden.", 403)
-        return (
-            ChatMessage.query.filter_by(booking_id=booking_id)
-            .order_by(ChatMessage.created_at.asc())
-            .limit(300)
-            .all()
-        )
+
+        limit = max(1, min(int(limit or DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE))
+        query = ChatMessage.query.options(joinedload(ChatMessage.sender)).filter(ChatMessage.booking_id == booking_id)
+        if after_id is not None:
+            return query.filter(ChatMessage.id > after_id).order_by(ChatMessage.id.asc()).limit(limit).all()
+        if since is not None:
+            return (
+                query.filter(ChatMessage.created_at > since)
+                .order_by(ChatMessage.created_at.asc(), ChatMessage.id.asc())
+                .limit(limit)
+                .all()
+            )
+        if before_id is not None:
+            query = query.filter(ChatMessage.id < before_id)
+        rows = query.order_by(ChatMessage.id.desc()).limit(limit).all()
+        rows.reverse()
+        return rows
 
     @staticmethod
     def post_message(booking_id, sender_id, sender_user, message):
@@ -36,5 +60,41 @@ class ChatService:
         row = ChatMessage(booking_id=booking_id, sender_id=sender_id, message=text)
         db.session.add(row)
         db.session.commit()
+        payload = ChatService.serialize(row)
+        for user_id in {booking.farmer_id, booking.owner_id}:
+            EventService.publish_to_user(user_id, "chat_message", payload)
         return row
 
+    @staticmethod
+    def serialize(row):
+        return {
+            "id": row.id,
+            "booking_id": row.booking_id,
+            "sender_id": row.sender_id,
+            "sender_name": row.sender.full_name,
+            "message": row.message,
+            "created_at": row.created_at.isoformat() if row.created_at else None,
+        }
+
+    @staticmethod
+    def messages_for_user_after(user_id, after_id, limit=MAX_PAGE_SIZE):
+        """Messages in any of the user's booking chats newer than after_id (stream catch-up)."""
+        return (
+            ChatMessage.query.options(joinedload(ChatMessage.sender))
+            .join(Booking, Booking.id == ChatMessage.booking_id)
+            .filter(or_(Booking.farmer_id == user_id, Booking.owner_id == user_id))
+            .filter(ChatMessage.id > after_id)
+            .order_by(ChatMessage.id.asc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def latest_message_id_for_user(user_id):
+        return (
+            db.session.query(func.max(ChatMessage.id))
+            .join(Booking, Booking.id == ChatMessage.booking_id)
+            .filter(or_(Booking.farmer_id == user_id, Booking.owner_id == user_id))
+            .scalar()
+            or 0
+        )
@@ -0,0 +1,70 @@
+from decimal import Decimal
+
+from sqlalchemy import case, func, update
+
+from app.counters import upsert_counter
+from app.extensions import db
+from app.models import Booking, PincodeDemand, Tractor
+from app.services.platform_service import PlatformService
+
+ACTIVE_DEMAND_STATUSES = {"pending", "accepted", "en_route", "working"}
+
+
+class DemandService:
+    """Maintained count of active bookings per pincode, used for surge and high-demand flags."""
+
+    @staticmethod
+    def is_active(status):
+        return (status or "").lower() in ACTIVE_DEMAND_STATUSES
+
+    @staticmethod
+    def adjust(pincode, delta):
+        if not pincode or not delta:
+            return
+        if delta > 0:
+            upsert_counter(PincodeDemand, {"pincode": pincode}, {"active_bookings": delta})
+            return
+        # Decrements never create a row and never take the count below zero.
+        new_value = PincodeDemand.active_bookings + delta
+        db.session.execute(
+            update(PincodeDemand)
+            .where(PincodeDemand.pincode == pincode)
+            .values(active_bookings=case((new_value < 0, 0), else_=new_value))
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def on_status_change(pincode, old_status, new_status):
+        was_active = DemandService.is_active(old_status)
+        is_active = DemandService.is_active(new_status)
+        if was_active != is_active:
+            DemandService.adjust(pincode, 1 if is_active else -1)
+
+    @staticmethod
+    def active_count(pincode):
+        row = db.session.get(PincodeDemand, pincode)
+        return int(row.active_bookings) if row else 0
+
+    @staticmethod
+    def is_high_demand(pincode):
+        if not pincode:
+            return False
+        threshold = int(PlatformService.get_decimal("surge_threshold", Decimal("5")))
+        return DemandService.active_count(pincode) > threshold
+
+    @staticmethod
+    def rebuild():
+        """Recount every pincode from bookings; returns the number of pincodes with active demand."""
+        counts = dict(
+            db.session.query(Tractor.pincode, func.count(Booking.id))
+            .join(Tractor, Tractor.id == Booking.tractor_id)
+            .filter(Booking.status.in_(ACTIVE_DEMAND_STATUSES))
+            .group_by(Tractor.pincode)
+            .all()
+        )
+        for row in PincodeDemand.query.all():
+            row.active_bookings = int(counts.pop(row.pincode, 0))
+        for pincode, count in counts.items():
+            db.session.add(PincodeDemand(pincode=pincode, active_bookings=int(count)))
+        db.session.commit()
+        return PincodeDemand.query.filter(PincodeDemand.active_bookings > 0).count()
@@ -0,0 +1,108 @@
+from decimal import Decimal
+
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
+
+from app.counters import upsert_counter
+from app.extensions import db
+from app.pagination import keyset_page
+from app.models import Booking, OwnerEarning, OwnerEarningSummary
+
+
+class EarningService:
+    @staticmethod
+    def record(earning):
+        """Add a new OwnerEarning to its owner's running totals (same transaction)."""
+        gross = Decimal(str(earning.gross_amount or 0))
+        fee = Decimal(str(earning.platform_fee or 0))
+        net = Decimal(str(earning.net_amount or 0))
+        upsert_counter(
+            OwnerEarningSummary,
+            {"owner_id": earning.owner_id},
+            {"earnings_count": 1, "gross_total": gross, "platform_fee_total": fee, "net_total": net},
+        )
+
+    @staticmethod
+    def totals_for_owner(owner_id):
+        summary = db.session.get(OwnerEarningSummary, owner_id)
+        if summary is not None:
+            return {
+                "count": int(summary.earnings_count or 0),
+                "gross_total": float(summary.gross_total or 0),
+                "platform_fee_total": float(summary.platform_fee_total or 0),
+                "net_total": float(summary.net_total or 0),
+            }
+        # Owners not yet rolled up: aggregate in SQL rather than in Python.
+        count, gross, fee, net = (
+            db.session.query(
+                func.count(OwnerEarning.id),
+                func.coalesce(func.sum(OwnerEarning.gross_amount), 0),
+                func.coalesce(func.sum(OwnerEarning.platform_fee), 0),
+                func.coalesce(func.sum(OwnerEarning.net_amount), 0),
+            )
+            .filter(OwnerEarning.owner_id == owner_id)
+            .one()
+        )
+        return {
+            "count": int(count or 0),
+            "gross_total": float(gross or 0),
+            "platform_fee_total": float(fee or 0),
+            "net_total": float(net or 0),
+        }
+
+    @staticmethod
+    def breakdown_page(owner_id, cursor=None, per_page=20):
+        """Keyset page of an owner's earnings, newest first; see app.pagination.keyset_page."""
+        query = OwnerEarning.query.options(
+            joinedload(OwnerEarning.booking).joinedload(Booking.tractor),
+            joinedload(OwnerEarning.booking).joinedload(Booking.farmer),
+            joinedload(OwnerEarning.booking).joinedload(Booking.payment),
+        ).filter(OwnerEarning.owner_id == owner_id)
+        rows, next_cursor = keyset_page(query, OwnerEarning, cursor=cursor, limit=per_page, label="earnings")
+        items = [
+            {
+                "booking_id": earning.booking_id,
+                "tractor_title": earning.booking.tractor.title if earning.booking and earning.booking.tractor else "",
+                "farmer_name": earning.booking.farmer.full_name
+                if earning.booking and earning.booking.farmer
+                else "Farmer",
+                "hours": earning.booking.hours if earning.booking else None,
+                "gross_amount": float(earning.gross_amount or 0),
+                "platform_fee": float(earning.platform_fee or 0),
+                "net_amount": float(earning.net_amount or 0),
+                "receipt_number": earning.booking.payment.receipt_number
+                if earning.booking and earning.booking.payment
+                else None,
+                "created_at": earning.created_at,
+            }
+            for earning in rows
+        ]
+        return {"items": items, "next_cursor": next_cursor}
+
+    @staticmethod
+    def rebuild():
+        """Recompute every owner's summary from owner_earnings; returns the number of owners."""
+        totals = (
+            db.session.query(
+                OwnerEarning.owner_id,
+                func.count(OwnerEarning.id),
+                func.coalesce(func.sum(OwnerEarning.gross_amount), 0),
+                func.coalesce(func.sum(OwnerEarning.platform_fee), 0),
+                func.coalesce(func.sum(OwnerEarning.net_amount), 0),
+            )
+            .group_by(OwnerEarning.owner_id)
+            .all()
+        )
+        OwnerEarningSummary.query.delete(synchronize_session=False)
+        for owner_id, count, gross, fee, net in totals:
+            db.session.add(
+                OwnerEarningSummary(
+                    owner_id=owner_id,
+                    earnings_count=int(count),
+                    gross_total=gross,
+                    platform_fee_total=fee,
+                    net_total=net,
+                )
+            )
+        db.session.commit()
+        return len(totals)
@@ -0,0 +1,172 @@
+import json
+import queue
+import select
+import time
+from threading import Lock, Thread
+
+from flask import current_app
+from sqlalchemy.engine import make_url
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more.
+PG_NOTIFY_MAX_BYTES = 7900
+
+
+class LocalBroker:
+    """
+    In-process fan-out: every subscriber gets its own bounded queue.
+    Events published on another worker are not seen here; stream clients pick
+    those up through the catch-up query when they reconnect. Use PostgresBroker
+    when more than one process serves or publishes events.
+    """
+
+    def __init__(self, max_queue=100):
+        self.max_queue = max_queue
+        self._lock = Lock()
+        self._subscribers = {}
+
+    @classmethod
+    def from_app(cls, app):
+        return cls()
+
+    def publish(self, channel, event):
+        with self._lock:
+            targets = list(self._subscribers.get(channel, ()))
+        for target in targets:
+            try:
+                target.put_nowait(event)
+            except queue.Full:
+                # Slow consumer; it will resync from the database on reconnect.
+                pass
+
+    def subscribe(self, channel):
+        target = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(target)
+        return target
+
+    def unsubscribe(self, channel, target):
+        with self._lock:
+            targets = self._subscribers.get(channel)
+            if targets is None:
+                return
+            targets.discard(target)
+            if not targets:
+                self._subscribers.pop(channel, None)
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Cross-process fan-out over PostgreSQL LISTEN/NOTIFY, so events published by any
+    web or job worker reach streams held open by every other one. Each process
+    publishes with pg_notify; processes with stream subscribers also keep one
+    LISTEN connection whose thread hands events to the local queues.
+    """
+
+    pg_channel = "uzhavango_events"
+
+    def __init__(self, dsn, logger, max_queue=100):
+        super().__init__(max_queue=max_queue)
+        self.dsn = dsn
+        self.logger = logger
+        self._publish_lock = Lock()
+        self._publish_connection = None
+        self._listener = None
+
+    @classmethod
+    def from_app(cls, app):
+        url = make_url(app.config.get("EVENT_BROKER_URL") or app.config["SQLALCHEMY_DATABASE_URI"])
+        # psycopg2 takes a libpq URI, without SQLAlchemy's "+driver" suffix.
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        return cls(dsn, app.logger)
+
+    def _connect(self):
+        import psycopg2
+        from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+        connection = psycopg2.connect(self.dsn)
+        connection.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        return connection
+
+    def publish(self, channel, event):
+        message = json.dumps({"channel": channel, "event": event}, default=str)
+        if len(message.encode("utf-8")) > PG_NOTIFY_MAX_BYTES:
+            # Too large to NOTIFY; other workers' clients get it from the catch-up query on reconnect.
+            super().publish(channel, event)
+            return
+        with self._publish_lock:
+            try:
+                if self._publish_connection is None or self._publish_connection.closed:
+                    self._publish_connection = self._connect()
+                with self._publish_connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_notify(%s, %s)", (self.pg_channel, message))
+            except Exception as exc:
+                # Publishing runs after the commit; a broker outage must not fail the request.
+                self.logger.warning("Event publish failed: %s", exc)
+                self._publish_connection = None
+                super().publish(channel, event)
+
+    def subscribe(self, channel):
+        with self._lock:
+            if self._listener is None or not self._listener.is_alive():
+                self._listener = Thread(target=self._listen, name="event-broker-listener", daemon=True)
+                self._listener.start()
+        return super().subscribe(channel)
+
+    def _deliver(self, payload):
+        message = json.loads(payload)
+        LocalBroker.publish(self, message["channel"], message["event"])
+
+    def _listen(self):
+        while True:
+            connection = None
+            try:
+                connection = self._connect()
+                with connection.cursor() as cursor:
+                    cursor.execute(f"LISTEN {self.pg_channel}")
+                while True:
+                    if select.select([connection], [], [], 30) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self._deliver(connection.notifies.pop(0).payload)
+            except Exception as exc:
+                # Streams reconnect with Last-Event-ID and replay what was missed meanwhile.
+                self.logger.warning("Event listener reconnecting: %s", exc)
+                time.sleep(1)
+            finally:
+                if connection is not None:
+                    connection.close()
+
+
+BROKER_BACKENDS = {
+    "local": LocalBroker,
+    "postgres": PostgresBroker,
+}
+
+
+class EventService:
+    @staticmethod
+    def broker():
+        broker = current_app.extensions.get("event_broker")
+        if broker is None:
+            backend = current_app.config.get("EVENT_BROKER", "local")
+            broker_cls = BROKER_BACKENDS.get(backend, LocalBroker)
+            broker = current_app.extensions.setdefault("event_broker", broker_cls.from_app(current_app))
+        return broker
+
+    @staticmethod
+    def user_channel(user_id):
+        return f"user:{user_id}"
+
+    @staticmethod
+    def publish_to_user(user_id, event_type, payload):
+        EventService.broker().publish(EventService.user_channel(user_id), {"type": event_type, "data": payload})
+
+    @staticmethod
+    def format_sse(event_type, payload, event_id=None):
+        lines = []
+        if event_id:
+            lines.append(f"id: {event_id}")
+        lines.append(f"event: {event_type}")
+        lines.append(f"data: {json.dumps(payload, default=str)}")
+        return "\n".join(lines) + "\n\n"
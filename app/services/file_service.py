@@ -1,16 +1,32 @@
 import os
 import base64
-from datetime import datetime
+import binascii
+import tempfile
 from pathlib import Path
 from uuid import uuid4
 
-from PIL import Image
+from PIL import Image, ImageOps, features
 from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
 from app.errors import AppError
+from app.services.media_storage import MediaStorage
 
 ALLOWED_EXTENSIONS = {"png", "jpg", "jpeg", "webp"}
+# Tractor column -> maximum width. image_path keeps the largest (detail page) rendition.
+IMAGE_VARIANTS = (
+    ("image_thumb_path", 160),
+    ("image_card_path", 480),
+    ("image_path", 1280),
+)
+# Written during the upload request; the smaller renditions are built by the
+# "media.image_variants" job (Tractor.card_image/thumb_image fall back until then).
+UPLOAD_VARIANT_FIELDS = ("image_path",)
+VARIANT_QUALITY = 80
+CAMERA_MIME_TYPES = {"image/jpeg", "image/png", "image/webp"}
+DEFAULT_MAX_IMAGE_BYTES = 4 * 1024 * 1024
+# Base64 characters decoded per step; a multiple of 4 so chunks never split a quantum.
+DECODE_CHUNK_CHARS = 64 * 1024
 
 
 class FileService:
@@ -35,37 +51,102 @@ class FileService:
         except Exception as exc:
             raise AppError("Invalid image file.", 400) from exc
 
-        dated_folder = datetime.utcnow().strftime("%Y/%m/%d")
-        folder = Path(upload_root) / dated_folder
-        folder.mkdir(parents=True, exist_ok=True)
+        return cls.write_variants(storage.stream, upload_root, fields=UPLOAD_VARIANT_FIELDS)
 
-        extension = filename.rsplit(".", 1)[1].lower()
-        unique_filename = f"{uuid4().hex}.{extension}"
-        absolute_path = folder / unique_filename
-        storage.save(absolute_path)
-
-        return str(Path(upload_root).name + "/" + dated_folder + "/" + unique_filename)
+    @staticmethod
+    def _decode_base64_to_file(data: str, offset: int, target, max_bytes: int):
+        """Decode data[offset:] into target one chunk at a time, without copying the whole payload."""
+        written = 0
+        for start in range(offset, len(data), DECODE_CHUNK_CHARS):
+            chunk = base64.b64decode(data[start : start + DECODE_CHUNK_CHARS], validate=True)
+            written += len(chunk)
+            if written > max_bytes:
+                raise AppError("Camera image is too large.", 413)
+            target.write(chunk)
+        return written
 
     @classmethod
-    def save_camera_data_url(cls, data_url: str, upload_root: str):
+    def save_camera_data_url(cls, data_url: str, upload_root: str, max_bytes: int = DEFAULT_MAX_IMAGE_BYTES):
         if not data_url or "base64," not in data_url:
             return None
+        header, _, _ = data_url[:100].partition("base64,")
+        mime_type = header.removeprefix("data:").split(";", 1)[0].strip().lower()
+        if mime_type not in CAMERA_MIME_TYPES:
+            raise AppError("Unsupported image format.", 400)
+        payload_start = len(header) + len("base64,")
+        # Reject obviously oversized payloads before decoding anything.
+        if (len(data_url) - payload_start) // 4 * 3 > max_bytes + 2:
+            raise AppError("Camera image is too large.", 413)
+
+        Path(upload_root).mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=upload_root, suffix=".part")
         try:
-            header, encoded = data_url.split("base64,", 1)
-            if "image/jpeg" in header:
-                extension = "jpg"
-            elif "image/webp" in header:
-                extension = "webp"
-            else:
-                extension = "png"
-
-            dated_folder = datetime.utcnow().strftime("%Y/%m/%d")
-            folder = Path(upload_root) / dated_folder
-            folder.mkdir(parents=True, exist_ok=True)
-
-            unique_filename = f"{uuid4().hex}.{extension}"
-            absolute_path = folder / unique_filename
-            absolute_path.write_bytes(base64.b64decode(encoded))
-            return str(Path(upload_root).name + "/" + dated_folder + "/" + unique_filename)
+            with os.fdopen(fd, "wb") as target:
+                try:
+                    cls._decode_base64_to_file(data_url, payload_start, target, max_bytes)
+                except (binascii.Error, ValueError) as exc:
+                    raise AppError("Invalid camera image payload.", 400) from exc
+            # Same check as save_image: the bytes must really be an image.
+            try:
+                with Image.open(temp_path) as img:
+                    img.verify()
+            except Exception as exc:
+                raise AppError("Invalid image file.", 400) from exc
+            return cls.write_variants(temp_path, upload_root, fields=UPLOAD_VARIANT_FIELDS)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    @staticmethod
+    def _variant_format():
+        return ("WEBP", "webp") if features.check("webp") else ("JPEG", "jpg")
+
+    @staticmethod
+    def _prepare(img, image_format):
+        # Re-encoding from pixel data drops EXIF (including GPS) and other metadata.
+        img = ImageOps.exif_transpose(img)
+        has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+        if image_format == "WEBP" and has_alpha:
+            return img.convert("RGBA")
+        if has_alpha:
+            background = Image.new("RGB", img.size, (255, 255, 255))
+            background.paste(img.convert("RGBA"), mask=img.convert("RGBA").split()[-1])
+            return background
+        return img.convert("RGB")
+
+    @classmethod
+    def write_variants(cls, source, upload_root: str, fields=None):
+        """
+        Decode source (path or file object), fix its orientation and store one re-encoded
+        rendition per IMAGE_VARIANTS width (only those in `fields`, if given) under a key
+        derived from the source bytes. Re-uploading the same photo reuses the stored
+        renditions. Returns {tractor column: media key}.
+        """
+        image_format, extension = cls._variant_format()
+        digest = MediaStorage.content_hash(source)
+        variants = [(field, width) for field, width in IMAGE_VARIANTS if fields is None or field in fields]
+        keys = {field: MediaStorage.key_for(digest, f"_{width}.{extension}") for field, width in variants}
+        if all(MediaStorage.exists(key) for key in keys.values()):
+            return keys
+
+        try:
+            with Image.open(source) as original:
+                img = cls._prepare(original, image_format)
         except Exception as exc:
-            raise AppError("Invalid camera image payload.", 400) from exc
+            raise AppError("Invalid image file.", 400) from exc
+
+        staging = Path(upload_root) / ".staging"
+        staging.mkdir(parents=True, exist_ok=True)
+        save_options = {"quality": VARIANT_QUALITY}
+        save_options.update({"method": 4} if image_format == "WEBP" else {"optimize": True, "progressive": True})
+        content_type = f"image/{'webp' if image_format == 'WEBP' else 'jpeg'}"
+
+        for field, width in variants:
+            variant = img
+            if img.width > width:
+                variant = img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+            # Encode into staging; storage moves it into place whole, so readers never see a partial file.
+            partial_path = staging / f"{uuid4().hex}.part"
+            variant.save(partial_path, image_format, **save_options)
+            MediaStorage.put(keys[field], str(partial_path), content_type)
+        return keys
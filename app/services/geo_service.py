@@ -0,0 +1,60 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+# 0.05 degrees is roughly 5.5 km of latitude: a 25 km radius spans about 11 x 11 cells.
+GEO_CELL_DEG = 0.05
+_LAT_CELLS = int(round(180 / GEO_CELL_DEG))
+_LON_CELLS = int(round(360 / GEO_CELL_DEG))
+
+
+class GeoService:
+    """Fixed-size lat/lon grid cells plus batched great-circle distances."""
+
+    @staticmethod
+    def cell_index(lat, lon):
+        return math.floor(float(lat) / GEO_CELL_DEG), math.floor(float(lon) / GEO_CELL_DEG)
+
+    @staticmethod
+    def cell_key(lat_idx, lon_idx):
+        return (lat_idx + _LAT_CELLS // 2) * _LON_CELLS + (lon_idx + _LON_CELLS // 2)
+
+    @staticmethod
+    def cell_for(lat, lon):
+        if lat is None or lon is None:
+            return None
+        return GeoService.cell_key(*GeoService.cell_index(lat, lon))
+
+    @staticmethod
+    def cells_within(lat, lon, radius_km):
+        """Keys of every grid cell overlapping the bounding box of a radius around (lat, lon)."""
+        lat, lon = float(lat), float(lon)
+        lat_span = radius_km / KM_PER_DEGREE
+        lon_span = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lon_lo = GeoService.cell_index(lat - lat_span, lon - lon_span)
+        lat_hi, lon_hi = GeoService.cell_index(lat + lat_span, lon + lon_span)
+        return [
+            GeoService.cell_key(lat_idx, lon_idx)
+            for lat_idx in range(lat_lo, lat_hi + 1)
+            for lon_idx in range(lon_lo, lon_hi + 1)
+        ]
+
+    @staticmethod
+    def haversine_km(lat1, lon1, lat2, lon2):
+        return GeoService.distances_km(lat1, lon1, [(lat2, lon2)])[0]
+
+    @staticmethod
+    def distances_km(lat, lon, points):
+        """Haversine distances from (lat, lon) to every (lat, lon) in points, computed in one pass."""
+        lat0 = math.radians(float(lat))
+        lon0 = math.radians(float(lon))
+        cos_lat0 = math.cos(lat0)
+        sin, cos, asin, sqrt, radians = math.sin, math.cos, math.asin, math.sqrt, math.radians
+        distances = []
+        for p_lat, p_lon in points:
+            lat1 = radians(float(p_lat))
+            d_lat = lat1 - lat0
+            d_lon = radians(float(p_lon)) - lon0
+            a = sin(d_lat / 2) ** 2 + cos_lat0 * cos(lat1) * sin(d_lon / 2) ** 2
+            distances.append(2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a))))
+        return distances
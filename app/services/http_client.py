@@ -0,0 +1,210 @@
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from flask import current_app
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class UpstreamError(Exception):
+    pass
+
+
+class CircuitOpenError(UpstreamError):
+    pass
+
+
+class _HostState:
+    """Concurrency slots, circuit breaker and counters for one upstream host."""
+
+    def __init__(self, max_concurrency):
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+        self.lock = threading.Lock()
+        self.consecutive_failures = 0
+        self.open_until = 0.0
+        self.probe_in_flight = False
+        self.requests = 0
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.latency_ms_total = 0.0
+        self.latency_ms_max = 0.0
+        self.last_error = None
+
+    def state(self, now):
+        if self.open_until == 0.0:
+            return "closed"
+        return "open" if now < self.open_until else "half_open"
+
+
+class OutboundHTTP:
+    """
+    Shared keep-alive session for third-party APIs. Calls are GET-only and idempotent,
+    so failed attempts are retried with jittered backoff inside the caller's timeout.
+    """
+
+    def __init__(
+        self,
+        pool_size=20,
+        per_host_limit=8,
+        retries=2,
+        backoff=0.2,
+        breaker_threshold=5,
+        breaker_cooldown=30.0,
+        user_agent="UzhavanGo/1.0",
+    ):
+        self.per_host_limit = per_host_limit
+        self.retries = retries
+        self.backoff = backoff
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = user_agent
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._hosts_lock = threading.Lock()
+        self._hosts = {}
+
+    def _host(self, host):
+        with self._hosts_lock:
+            state = self._hosts.get(host)
+            if state is None:
+                state = self._hosts[host] = _HostState(self.per_host_limit)
+            return state
+
+    def _admit(self, state):
+        now = time.monotonic()
+        with state.lock:
+            current = state.state(now)
+            if current == "open" or (current == "half_open" and state.probe_in_flight):
+                state.short_circuited += 1
+                return False
+            if current == "half_open":
+                state.probe_in_flight = True
+            return True
+
+    def _record(self, state, elapsed_ms, error=None, upstream_fault=True):
+        """
+        Count one call. Only upstream faults (5xx, timeouts, connection errors) move the
+        breaker; a 4xx or malformed body means the host answered, so it counts as healthy.
+        upstream_fault=None means the host was never reached and leaves the breaker alone.
+        """
+        with state.lock:
+            state.requests += 1
+            state.latency_ms_total += elapsed_ms
+            state.latency_ms_max = max(state.latency_ms_max, elapsed_ms)
+            state.probe_in_flight = False
+            if error is None:
+                state.successes += 1
+            else:
+                state.failures += 1
+                state.last_error = error
+            if error is not None and upstream_fault:
+                state.consecutive_failures += 1
+                if state.open_until or state.consecutive_failures >= self.breaker_threshold:
+                    state.open_until = time.monotonic() + self.breaker_cooldown
+            elif upstream_fault is not None:
+                state.consecutive_failures = 0
+                state.open_until = 0.0
+
+    def get_json(self, url, params=None, timeout=5.0):
+        """GET url and decode JSON; raises UpstreamError once retries or the timeout run out."""
+        host = urlsplit(url).netloc
+        state = self._host(host)
+        if not self._admit(state):
+            raise CircuitOpenError(f"Circuit open for {host}.")
+        deadline = time.monotonic() + timeout
+        started = time.monotonic()
+        error = "timed out waiting for a connection slot"
+        if not state.slots.acquire(timeout=timeout):
+            # Saturated locally; the calls holding the slots report their own outcome.
+            self._record(state, (time.monotonic() - started) * 1000, error, upstream_fault=None)
+            raise UpstreamError(f"{host}: {error}.")
+        upstream_fault = True
+        try:
+            for attempt in range(self.retries + 1):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    response = self.session.get(url, params=params, timeout=remaining)
+                    if response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        data = response.json()
+                        self._record(state, (time.monotonic() - started) * 1000)
+                        return data
+                    error = f"HTTP {response.status_code}"
+                    upstream_fault = response.status_code >= 500
+                except (requests.ConnectionError, requests.Timeout) as exc:
+                    error = exc.__class__.__name__
+                    upstream_fault = True
+                except (requests.HTTPError, ValueError) as exc:
+                    # Non-retryable response (4xx or a malformed body).
+                    error = str(exc) or exc.__class__.__name__
+                    upstream_fault = False
+                    break
+                if attempt < self.retries:
+                    delay = random.uniform(0, self.backoff * (2**attempt))
+                    if time.monotonic() + delay >= deadline:
+                        break
+                    with state.lock:
+                        state.retries += 1
+                    time.sleep(delay)
+        finally:
+            state.slots.release()
+        self._record(state, (time.monotonic() - started) * 1000, error, upstream_fault)
+        raise UpstreamError(f"{host}: {error}.")
+
+    def metrics(self):
+        now = time.monotonic()
+        with self._hosts_lock:
+            hosts = dict(self._hosts)
+        snapshot = {}
+        for host, state in hosts.items():
+            with state.lock:
+                snapshot[host] = {
+                    "state": state.state(now),
+                    "requests": state.requests,
+                    "successes": state.successes,
+                    "failures": state.failures,
+                    "retries": state.retries,
+                    "short_circuited": state.short_circuited,
+                    "avg_latency_ms": round(state.latency_ms_total / state.requests, 1) if state.requests else 0.0,
+                    "max_latency_ms": round(state.latency_ms_max, 1),
+                    "last_error": state.last_error,
+                }
+        return snapshot
+
+
+class HttpClient:
+    @staticmethod
+    def client():
+        client = current_app.extensions.get("http_client")
+        if client is None:
+            config = current_app.config
+            client = current_app.extensions.setdefault(
+                "http_client",
+                OutboundHTTP(
+                    pool_size=config.get("HTTP_POOL_SIZE", 20),
+                    per_host_limit=config.get("HTTP_PER_HOST_LIMIT", 8),
+                    retries=config.get("HTTP_RETRIES", 2),
+                    backoff=config.get("HTTP_RETRY_BACKOFF", 0.2),
+                    breaker_threshold=config.get("HTTP_BREAKER_THRESHOLD", 5),
+                    breaker_cooldown=config.get("HTTP_BREAKER_COOLDOWN", 30.0),
+                ),
+            )
+        return client
+
+    @staticmethod
+    def get_json(url, params=None, timeout=5.0):
+        return HttpClient.client().get_json(url, params=params, timeout=timeout)
+
+    @staticmethod
+    def metrics():
+        return HttpClient.client().metrics()
@@ -0,0 +1,71 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import current_app
+
+
+class BoundedIOPool:
+    """Shared worker threads for blocking upstream calls, with a cap on queued work."""
+
+    def __init__(self, max_workers, max_pending):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="uzg-io")
+        self._slots = threading.BoundedSemaphore(max_pending)
+
+    def submit(self, fn, *args, **kwargs):
+        """Future for fn(*args, **kwargs), or None when the backlog is full."""
+        if not self._slots.acquire(blocking=False):
+            return None
+        try:
+            future = self._executor.submit(fn, *args, **kwargs)
+        except RuntimeError:
+            self._slots.release()
+            return None
+        future.add_done_callback(lambda _future: self._slots.release())
+        return future
+
+
+class IOPool:
+    @staticmethod
+    def pool():
+        pool = current_app.extensions.get("io_pool")
+        if pool is None:
+            pool = current_app.extensions.setdefault(
+                "io_pool",
+                BoundedIOPool(
+                    max_workers=current_app.config.get("IO_POOL_WORKERS", 8),
+                    max_pending=current_app.config.get("IO_POOL_MAX_PENDING", 64),
+                ),
+            )
+        return pool
+
+    @staticmethod
+    def submit(fn, *args, **kwargs):
+        """Run fn inside this app's context on the shared pool; None when saturated."""
+        app = current_app._get_current_object()
+
+        def run():
+            with app.app_context():
+                return fn(*args, **kwargs)
+
+        return IOPool.pool().submit(run)
+
+    @staticmethod
+    def deadline(seconds):
+        return time.monotonic() + seconds
+
+    @staticmethod
+    def remaining(deadline, cap=None):
+        left = max(0.0, deadline - time.monotonic())
+        return min(left, cap) if cap is not None else left
+
+    @staticmethod
+    def result(future, deadline, default=None):
+        """future's result if it finishes before the deadline, otherwise default."""
+        if future is None:
+            return default
+        try:
+            return future.result(timeout=IOPool.remaining(deadline))
+        except Exception:
+            # Timed out or failed upstream: degrade to the default rather than failing the request.
+            return default
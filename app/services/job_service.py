@@ -0,0 +1,167 @@
+import json
+import os
+import random
+import signal
+import socket
+import time
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app
+from sqlalchemy import and_, or_, update
+
+from app.counters import insert_unless_exists
+from app.extensions import db
+from app.models import Job
+
+JOB_HANDLERS = {}
+
+
+class JobService:
+    """
+    Durable queue for side effects that must not slow down or fail the request.
+    Jobs are inserted in the caller's transaction, so they exist only if that work commits.
+    """
+
+    @staticmethod
+    def handler(name):
+        def decorator(func):
+            JOB_HANDLERS[name] = func
+            return func
+
+        return decorator
+
+    @staticmethod
+    def enqueue(name, payload=None, idempotency_key=None, delay_seconds=0, max_attempts=None):
+        payload = payload or {}
+        if current_app.config.get("JOBS_EAGER"):
+            # Development/testing without a worker: run in the caller's transaction.
+            JOB_HANDLERS[name](**payload)
+            return None
+        if idempotency_key:
+            existing = Job.query.filter_by(idempotency_key=idempotency_key).first()
+            if existing is not None:
+                return existing
+        job = Job(
+            name=name,
+            payload=json.dumps(payload, default=str),
+            idempotency_key=idempotency_key,
+            run_at=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds),
+            max_attempts=max_attempts or current_app.config.get("JOB_MAX_ATTEMPTS", 5),
+        )
+        if not insert_unless_exists(job):
+            # Same idempotency key enqueued concurrently; keep the first one.
+            return Job.query.filter_by(idempotency_key=idempotency_key).first()
+        return job
+
+    @staticmethod
+    def _runnable(now):
+        stale = now - timedelta(seconds=current_app.config.get("JOB_LOCK_TIMEOUT_SECONDS", 300))
+        return or_(
+            and_(Job.status == "pending", Job.run_at <= now),
+            # A worker that died mid-job leaves it "running"; take it over once the lock is stale.
+            and_(Job.status == "running", Job.locked_at < stale),
+        )
+
+    @staticmethod
+    def claim(worker_id, limit=10):
+        """Lock up to `limit` due jobs for this worker and return their ids."""
+        now = datetime.now(timezone.utc)
+        runnable = JobService._runnable(now)
+        query = db.session.query(Job.id).filter(runnable).order_by(Job.run_at, Job.id).limit(limit)
+        if db.engine.url.get_backend_name() == "postgresql":
+            query = query.with_for_update(skip_locked=True)
+        claimed = []
+        for (job_id,) in query.all():
+            # The guarded update makes the claim safe even where SKIP LOCKED is unavailable.
+            result = db.session.execute(
+                update(Job)
+                .where(Job.id == job_id, runnable)
+                .values(status="running", locked_at=now, locked_by=worker_id, attempts=Job.attempts + 1)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount:
+                claimed.append(job_id)
+        db.session.commit()
+        return claimed
+
+    @staticmethod
+    def _retry_delay(attempts):
+        base = current_app.config.get("JOB_RETRY_BASE_SECONDS", 10)
+        return min(base * (2 ** max(attempts - 1, 0)), 3600) * random.uniform(0.5, 1.5)
+
+    @staticmethod
+    def run(job_id):
+        """Run one claimed job; its effects and its completion commit together."""
+        job = db.session.get(Job, job_id)
+        if job is None or job.status != "running":
+            return False
+        try:
+            handler = JOB_HANDLERS.get(job.name)
+            if handler is None:
+                raise LookupError(f"No handler registered for job {job.name!r}.")
+            handler(**json.loads(job.payload or "{}"))
+            job.status = "done"
+            job.locked_at = None
+            job.last_error = None
+            db.session.commit()
+            return True
+        except Exception as exc:
+            db.session.rollback()
+            job = db.session.get(Job, job_id)
+            job.last_error = f"{exc.__class__.__name__}: {exc}"[:2000]
+            job.locked_at = None
+            job.locked_by = None
+            if job.attempts >= job.max_attempts:
+                job.status = "failed"
+                current_app.logger.error("Job %s (%s) failed permanently: %s", job.id, job.name, job.last_error)
+            else:
+                job.status = "pending"
+                job.run_at = datetime.now(timezone.utc) + timedelta(seconds=JobService._retry_delay(job.attempts))
+            db.session.commit()
+            return False
+
+    @staticmethod
+    def run_pending(worker_id=None, limit=10):
+        """Claim and run one batch; returns the number of jobs attempted."""
+        worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        job_ids = JobService.claim(worker_id, limit=limit)
+        for job_id in job_ids:
+            JobService.run(job_id)
+        return len(job_ids)
+
+    @staticmethod
+    def purge_finished(older_than_days):
+        cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+        deleted = Job.query.filter(Job.status == "done", Job.updated_at < cutoff).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+    @staticmethod
+    def run_worker():
+        """Poll for due jobs until SIGTERM/SIGINT; the current batch finishes before exiting."""
+        config = current_app.config
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        stopping = []
+
+        def request_stop(_signum, _frame):
+            stopping.append(True)
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+        current_app.logger.info("Job worker %s started.", worker_id)
+        next_purge = 0.0
+        while not stopping:
+            try:
+                ran = JobService.run_pending(worker_id, limit=config.get("JOB_BATCH_SIZE", 10))
+                if time.monotonic() >= next_purge:
+                    JobService.purge_finished(config.get("JOB_RETENTION_DAYS", 7))
+                    next_purge = time.monotonic() + 3600
+            except Exception:
+                db.session.rollback()
+                current_app.logger.exception("Job worker loop error.")
+                ran = 0
+            finally:
+                db.session.remove()
+            if not ran:
+                time.sleep(config.get("JOB_POLL_SECONDS", 2.0))
+        current_app.logger.info("Job worker %s stopped.", worker_id)
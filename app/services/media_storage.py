@@ -0,0 +1,237 @@
+import hashlib
+import os
+import shutil
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+from flask import current_app, url_for
+
+from app.counters import insert_unless_exists
+from app.extensions import db
+from app.models import MediaObject, Tractor
+
+# Stored values with this prefix are media keys; anything else is a legacy path under static/.
+MEDIA_KEY_PREFIX = "media/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+TRACTOR_MEDIA_COLUMNS = ("image_path", "image_card_path", "image_thumb_path")
+# Every column that can hold a media key; rebuild_refs counts references from these.
+# Add-on equipment listings are Tractor rows (equipment_type != "Tractor"); the legacy
+# Equipment model is not mapped into the schema, so it has no table to count.
+MEDIA_REFERENCE_COLUMNS = ((Tractor, TRACTOR_MEDIA_COLUMNS),)
+
+
+class LocalMediaBackend:
+    """Files under UPLOAD_DIR, served by the /media route."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def _path(self, key):
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key):
+        return os.path.isfile(self._path(key))
+
+    def put(self, key, source_path, content_type):
+        _ = content_type
+        target = self._path(key)
+        if os.path.exists(target):
+            os.remove(source_path)
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(source_path, target)
+
+    def fetch(self, key, target_path):
+        shutil.copyfile(self._path(key), target_path)
+
+    def delete(self, key):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def list_keys(self):
+        """(key, modified epoch seconds) for every stored object."""
+        base = os.path.join(self.root, MEDIA_KEY_PREFIX.rstrip("/"))
+        for dirpath, _dirnames, filenames in os.walk(base):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                key = os.path.relpath(path, self.root).replace(os.sep, "/")
+                yield key, os.path.getmtime(path)
+
+    def url(self, key):
+        return url_for("web_media.media_file", name=key[len(MEDIA_KEY_PREFIX) :])
+
+
+class S3MediaBackend:
+    """S3 or any S3-compatible store (set S3_ENDPOINT_URL for MinIO and similar)."""
+
+    def __init__(self, bucket, region=None, endpoint_url=None, public_base_url=None):
+        try:
+            import boto3
+        except ImportError as exc:
+            raise RuntimeError("MEDIA_BACKEND=s3 requires the boto3 package.") from exc
+        self.bucket = bucket
+        self.client = boto3.client("s3", region_name=region or None, endpoint_url=endpoint_url or None)
+        if public_base_url:
+            self.base_url = public_base_url.rstrip("/")
+        elif endpoint_url:
+            self.base_url = f"{endpoint_url.rstrip('/')}/{bucket}"
+        else:
+            self.base_url = f"https://{bucket}.s3.{region or 'us-east-1'}.amazonaws.com"
+
+    def exists(self, key):
+        from botocore.exceptions import ClientError
+
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=key)
+            return True
+        except ClientError:
+            return False
+
+    def put(self, key, source_path, content_type):
+        try:
+            self.client.upload_file(
+                source_path,
+                self.bucket,
+                key,
+                ExtraArgs={"ContentType": content_type, "CacheControl": IMMUTABLE_CACHE_CONTROL},
+            )
+        finally:
+            os.remove(source_path)
+
+    def fetch(self, key, target_path):
+        self.client.download_file(self.bucket, key, target_path)
+
+    def delete(self, key):
+        self.client.delete_object(Bucket=self.bucket, Key=key)
+
+    def list_keys(self):
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=MEDIA_KEY_PREFIX):
+            for item in page.get("Contents", ()):
+                yield item["Key"], item["LastModified"].timestamp()
+
+    def url(self, key):
+        return f"{self.base_url}/{key}"
+
+
+class MediaStorage:
+    @staticmethod
+    def backend():
+        backend = current_app.extensions.get("media_backend")
+        if backend is None:
+            config = current_app.config
+            if config.get("MEDIA_BACKEND") == "s3" and config.get("S3_BUCKET"):
+                backend = S3MediaBackend(
+                    config["S3_BUCKET"],
+                    region=config.get("S3_REGION"),
+                    endpoint_url=config.get("S3_ENDPOINT_URL"),
+                    public_base_url=config.get("MEDIA_URL_BASE"),
+                )
+            else:
+                backend = LocalMediaBackend(config["UPLOAD_DIR"])
+            backend = current_app.extensions.setdefault("media_backend", backend)
+        return backend
+
+    @staticmethod
+    def is_key(value):
+        return bool(value) and value.startswith(MEDIA_KEY_PREFIX)
+
+    @staticmethod
+    def content_hash(source):
+        """SHA-256 of a path or seekable file object (which is rewound afterwards)."""
+        digest = hashlib.sha256()
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as handle:
+                for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                    digest.update(chunk)
+        else:
+            source.seek(0)
+            for chunk in iter(lambda: source.read(1024 * 1024), b""):
+                digest.update(chunk)
+            source.seek(0)
+        return digest.hexdigest()
+
+    @staticmethod
+    def key_for(digest, suffix):
+        return f"{MEDIA_KEY_PREFIX}{digest[:2]}/{digest}{suffix}"
+
+    @staticmethod
+    def exists(key):
+        return MediaStorage.backend().exists(key)
+
+    @staticmethod
+    def put(key, source_path, content_type):
+        """Move source_path into storage under key and record the object (with no references yet)."""
+        size_bytes = os.path.getsize(source_path)
+        MediaStorage.backend().put(key, source_path, content_type)
+        media = db.session.get(MediaObject, key)
+        if media is not None:
+            # Re-uploaded content: restart its grace period so a concurrent gc-media keeps it.
+            media.updated_at = datetime.now(timezone.utc)
+            return
+        # Losing a race with a concurrent upload of the same content is fine: the rows are equivalent.
+        insert_unless_exists(MediaObject(key=key, content_type=content_type, size_bytes=size_bytes))
+
+    @staticmethod
+    def fetch(key, target_path):
+        """Copy the stored object to a local file (for jobs that re-process media)."""
+        MediaStorage.backend().fetch(key, target_path)
+
+    @staticmethod
+    def url(value):
+        if not value:
+            return None
+        if MediaStorage.is_key(value):
+            return MediaStorage.backend().url(value)
+        return url_for("static", filename=value)
+
+    @staticmethod
+    def rebuild_refs():
+        """
+        Recount references from every media column; returns {key: count}. ref_count is
+        only maintained here, so write paths never have to keep it in step.
+        """
+        counts = Counter()
+        for model, columns in MEDIA_REFERENCE_COLUMNS:
+            for row in db.session.query(*(getattr(model, column) for column in columns)).all():
+                counts.update(value for value in row if MediaStorage.is_key(value))
+        for media in MediaObject.query.all():
+            media.ref_count = counts.get(media.key, 0)
+        db.session.commit()
+        return counts
+
+    @staticmethod
+    def collect_garbage(grace_seconds, dry_run=False):
+        """
+        Delete stored objects nothing references, skipping anything newer than grace_seconds
+        (an upload may not be attached to its listing yet). Returns the deleted keys.
+        """
+        counts = MediaStorage.rebuild_refs()
+        backend = MediaStorage.backend()
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=grace_seconds)
+        removed = []
+        for media in MediaObject.query.filter(MediaObject.ref_count <= 0).all():
+            updated_at = media.updated_at
+            if updated_at is not None and updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            if updated_at is not None and updated_at > cutoff:
+                continue
+            removed.append(media.key)
+            if not dry_run:
+                backend.delete(media.key)
+                db.session.delete(media)
+        # Files with no row at all, e.g. from a request that failed after storing them.
+        known = {key for (key,) in db.session.query(MediaObject.key).all()}
+        oldest_allowed = time.time() - grace_seconds
+        for key, modified in list(backend.list_keys()):
+            if key in known or key in counts or modified > oldest_allowed or key in removed:
+                continue
+            removed.append(key)
+            if not dry_run:
+                backend.delete(key)
+        if not dry_run:
+            db.session.commit()
+        return removed
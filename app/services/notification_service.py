@@ -1,5 +1,14 @@
-from app.extensions import db
+from sqlalchemy import event, func
+
+from app.extensions import cache, db
 from app.models import Notification
+from app.services.event_service import EventService
+
+NAVBAR_LIMIT = 8
+
+
+def _summary_cache_key(user_id):
+    return f"notifications:summary:{user_id}"
 
 
 class NotificationService:
@@ -8,8 +17,21 @@ class NotificationService:
         notification = Notification(user_id=user_id, title=title, message=message)
         db.session.add(notification)
         db.session.flush()
+        # Cached summaries are dropped and stream events sent once the surrounding transaction commits.
+        db.session.info.setdefault("pushed_notifications", []).append(NotificationService.serialize(notification))
         return notification
 
+    @staticmethod
+    def serialize(notification):
+        return {
+            "id": notification.id,
+            "user_id": notification.user_id,
+            "title": notification.title,
+            "message": notification.message,
+            "is_read": bool(notification.is_read),
+            "created_at": notification.created_at.isoformat() if notification.created_at else None,
+        }
+
     @staticmethod
     def unread_count(user_id):
         return Notification.query.filter_by(user_id=user_id, is_read=False).count()
@@ -23,7 +45,62 @@ class NotificationService:
             .all()
         )
 
+    @staticmethod
+    def notifications_after(user_id, after_id, limit=50):
+        return (
+            Notification.query.filter(Notification.user_id == user_id, Notification.id > after_id)
+            .order_by(Notification.id.asc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def latest_id_for_user(user_id):
+        return db.session.query(func.max(Notification.id)).filter(Notification.user_id == user_id).scalar() or 0
+
+    @staticmethod
+    def navbar_summary(user_id):
+        """Unread count and latest unread items for the navbar, served from the shared cache."""
+        key = _summary_cache_key(user_id)
+        summary = cache.get(key)
+        if summary is None:
+            summary = {
+                "unread_count": NotificationService.unread_count(user_id),
+                "notifications": [
+                    {
+                        "id": n.id,
+                        "title": n.title,
+                        "message": n.message,
+                        "is_read": n.is_read,
+                        "created_at": n.created_at,
+                    }
+                    for n in NotificationService.latest_for_user(user_id, limit=NAVBAR_LIMIT)
+                ],
+            }
+            cache.set(key, summary)
+        return summary
+
+    @staticmethod
+    def invalidate_summary(user_id):
+        cache.delete(_summary_cache_key(user_id))
+
     @staticmethod
     def mark_all_read(user_id):
         Notification.query.filter_by(user_id=user_id, is_read=False).update({"is_read": True})
         db.session.commit()
+        NotificationService.invalidate_summary(user_id)
+
+
+@event.listens_for(db.session, "after_commit")
+def _announce_committed_notifications(session):
+    pushed = session.info.pop("pushed_notifications", ())
+    for user_id in {item["user_id"] for item in pushed}:
+        NotificationService.invalidate_summary(user_id)
+    for item in pushed:
+        EventService.publish_to_user(item["user_id"], "notification", item)
+
+
+@event.listens_for(db.session, "after_soft_rollback")
+def _discard_pending_notifications(session, _previous_transaction):
+    if not session.in_transaction():
+        session.info.pop("pushed_notifications", None)
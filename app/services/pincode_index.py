@@ -0,0 +1,193 @@
+import csv
+import math
+import mmap
+import os
+import struct
+from bisect import bisect_left
+from threading import Lock
+
+from flask import current_app
+
+# File layout (little endian):
+#   header  : magic, version, cell size (deg), record count, cell count, district bytes
+#   cells   : (key int32, first record uint32, record count uint32), sorted by key
+#   records : (lat float32, lon float32, pincode uint32, district index uint32), grouped by cell
+#   districts: UTF-8 names joined by "\n"
+MAGIC = b"UZGPIN01"
+HEADER = struct.Struct("<8sIfIII")
+CELL = struct.Struct("<iII")
+RECORD = struct.Struct("<ffII")
+DEFAULT_CELL_DEG = 0.1
+KM_PER_DEG_LAT = 111.32
+
+PINCODE_FIELDS = ("pincode", "postcode", "pin")
+LAT_FIELDS = ("latitude", "lat")
+LON_FIELDS = ("longitude", "lon", "lng")
+DISTRICT_FIELDS = ("district", "districtname", "district_name")
+
+
+def _cell_key(lat_idx, lon_idx):
+    return (lat_idx + 1000) * 4000 + (lon_idx + 2000)
+
+
+def _cell_of(lat, lon, cell_deg):
+    return math.floor(lat / cell_deg), math.floor(lon / cell_deg)
+
+
+def _distance_km(lat1, lon1, lat2, lon2):
+    # Equirectangular approximation; accurate to well under 1% at pincode scale.
+    x = math.radians(lon2 - lon1) * math.cos(math.radians((lat1 + lat2) / 2))
+    y = math.radians(lat2 - lat1)
+    return 6371.0 * math.hypot(x, y)
+
+
+def _pick(row, names):
+    for name in names:
+        value = row.get(name)
+        if value not in (None, ""):
+            return value.strip()
+    return ""
+
+
+class PincodeIndex:
+    """Memory-mapped grid of pincode centroids for offline reverse geocoding."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = Lock()
+        with open(path, "rb") as handle:
+            self._buf = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _version, self.cell_deg, self.record_count, self.cell_count, district_bytes = HEADER.unpack_from(
+            self._buf, 0
+        )
+        if magic != MAGIC:
+            self._buf.close()
+            raise ValueError(f"{path} is not a pincode index file.")
+        self._cells_offset = HEADER.size
+        self._records_offset = self._cells_offset + self.cell_count * CELL.size
+        districts_offset = self._records_offset + self.record_count * RECORD.size
+        raw = self._buf[districts_offset : districts_offset + district_bytes].decode("utf-8")
+        self._districts = raw.split("\n") if raw else []
+        self._keys = [
+            CELL.unpack_from(self._buf, self._cells_offset + i * CELL.size)[0] for i in range(self.cell_count)
+        ]
+
+    def _cell_records(self, key):
+        pos = bisect_left(self._keys, key)
+        if pos >= self.cell_count or self._keys[pos] != key:
+            return
+        _key, first, count = CELL.unpack_from(self._buf, self._cells_offset + pos * CELL.size)
+        for i in range(first, first + count):
+            yield RECORD.unpack_from(self._buf, self._records_offset + i * RECORD.size)
+
+    def close(self):
+        with self._lock:
+            self._buf.close()
+
+    def _rings(self, lat, max_km):
+        """Cells to search on each side of the centre cell so every point within max_km is covered."""
+        cell_km = self.cell_deg * KM_PER_DEG_LAT
+        lat_rings = math.ceil(max_km / cell_km)
+        # Longitude cells narrow with cos(latitude); size them at the band's edge nearest a pole.
+        edge_lat = min(abs(lat) + (lat_rings + 1) * self.cell_deg, 89.0)
+        lon_rings = math.ceil(max_km / (cell_km * math.cos(math.radians(edge_lat))))
+        return lat_rings, lon_rings
+
+    def lookup(self, lat, lon, max_km=15.0):
+        """Nearest pincode centroid as {"pincode", "district", "distance_km"}, or None beyond max_km."""
+        lat_idx, lon_idx = _cell_of(lat, lon, self.cell_deg)
+        lat_rings, lon_rings = self._rings(lat, max_km)
+        best = None
+        with self._lock:
+            if self._buf.closed:
+                # Replaced by a rebuilt index mid-request; the caller falls back as if none existed.
+                return None
+            for d_lat in range(-lat_rings, lat_rings + 1):
+                for d_lon in range(-lon_rings, lon_rings + 1):
+                    for r_lat, r_lon, pincode, district_idx in self._cell_records(
+                        _cell_key(lat_idx + d_lat, lon_idx + d_lon)
+                    ):
+                        distance = _distance_km(lat, lon, r_lat, r_lon)
+                        if best is None or distance < best[0]:
+                            best = (distance, pincode, district_idx)
+        if best is None or best[0] > max_km:
+            return None
+        distance, pincode, district_idx = best
+        district = self._districts[district_idx] if district_idx < len(self._districts) else ""
+        return {"pincode": f"{pincode:06d}", "district": district or None, "distance_km": round(distance, 2)}
+
+    @staticmethod
+    def build(source_csv, output_path, cell_deg=DEFAULT_CELL_DEG):
+        """
+        Build the binary index from a CSV with pincode, latitude, longitude and
+        (optionally) district columns. Rows sharing a pincode are averaged into one centroid.
+        Returns the number of pincodes written.
+        """
+        sums = {}
+        with open(source_csv, newline="", encoding="utf-8-sig") as handle:
+            for row in csv.DictReader(handle):
+                row = {(k or "").strip().lower(): v for k, v in row.items()}
+                digits = "".join(ch for ch in _pick(row, PINCODE_FIELDS) if ch.isdigit())
+                try:
+                    lat = float(_pick(row, LAT_FIELDS))
+                    lon = float(_pick(row, LON_FIELDS))
+                except ValueError:
+                    continue
+                if len(digits) != 6 or not (-90 <= lat <= 90 and -180 <= lon <= 180):
+                    continue
+                entry = sums.setdefault(int(digits), [0.0, 0.0, 0, _pick(row, DISTRICT_FIELDS).title()])
+                entry[0] += lat
+                entry[1] += lon
+                entry[2] += 1
+
+        districts = []
+        district_ids = {}
+        by_cell = {}
+        for pincode, (lat_sum, lon_sum, count, district) in sums.items():
+            lat, lon = lat_sum / count, lon_sum / count
+            if district not in district_ids:
+                district_ids[district] = len(districts)
+                districts.append(district)
+            key = _cell_key(*_cell_of(lat, lon, cell_deg))
+            by_cell.setdefault(key, []).append((lat, lon, pincode, district_ids[district]))
+
+        district_blob = "\n".join(districts).encode("utf-8")
+        cells = []
+        records = []
+        for key in sorted(by_cell):
+            cells.append((key, len(records), len(by_cell[key])))
+            records.extend(by_cell[key])
+
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        tmp_path = f"{output_path}.tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(HEADER.pack(MAGIC, 1, cell_deg, len(records), len(cells), len(district_blob)))
+            for cell in cells:
+                out.write(CELL.pack(*cell))
+            for record in records:
+                out.write(RECORD.pack(*record))
+            out.write(district_blob)
+        # Atomic swap so running workers never map a half-written file.
+        os.replace(tmp_path, output_path)
+        return len(records)
+
+    @staticmethod
+    def for_app():
+        """Per-worker index, opened lazily; None when no index file has been built."""
+        path = current_app.config.get("PINCODE_INDEX_PATH")
+        if not path or not os.path.exists(path):
+            return None
+        mtime = os.path.getmtime(path)
+        cached = current_app.extensions.get("pincode_index")
+        if cached is None or cached[0] != mtime:
+            previous = cached
+            try:
+                cached = (mtime, PincodeIndex(path))
+            except (OSError, ValueError) as exc:
+                current_app.logger.warning("Pincode index unavailable: %s", exc)
+                return None
+            current_app.extensions["pincode_index"] = cached
+            if previous is not None:
+                # Unmap the replaced file now rather than whenever the old object is collected.
+                previous[1].close()
+        return cached[1]
@@ -1,16 +1,74 @@
+import time
 from decimal import Decimal
+from threading import Lock
+from uuid import uuid4
+
+from flask import current_app, g
 
 from app.extensions import db
 from app.models import PlatformSetting
 
+# Bumped on every admin write; workers compare it to decide whether to reload.
+SETTINGS_VERSION_KEY = "settings_version"
+
+_snapshot_lock = Lock()
+
 
 class PlatformService:
+    @staticmethod
+    def _state():
+        return current_app.extensions.setdefault(
+            "platform_settings",
+            {"values": None, "version": None, "checked_at": 0.0},
+        )
+
+    @staticmethod
+    def _load_snapshot(state, now):
+        values = {row.key: row.value for row in PlatformSetting.query.all()}
+        state["values"] = values
+        state["version"] = values.get(SETTINGS_VERSION_KEY)
+        state["checked_at"] = now
+
+    @staticmethod
+    def _snapshot():
+        """
+        All settings as one in-process dict.
+        Memoized per request on `g`; across requests the worker re-checks the
+        version row at most once per PLATFORM_SETTINGS_TTL seconds.
+        """
+        cached = g.get("platform_settings")
+        if cached is not None:
+            return cached
+
+        state = PlatformService._state()
+        ttl = float(current_app.config.get("PLATFORM_SETTINGS_TTL", 30))
+        with _snapshot_lock:
+            now = time.monotonic()
+            if state["values"] is None:
+                PlatformService._load_snapshot(state, now)
+            elif now - state["checked_at"] >= ttl:
+                version_row = db.session.get(PlatformSetting, SETTINGS_VERSION_KEY)
+                version = version_row.value if version_row else None
+                if version != state["version"]:
+                    PlatformService._load_snapshot(state, now)
+                else:
+                    state["checked_at"] = now
+            values = state["values"]
+
+        g.platform_settings = values
+        return values
+
+    @staticmethod
+    def invalidate():
+        with _snapshot_lock:
+            state = PlatformService._state()
+            state["values"] = None
+            state["version"] = None
+        g.pop("platform_settings", None)
+
     @staticmethod
     def get_setting(key, default=None):
-        setting = PlatformSetting.query.filter_by(key=key).first()
-        if not setting:
-            return default
-        return setting.value
+        return PlatformService._snapshot().get(key, default)
 
     @staticmethod
     def get_decimal(key, default):
@@ -21,13 +79,20 @@ class PlatformService:
             return Decimal(str(default))
 
     @staticmethod
-    def set_setting(key, value):
-        setting = PlatformSetting.query.filter_by(key=key).first()
-        if setting:
-            setting.value = str(value)
-        else:
-            setting = PlatformSetting(key=key, value=str(value))
-            db.session.add(setting)
+    def set_settings(values):
+        rows = {}
+        for key, value in {**values, SETTINGS_VERSION_KEY: uuid4().hex}.items():
+            setting = db.session.get(PlatformSetting, key)
+            if setting:
+                setting.value = str(value)
+            else:
+                setting = PlatformSetting(key=key, value=str(value))
+                db.session.add(setting)
+            rows[key] = setting
         db.session.commit()
-        return setting
+        PlatformService.invalidate()
+        return rows
 
+    @staticmethod
+    def set_setting(key, value):
+        return PlatformService.set_settings({key: value})[key]
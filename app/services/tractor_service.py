@@ -1,11 +1,21 @@
 from decimal import Decimal
+import math
+import os
 import re
+import tempfile
+from pathlib import Path
 
+from flask import current_app
+from sqlalchemy import update
 from sqlalchemy.orm import joinedload
 
 from app.errors import AppError
 from app.extensions import db
 from app.models import Tractor
+from app.services.file_service import FileService
+from app.services.geo_service import GeoService
+from app.services.job_service import JobService
+from app.services.media_storage import MediaStorage
 
 
 class TractorService:
@@ -57,9 +67,12 @@ class TractorService:
             description=(payload.get("description") or "").strip() or None,
             price_per_hour=price_per_hour,
             image_path=payload.get("image_path"),
+            image_card_path=payload.get("image_card_path"),
+            image_thumb_path=payload.get("image_thumb_path"),
             latitude=latitude,
             longitude=longitude,
             location_label=(payload.get("location_label") or "").strip() or None,
+            geo_cell=GeoService.cell_for(latitude, longitude),
             pincode=pincode,
             village=village,
             district=district,
@@ -68,6 +81,13 @@ class TractorService:
             is_available=(availability_status != "offline"),
         )
         db.session.add(tractor)
+        db.session.flush()
+        if MediaStorage.is_key(tractor.image_path) and not tractor.image_card_path:
+            JobService.enqueue(
+                "media.image_variants",
+                {"tractor_id": tractor.id},
+                idempotency_key=f"tractor:{tractor.id}:image_variants",
+            )
         db.session.commit()
         return tractor
 
@@ -78,6 +98,82 @@ class TractorService:
             query = query.filter_by(is_available=True)
         return query.paginate(page=page, per_page=per_page, error_out=False)
 
+    @staticmethod
+    def nearby(lat, lon, radius_km=25.0, limit=50, equipment_type=None, addon_only=False):
+        """
+        Non-offline listings within radius_km of (lat, lon), nearest first, as (tractor, distance_km) pairs.
+        Only the grid cells covering the radius are scanned and at most `limit` rows are loaded.
+        """
+        lat, lon = float(lat), float(lon)
+        lon_scale = math.cos(math.radians(lat))
+        approx_distance = (Tractor.latitude - lat) * (Tractor.latitude - lat) + (
+            (Tractor.longitude - lon) * lon_scale
+        ) * ((Tractor.longitude - lon) * lon_scale)
+        query = Tractor.query.filter(
+            Tractor.geo_cell.in_(GeoService.cells_within(lat, lon, radius_km)),
+            Tractor.availability_status != "offline",
+        )
+        if equipment_type:
+            query = query.filter(Tractor.equipment_type == equipment_type)
+        if addon_only:
+            query = query.filter(Tractor.equipment_type != "Tractor")
+        tractors = query.order_by(approx_distance, Tractor.id).limit(limit).all()
+        distances = GeoService.distances_km(lat, lon, [(t.latitude, t.longitude) for t in tractors])
+        return [(t, d) for t, d in zip(tractors, distances) if d <= radius_km]
+
+    @staticmethod
+    def rebuild_geo_cells():
+        """Recompute geo_cell for every listing; returns the number of rows changed."""
+        rows = db.session.query(Tractor.id, Tractor.latitude, Tractor.longitude, Tractor.geo_cell).all()
+        changes = [
+            {"id": tractor_id, "geo_cell": cell}
+            for tractor_id, lat, lon, current in rows
+            if (cell := GeoService.cell_for(lat, lon)) != current
+        ]
+        if changes:
+            db.session.execute(update(Tractor), changes)
+        db.session.commit()
+        return len(changes)
+
+    @staticmethod
+    def rebuild_image_variants(upload_root):
+        """Generate card/thumbnail renditions for listings that only have an original image."""
+        static_root = Path(upload_root).parent
+        built = 0
+        for tractor in Tractor.query.filter(Tractor.image_path.isnot(None), Tractor.image_card_path.is_(None)).all():
+            source = static_root / tractor.image_path
+            if not source.is_file():
+                continue
+            try:
+                paths = FileService.write_variants(source, upload_root)
+            except AppError:
+                continue
+            tractor.image_path = paths["image_path"]
+            tractor.image_card_path = paths["image_card_path"]
+            tractor.image_thumb_path = paths["image_thumb_path"]
+            built += 1
+        db.session.commit()
+        return built
+
+    @staticmethod
+    @JobService.handler("media.image_variants")
+    def build_image_variants(tractor_id):
+        """Card and thumbnail renditions for a new listing, made from its stored detail image."""
+        tractor = db.session.get(Tractor, tractor_id)
+        if tractor is None or tractor.image_card_path or not MediaStorage.is_key(tractor.image_path):
+            return
+        upload_root = current_app.config["UPLOAD_DIR"]
+        Path(upload_root).mkdir(parents=True, exist_ok=True)
+        fd, source = tempfile.mkstemp(dir=upload_root, suffix=".part")
+        os.close(fd)
+        try:
+            MediaStorage.fetch(tractor.image_path, source)
+            paths = FileService.write_variants(source, upload_root, fields=("image_card_path", "image_thumb_path"))
+        finally:
+            os.remove(source)
+        tractor.image_card_path = paths["image_card_path"]
+        tractor.image_thumb_path = paths["image_thumb_path"]
+
     @staticmethod
     def toggle_availability(tractor_id, owner_id, is_available):
         tractor = Tractor.query.filter_by(id=tractor_id, owner_id=owner_id).first()
@@ -0,0 +1,147 @@
+import threading
+import time
+
+from flask import current_app
+
+from app.services.http_client import HttpClient
+from app.services.io_pool import IOPool
+
+OPEN_METEO_URL = "https://api.open-meteo.com/v1/forecast"
+RAIN_DEMAND_THRESHOLD = 60
+
+
+class SingleFlightCache:
+    """
+    Per-process TTL cache. Concurrent misses for one key share a single loader call,
+    and entries past their TTL are served stale while one background refresh runs on
+    `refresh_pool` (a BoundedIOPool; when it is saturated a later caller retries).
+    """
+
+    def __init__(self, ttl, stale_ttl, refresh_pool, max_entries=4096):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.refresh_pool = refresh_pool
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._inflight = {}
+
+    def get(self, key, loader):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, fetched_at = entry
+                age = now - fetched_at
+                if age < self.ttl:
+                    return value
+                if age < self.stale_ttl:
+                    if key not in self._inflight:
+                        self._inflight[key] = threading.Event()
+                        self._refresh(key, loader)
+                    return value
+            waiter = self._inflight.get(key)
+            if waiter is None:
+                self._inflight[key] = threading.Event()
+        if waiter is not None:
+            waiter.wait()
+            with self._lock:
+                entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+        return self._load(key, loader)
+
+    def _refresh(self, key, loader):
+        # Called with the lock held; the pool only queues the load, it never runs it inline.
+        if self.refresh_pool.submit(self._load, key, loader) is None:
+            self._inflight.pop(key).set()
+
+    def _load(self, key, loader):
+        value = None
+        try:
+            value = loader()
+        except Exception:
+            # Keep any stale entry; the next caller past the TTL retries.
+            with self._lock:
+                entry = self._entries.get(key)
+            return entry[0] if entry is not None else None
+        else:
+            with self._lock:
+                if len(self._entries) >= self.max_entries and key not in self._entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = (value, time.monotonic())
+            return value
+        finally:
+            with self._lock:
+                waiter = self._inflight.pop(key, None)
+            if waiter is not None:
+                waiter.set()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class WeatherService:
+    @staticmethod
+    def _cache():
+        forecast_cache = current_app.extensions.get("weather_cache")
+        if forecast_cache is None:
+            ttl = current_app.config.get("WEATHER_CACHE_TTL", 1800)
+            stale_ttl = ttl + current_app.config.get("WEATHER_CACHE_STALE_SECONDS", 3600)
+            forecast_cache = current_app.extensions.setdefault(
+                "weather_cache", SingleFlightCache(ttl, stale_ttl, IOPool.pool())
+            )
+        return forecast_cache
+
+    @staticmethod
+    def cache_key(lat, lon):
+        precision = current_app.config.get("WEATHER_COORD_PRECISION", 2)
+        return round(float(lat), precision), round(float(lon), precision)
+
+    @staticmethod
+    def fetch_rain_probability(client, lat, lon, base_url=OPEN_METEO_URL, timeout=8):
+        """Tomorrow's maximum precipitation probability (percent) from open-meteo."""
+        data = client.get_json(
+            base_url,
+            params={
+                "latitude": lat,
+                "longitude": lon,
+                "daily": "precipitation_probability_max",
+                "timezone": "auto",
+                "forecast_days": 2,
+            },
+            timeout=timeout,
+        )
+        probs = (data.get("daily") or {}).get("precipitation_probability_max") or []
+        tomorrow_prob = probs[1] if len(probs) > 1 else (probs[0] if probs else 0)
+        return int(tomorrow_prob or 0)
+
+    @staticmethod
+    def rain_probability(lat, lon):
+        """Cached by rounded coordinates; None when the forecast could not be fetched."""
+        key = WeatherService.cache_key(lat, lon)
+        base_url = current_app.config.get("WEATHER_API_URL", OPEN_METEO_URL)
+        timeout = current_app.config.get("WEATHER_TIMEOUT_SECONDS", 3)
+        # Resolved here because background refreshes run outside the app context.
+        client = HttpClient.client()
+        return WeatherService._cache().get(
+            key,
+            lambda: WeatherService.fetch_rain_probability(client, key[0], key[1], base_url=base_url, timeout=timeout),
+        )
+
+    @staticmethod
+    def rain_probability_async(lat, lon):
+        """Start the (cached) lookup on the shared IO pool; None when the pool is saturated."""
+        return IOPool.submit(WeatherService.rain_probability, lat, lon)
+
+    @staticmethod
+    def hint_for(probability, district):
+        if district and probability is not None and probability >= RAIN_DEMAND_THRESHOLD:
+            return f"High demand expected tomorrow due to rain forecast in {district}."
+        return None
+
+    @staticmethod
+    def demand_hint(lat, lon, district):
+        if not district:
+            return None
+        return WeatherService.hint_for(WeatherService.rain_probability(lat, lon), district)
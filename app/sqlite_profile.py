@@ -0,0 +1,51 @@
+from sqlalchemy import event
+
+from app.extensions import db
+
+JOURNAL_MODES = {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"}
+SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+
+
+def sqlite_pragmas(config):
+    """Ordered (pragma, value) pairs for every new SQLite connection."""
+    journal_mode = str(config.get("SQLITE_JOURNAL_MODE", "WAL")).upper()
+    synchronous = str(config.get("SQLITE_SYNCHRONOUS", "NORMAL")).upper()
+    if journal_mode not in JOURNAL_MODES:
+        raise ValueError(f"Unsupported SQLITE_JOURNAL_MODE {journal_mode!r}.")
+    if synchronous not in SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported SQLITE_SYNCHRONOUS {synchronous!r}.")
+    return [
+        # busy_timeout first so switching journal mode waits instead of failing on a locked file.
+        ("busy_timeout", int(config.get("SQLITE_BUSY_TIMEOUT_MS", 5000))),
+        ("journal_mode", journal_mode),
+        ("synchronous", synchronous),
+        ("foreign_keys", "ON" if config.get("SQLITE_FOREIGN_KEYS", True) else "OFF"),
+        ("cache_size", -int(config.get("SQLITE_CACHE_SIZE_KB", 20000))),
+        ("mmap_size", int(config.get("SQLITE_MMAP_SIZE", 268435456))),
+    ]
+
+
+def register_sqlite_profile(app):
+    """
+    Apply the SQLite pragmas on connect so every pooled connection in every worker,
+    primary and replica, gets them. WAL lets readers run alongside the single writer;
+    the busy timeout makes competing writers queue instead of raising "database is locked".
+    """
+    for engine in db.engines.values():
+        if engine.url.get_backend_name() == "sqlite":
+            _register(engine, sqlite_pragmas(app.config))
+
+
+def _register(engine, pragmas):
+    if engine.url.database in (None, "", ":memory:"):
+        # WAL and mmap need a database file.
+        pragmas = [(name, value) for name, value in pragmas if name not in ("journal_mode", "mmap_size")]
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name} = {value}")
+        finally:
+            cursor.close()
@@ -0,0 +1,88 @@
+from datetime import date, datetime
+
+from sqlalchemy import Date, DateTime
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+TIME_BUCKET_UNITS = ("day", "week", "month")
+
+# SQLite date() modifiers giving the first day of the bucket (weeks start on Monday,
+# matching PostgreSQL's date_trunc('week', ...)).
+_SQLITE_MODIFIERS = {
+    "day": "",
+    "week": ", 'weekday 0', '-6 days'",
+    "month": ", 'start of month'",
+}
+
+
+class _TimeBucket(FunctionElement):
+    """First day (a DATE) of the day/week/month containing a date or timestamp column."""
+
+    type = Date()
+    inherit_cache = True
+    unit = None
+
+
+class _DayBucket(_TimeBucket):
+    name = "day_bucket"
+    unit = "day"
+    inherit_cache = True
+
+
+class _WeekBucket(_TimeBucket):
+    name = "week_bucket"
+    unit = "week"
+    inherit_cache = True
+
+
+class _MonthBucket(_TimeBucket):
+    name = "month_bucket"
+    unit = "month"
+    inherit_cache = True
+
+
+_BUCKETS = {bucket.unit: bucket for bucket in (_DayBucket, _WeekBucket, _MonthBucket)}
+
+
+@compiles(_TimeBucket)
+def _compile_sqlite(element, compiler, **kw):
+    # SQLite and anything else with SQLite-style date(): deterministic, so usable in indexes.
+    return f"date({compiler.process(element.clauses, **kw)}{_SQLITE_MODIFIERS[element.unit]})"
+
+
+@compiles(_TimeBucket, "postgresql")
+def _compile_postgresql(element, compiler, **kw):
+    column = compiler.process(element.clauses, **kw)
+    (argument,) = element.clauses.clauses
+    if isinstance(argument.type, DateTime) and argument.type.timezone:
+        # Bucket TIMESTAMPTZ values by their UTC date, as SQLite does, whatever the session TimeZone.
+        timestamp = f"{column} AT TIME ZONE 'UTC'"
+    elif element.unit == "day":
+        return f"CAST({column} AS DATE)"
+    else:
+        # date_trunc over TIMESTAMP (not TIMESTAMPTZ) is immutable, so expression indexes can match it.
+        timestamp = f"CAST({column} AS TIMESTAMP)"
+    if element.unit == "day":
+        return f"CAST({timestamp} AS DATE)"
+    return f"CAST(date_trunc('{element.unit}', {timestamp}) AS DATE)"
+
+
+def time_bucket(column, unit):
+    """Dialect-aware GROUP BY key: the start date of the `unit` bucket holding `column`."""
+    try:
+        return _BUCKETS[unit](column)
+    except KeyError:
+        raise ValueError(f"Unsupported time bucket {unit!r}; expected one of {TIME_BUCKET_UNITS}.") from None
+
+
+def bucket_label(start, unit):
+    """Display label for a bucket start date ("2026-10-12", "2026-W41", "2026-10")."""
+    if isinstance(start, datetime):
+        start = start.date()
+    elif not isinstance(start, date):
+        start = date.fromisoformat(str(start)[:10])
+    if unit == "week":
+        return start.strftime("%Y-W%W")
+    if unit == "month":
+        return start.strftime("%Y-%m")
+    return start.isoformat()
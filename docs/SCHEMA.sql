@@ -20,9 +20,12 @@ CREATE TABLE tractors (
     description TEXT,
     price_per_hour NUMERIC(10,2) NOT NULL,
     image_path VARCHAR(500),
+    image_card_path VARCHAR(500),
+    image_thumb_path VARCHAR(500),
     latitude NUMERIC(10,7),
     longitude NUMERIC(10,7),
     location_label VARCHAR(255),
+    geo_cell INTEGER,
     pincode VARCHAR(6) NOT NULL,
     village VARCHAR(120),
     district VARCHAR(120),
@@ -125,13 +128,101 @@ CREATE TABLE notifications (
     updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
 );
 
+CREATE TABLE pincode_demand (
+    pincode VARCHAR(6) PRIMARY KEY,
+    active_bookings INTEGER NOT NULL DEFAULT 0 CHECK (active_bookings >= 0),
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE receipt_sequences (
+    day VARCHAR(8) PRIMARY KEY,
+    last_value INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE owner_earning_summaries (
+    owner_id BIGINT PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    earnings_count INTEGER NOT NULL DEFAULT 0,
+    gross_total NUMERIC(14,2) NOT NULL DEFAULT 0.00,
+    platform_fee_total NUMERIC(14,2) NOT NULL DEFAULT 0.00,
+    net_total NUMERIC(14,2) NOT NULL DEFAULT 0.00,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+CREATE TABLE tractor_reservations (
+    id BIGSERIAL PRIMARY KEY,
+    tractor_id BIGINT NOT NULL REFERENCES tractors(id) ON DELETE CASCADE,
+    booking_id BIGINT NOT NULL UNIQUE REFERENCES bookings(id) ON DELETE CASCADE,
+    start_time TIMESTAMPTZ NOT NULL,
+    end_time TIMESTAMPTZ NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    CONSTRAINT ck_tractor_reservation_range CHECK (end_time > start_time),
+    CONSTRAINT ex_tractor_reservations_overlap
+        EXCLUDE USING gist (tractor_id WITH =, tstzrange(start_time, end_time) WITH &&)
+);
+
+CREATE TABLE media_objects (
+    key VARCHAR(255) PRIMARY KEY,
+    content_type VARCHAR(64) NOT NULL,
+    size_bytes INTEGER NOT NULL DEFAULT 0,
+    ref_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE jobs (
+    id BIGSERIAL PRIMARY KEY,
+    name VARCHAR(64) NOT NULL,
+    payload TEXT NOT NULL DEFAULT '{}',
+    idempotency_key VARCHAR(160) UNIQUE,
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+    run_at TIMESTAMPTZ NOT NULL,
+    locked_at TIMESTAMPTZ,
+    locked_by VARCHAR(64),
+    last_error TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE daily_revenue_rollups (
+    day DATE NOT NULL,
+    owner_id BIGINT NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+    tractor_id BIGINT NOT NULL REFERENCES tractors(id) ON DELETE CASCADE,
+    bookings_count INTEGER NOT NULL DEFAULT 0,
+    paid_count INTEGER NOT NULL DEFAULT 0,
+    revenue NUMERIC(14,2) NOT NULL DEFAULT 0.00,
+    commission NUMERIC(14,2) NOT NULL DEFAULT 0.00,
+    payout NUMERIC(14,2) NOT NULL DEFAULT 0.00,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (day, owner_id, tractor_id)
+);
+
 CREATE INDEX ix_tractors_owner_available ON tractors(owner_id, is_available);
 CREATE INDEX ix_tractors_pincode ON tractors(pincode);
 CREATE INDEX ix_tractors_equipment_type ON tractors(equipment_type);
 CREATE INDEX ix_tractors_availability_status ON tractors(availability_status);
+CREATE INDEX ix_tractors_geo_cell ON tractors(geo_cell);
 CREATE INDEX ix_bookings_farmer_status ON bookings(farmer_id, status);
 CREATE INDEX ix_bookings_tractor_status ON bookings(tractor_id, status);
 CREATE INDEX ix_bookings_owner_status ON bookings(owner_id, status);
+CREATE INDEX ix_bookings_owner_created ON bookings(owner_id, created_at, id);
 CREATE INDEX ix_payments_owner ON payments(owner_id);
 CREATE INDEX ix_notifications_user_unread ON notifications(user_id, is_read);
-CREATE INDEX ix_chat_messages_booking ON chat_messages(booking_id, created_at);
+CREATE INDEX ix_chat_messages_booking_cursor ON chat_messages(booking_id, id);
+CREATE INDEX ix_owner_earnings_owner_created ON owner_earnings(owner_id, created_at);
+CREATE INDEX ix_tractor_reservations_tractor_end ON tractor_reservations(tractor_id, end_time);
+CREATE INDEX ix_media_objects_ref_count ON media_objects(ref_count);
+CREATE INDEX ix_jobs_status_run_at ON jobs(status, run_at);
+CREATE INDEX ix_daily_revenue_rollups_owner_id ON daily_revenue_rollups(owner_id);
+CREATE INDEX ix_daily_revenue_rollups_tractor_id ON daily_revenue_rollups(tractor_id);
+CREATE INDEX ix_daily_revenue_rollups_week ON daily_revenue_rollups((CAST(date_trunc('week', CAST(day AS TIMESTAMP)) AS DATE)));
+CREATE INDEX ix_daily_revenue_rollups_month ON daily_revenue_rollups((CAST(date_trunc('month', CAST(day AS TIMESTAMP)) AS DATE)));
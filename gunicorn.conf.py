@@ -0,0 +1,21 @@
+import os
+
+# /events/stream holds its response open for up to EVENT_STREAM_MAX_SECONDS. With gevent
+# workers each open stream is a greenlet, so dashboards left open in many tabs cannot use up
+# a small pool of OS threads that ordinary requests also need.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+threads = int(os.getenv("GUNICORN_THREADS", "8"))
+
+
+def post_fork(server, worker):
+    if worker_class != "gevent":
+        return
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        server.log.warning("psycogreen is not installed; PostgreSQL queries will block the gevent worker.")
+        return
+    # Let other greenlets run while a PostgreSQL query waits on the network.
+    patch_psycopg()
@@ -0,0 +1,50 @@
+"""owner earning summaries
+
+Revision ID: 1b8f4d2e6a53
+Revises: e7b3f1a6c925
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b8f4d2e6a53'
+down_revision = 'e7b3f1a6c925'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('owner_earning_summaries',
+    sa.Column('owner_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('earnings_count', sa.Integer(), nullable=False),
+    sa.Column('gross_total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('platform_fee_total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('net_total', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+    with op.batch_alter_table('owner_earnings', schema=None) as batch_op:
+        batch_op.create_index('ix_owner_earnings_owner_created', ['owner_id', 'created_at'], unique=False)
+
+    op.execute(
+        """
+        INSERT INTO owner_earning_summaries
+            (owner_id, earnings_count, gross_total, platform_fee_total, net_total, created_at, updated_at)
+        SELECT owner_id, COUNT(id), COALESCE(SUM(gross_amount), 0), COALESCE(SUM(platform_fee), 0),
+               COALESCE(SUM(net_amount), 0), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM owner_earnings
+        GROUP BY owner_id
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('owner_earnings', schema=None) as batch_op:
+        batch_op.drop_index('ix_owner_earnings_owner_created')
+
+    op.drop_table('owner_earning_summaries')
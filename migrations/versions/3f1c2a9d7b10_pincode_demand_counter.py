@@ -0,0 +1,42 @@
+"""pincode demand counter
+
+Revision ID: 3f1c2a9d7b10
+Revises: 825967935374
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a9d7b10'
+down_revision = '825967935374'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('pincode_demand',
+    sa.Column('pincode', sa.String(length=6), nullable=False),
+    sa.Column('active_bookings', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('active_bookings >= 0', name='ck_pincode_demand_non_negative'),
+    sa.PrimaryKeyConstraint('pincode')
+    )
+    # Seed counters from current bookings; `flask rebuild-demand` repairs drift later.
+    op.execute(
+        """
+        INSERT INTO pincode_demand (pincode, active_bookings, created_at, updated_at)
+        SELECT t.pincode, COUNT(b.id), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM bookings b
+        JOIN tractors t ON t.id = b.tractor_id
+        WHERE b.status IN ('pending', 'accepted', 'en_route', 'working')
+        GROUP BY t.pincode
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('pincode_demand')
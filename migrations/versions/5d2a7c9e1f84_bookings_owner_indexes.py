@@ -0,0 +1,26 @@
+"""bookings owner indexes
+
+Revision ID: 5d2a7c9e1f84
+Revises: 1b8f4d2e6a53
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2a7c9e1f84'
+down_revision = '1b8f4d2e6a53'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ix_bookings_owner_status may already exist from scripts/migrate_sqlite_inplace.py.
+    op.execute('CREATE INDEX IF NOT EXISTS ix_bookings_owner_status ON bookings (owner_id, status)')
+    op.execute('CREATE INDEX IF NOT EXISTS ix_bookings_owner_created ON bookings (owner_id, created_at, id)')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_bookings_owner_created')
+    op.execute('DROP INDEX IF EXISTS ix_bookings_owner_status')
@@ -0,0 +1,41 @@
+"""receipt sequences
+
+Revision ID: 8a4e6c0f2d31
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6c0f2d31'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('receipt_sequences',
+    sa.Column('day', sa.String(length=8), nullable=False),
+    sa.Column('last_value', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('day')
+    )
+    # Continue numbering after receipts issued before the counter existed (UZG-YYYYMMDD-NNNN).
+    op.execute(
+        """
+        INSERT INTO receipt_sequences (day, last_value, created_at, updated_at)
+        SELECT substr(receipt_number, 5, 8), MAX(CAST(substr(receipt_number, 14) AS INTEGER)),
+               CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM payments
+        WHERE receipt_number LIKE 'UZG-%'
+        GROUP BY substr(receipt_number, 5, 8)
+        """
+    )
+
+
+def downgrade():
+    op.drop_table('receipt_sequences')
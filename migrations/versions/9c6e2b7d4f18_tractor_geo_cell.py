@@ -0,0 +1,58 @@
+"""tractor geo cell
+
+Revision ID: 9c6e2b7d4f18
+Revises: 5d2a7c9e1f84
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+import math
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c6e2b7d4f18'
+down_revision = '5d2a7c9e1f84'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of the grid in app/services/geo_service.py as of this revision, so the
+# backfill does not change if the app's cell size later does.
+GEO_CELL_DEG = 0.05
+LAT_CELLS = 3600
+LON_CELLS = 7200
+
+
+def cell_for(latitude, longitude):
+    lat_idx = math.floor(float(latitude) / GEO_CELL_DEG)
+    lon_idx = math.floor(float(longitude) / GEO_CELL_DEG)
+    return (lat_idx + LAT_CELLS // 2) * LON_CELLS + (lon_idx + LON_CELLS // 2)
+
+
+def upgrade():
+    bind = op.get_bind()
+    # On SQLite the app's runtime compat guard may have added the column already.
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('tractors')}
+    if 'geo_cell' not in columns:
+        op.add_column('tractors', sa.Column('geo_cell', sa.Integer(), nullable=True))
+    op.execute('CREATE INDEX IF NOT EXISTS ix_tractors_geo_cell ON tractors (geo_cell)')
+
+    tractors = sa.table('tractors', sa.column('id'), sa.column('latitude'), sa.column('longitude'), sa.column('geo_cell'))
+    rows = bind.execute(
+        sa.select(tractors.c.id, tractors.c.latitude, tractors.c.longitude).where(
+            tractors.c.latitude.isnot(None), tractors.c.longitude.isnot(None)
+        )
+    ).fetchall()
+    for tractor_id, latitude, longitude in rows:
+        bind.execute(
+            tractors.update()
+            .where(tractors.c.id == tractor_id)
+            .values(geo_cell=cell_for(latitude, longitude))
+        )
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_tractors_geo_cell')
+    with op.batch_alter_table('tractors') as batch_op:
+        batch_op.drop_column('geo_cell')
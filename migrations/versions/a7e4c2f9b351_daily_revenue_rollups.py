@@ -0,0 +1,74 @@
+"""daily revenue rollups
+
+Revision ID: a7e4c2f9b351
+Revises: f2c6a8d1e397
+Create Date: 2026-10-17 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e4c2f9b351'
+down_revision = 'f2c6a8d1e397'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('daily_revenue_rollups',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('owner_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('tractor_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('bookings_count', sa.Integer(), nullable=False),
+    sa.Column('paid_count', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('commission', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('payout', sa.Numeric(precision=14, scale=2), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tractor_id'], ['tractors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('day', 'owner_id', 'tractor_id')
+    )
+    with op.batch_alter_table('daily_revenue_rollups', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_daily_revenue_rollups_owner_id'), ['owner_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_daily_revenue_rollups_tractor_id'), ['tractor_id'], unique=False)
+
+    if op.get_bind().dialect.name == 'postgresql':
+        # UTC days, as the app's rollup writes and `flask rebuild-analytics` use; DATE() would
+        # follow the session TimeZone. SQLite stores UTC text, so DATE() is already UTC there.
+        booking_day = "(created_at AT TIME ZONE 'UTC')::date"
+        payment_day = "(p.created_at AT TIME ZONE 'UTC')::date"
+    else:
+        booking_day = "DATE(created_at)"
+        payment_day = "DATE(p.created_at)"
+    op.execute(
+        f"""
+        INSERT INTO daily_revenue_rollups
+            (day, owner_id, tractor_id, bookings_count, paid_count, revenue, commission, payout,
+             created_at, updated_at)
+        SELECT day, owner_id, tractor_id, SUM(bookings_count), SUM(paid_count), SUM(revenue),
+               SUM(commission), SUM(payout), CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM (
+            SELECT {booking_day} AS day, owner_id, tractor_id, 1 AS bookings_count, 0 AS paid_count,
+                   0 AS revenue, 0 AS commission, 0 AS payout
+            FROM bookings
+            UNION ALL
+            SELECT {payment_day}, p.owner_id, b.tractor_id, 0, 1, p.amount,
+                   COALESCE(b.commission_amount, 0), p.amount - COALESCE(b.commission_amount, 0)
+            FROM payments p
+            JOIN bookings b ON b.id = p.booking_id
+        ) AS facts
+        GROUP BY day, owner_id, tractor_id
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('daily_revenue_rollups', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_daily_revenue_rollups_tractor_id'))
+        batch_op.drop_index(batch_op.f('ix_daily_revenue_rollups_owner_id'))
+
+    op.drop_table('daily_revenue_rollups')
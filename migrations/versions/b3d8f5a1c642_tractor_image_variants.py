@@ -0,0 +1,32 @@
+"""tractor image variants
+
+Revision ID: b3d8f5a1c642
+Revises: 9c6e2b7d4f18
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3d8f5a1c642'
+down_revision = '9c6e2b7d4f18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # On SQLite the app's runtime compat guard may have added the columns already.
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('tractors')}
+    with op.batch_alter_table('tractors') as batch_op:
+        if 'image_card_path' not in columns:
+            batch_op.add_column(sa.Column('image_card_path', sa.String(length=500), nullable=True))
+        if 'image_thumb_path' not in columns:
+            batch_op.add_column(sa.Column('image_thumb_path', sa.String(length=500), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('tractors') as batch_op:
+        batch_op.drop_column('image_thumb_path')
+        batch_op.drop_column('image_card_path')
@@ -0,0 +1,26 @@
+"""chat messages cursor index
+
+Revision ID: b6d2e9f4a871
+Revises: c8f1d3a6e942
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2e9f4a871'
+down_revision = 'c8f1d3a6e942'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Chat pages are keyed by id, so (booking_id, created_at) could not serve the cursor.
+    op.execute('CREATE INDEX IF NOT EXISTS ix_chat_messages_booking_cursor ON chat_messages (booking_id, id)')
+    op.execute('DROP INDEX IF EXISTS ix_chat_messages_booking')
+
+
+def downgrade():
+    op.execute('CREATE INDEX IF NOT EXISTS ix_chat_messages_booking ON chat_messages (booking_id, created_at)')
+    op.execute('DROP INDEX IF EXISTS ix_chat_messages_booking_cursor')
@@ -0,0 +1,85 @@
+"""tractor reservations
+
+Revision ID: c52d9e8b4a17
+Revises: 8a4e6c0f2d31
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52d9e8b4a17'
+down_revision = '8a4e6c0f2d31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS btree_gist')
+
+    op.create_table('tractor_reservations',
+    sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('tractor_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('booking_id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), nullable=False),
+    sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_time', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.CheckConstraint('end_time > start_time', name='ck_tractor_reservation_range'),
+    sa.ForeignKeyConstraint(['booking_id'], ['bookings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['tractor_id'], ['tractors.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('booking_id')
+    )
+    with op.batch_alter_table('tractor_reservations', schema=None) as batch_op:
+        batch_op.create_index('ix_tractor_reservations_tractor_end', ['tractor_id', 'end_time'], unique=False)
+
+    # Backfill live bookings. Legacy overlapping rows keep only the earliest booking's slot.
+    op.execute(
+        """
+        INSERT INTO tractor_reservations (tractor_id, booking_id, start_time, end_time, created_at, updated_at)
+        SELECT b.tractor_id, b.id, b.start_time, b.end_time, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+        FROM bookings b
+        WHERE b.status IN ('pending', 'accepted', 'en_route', 'working', 'completed', 'paid')
+          AND b.end_time > b.start_time
+          AND NOT EXISTS (
+              SELECT 1 FROM bookings e
+              WHERE e.tractor_id = b.tractor_id
+                AND e.id < b.id
+                AND e.status IN ('pending', 'accepted', 'en_route', 'working', 'completed', 'paid')
+                AND e.end_time > b.start_time
+                AND e.start_time < b.end_time
+          )
+        """
+    )
+
+    if dialect == 'postgresql':
+        op.execute(
+            'ALTER TABLE tractor_reservations ADD CONSTRAINT ex_tractor_reservations_overlap '
+            'EXCLUDE USING gist (tractor_id WITH =, tstzrange(start_time, end_time) WITH &&)'
+        )
+    elif dialect == 'sqlite':
+        op.execute(
+            """
+            CREATE TRIGGER trg_tractor_reservations_overlap
+            BEFORE INSERT ON tractor_reservations
+            WHEN EXISTS (
+                SELECT 1 FROM tractor_reservations r
+                WHERE r.tractor_id = NEW.tractor_id AND r.end_time > NEW.start_time AND r.start_time < NEW.end_time
+            )
+            BEGIN SELECT RAISE(ABORT, 'tractor reservation overlap'); END
+            """
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS trg_tractor_reservations_overlap')
+    with op.batch_alter_table('tractor_reservations', schema=None) as batch_op:
+        batch_op.drop_index('ix_tractor_reservations_tractor_end')
+
+    op.drop_table('tractor_reservations')
@@ -0,0 +1,42 @@
+"""rollup time bucket indexes
+
+Revision ID: c8f1d3a6e942
+Revises: a7e4c2f9b351
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8f1d3a6e942'
+down_revision = 'a7e4c2f9b351'
+branch_labels = None
+depends_on = None
+
+# Index expressions exactly as app.time_buckets compiled them for a DATE column when this
+# revision was written, so the analytics GROUP BY matches them. Inlined so a later change to
+# that helper cannot alter what this revision creates. PostgreSQL casts to TIMESTAMP because
+# date_trunc over TIMESTAMPTZ is not immutable and cannot be indexed.
+BUCKET_INDEXES = {
+    'postgresql': {
+        'ix_daily_revenue_rollups_week': "CAST(date_trunc('week', CAST(day AS TIMESTAMP)) AS DATE)",
+        'ix_daily_revenue_rollups_month': "CAST(date_trunc('month', CAST(day AS TIMESTAMP)) AS DATE)",
+    },
+    'sqlite': {
+        'ix_daily_revenue_rollups_week': "date(day, 'weekday 0', '-6 days')",
+        'ix_daily_revenue_rollups_month': "date(day, 'start of month')",
+    },
+}
+
+
+def upgrade():
+    expressions = BUCKET_INDEXES.get(op.get_bind().dialect.name, BUCKET_INDEXES['sqlite'])
+    for name, expression in expressions.items():
+        op.create_index(name, 'daily_revenue_rollups', [sa.text(expression)], unique=False)
+
+
+def downgrade():
+    for name in BUCKET_INDEXES['sqlite']:
+        op.drop_index(name, table_name='daily_revenue_rollups')
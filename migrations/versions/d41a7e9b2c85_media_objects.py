@@ -0,0 +1,37 @@
+"""media objects
+
+Revision ID: d41a7e9b2c85
+Revises: b3d8f5a1c642
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd41a7e9b2c85'
+down_revision = 'b3d8f5a1c642'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('media_objects',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('content_type', sa.String(length=64), nullable=False),
+    sa.Column('size_bytes', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('media_objects', schema=None) as batch_op:
+        batch_op.create_index('ix_media_objects_ref_count', ['ref_count'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('media_objects', schema=None) as batch_op:
+        batch_op.drop_index('ix_media_objects_ref_count')
+
+    op.drop_table('media_objects')
@@ -0,0 +1,24 @@
+"""chat messages booking index
+
+Revision ID: e7b3f1a6c925
+Revises: c52d9e8b4a17
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7b3f1a6c925'
+down_revision = 'c52d9e8b4a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # scripts/migrate_sqlite_inplace.py may already have created it.
+    op.execute('CREATE INDEX IF NOT EXISTS ix_chat_messages_booking ON chat_messages (booking_id, created_at)')
+
+
+def downgrade():
+    op.execute('DROP INDEX IF EXISTS ix_chat_messages_booking')
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+SQLite write-contention benchmark for UzhavanGo.
+
+- Seeds a throwaway SQLite file with owners, a farmer and tractors.
+- Starts several writer processes that create bookings at the same time
+  (each its own app, like gunicorn workers), plus optional reader processes
+  running nearby-tractor searches.
+- Reports bookings/second, latency percentiles and "database is locked" failures.
+
+Compare the tuned profile with the old defaults:
+  ./venv/bin/python scripts/bench_sqlite_contention.py --writers 4 --bookings 200
+  ./venv/bin/python scripts/bench_sqlite_contention.py --writers 4 --bookings 200 \\
+      --journal-mode DELETE --synchronous FULL
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+TRACTORS = 40
+
+
+def configure_env(db_path: Path, args: argparse.Namespace) -> None:
+    os.environ["FLASK_ENV"] = "production"
+    os.environ.setdefault("SECRET_KEY", "bench")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["SQLITE_JOURNAL_MODE"] = args.journal_mode
+    os.environ["SQLITE_SYNCHRONOUS"] = args.synchronous
+    os.environ["SQLITE_BUSY_TIMEOUT_MS"] = str(args.busy_timeout_ms)
+
+
+def seed(db_path: Path, args: argparse.Namespace) -> int:
+    configure_env(db_path, args)
+    from app import create_app
+    from app.extensions import db
+    from app.models import Tractor, User
+    from app.schema_compat import apply_schema_fixes
+
+    app = create_app()
+    with app.app_context():
+        apply_schema_fixes(app)
+        owner = User(full_name="Bench Owner", email="owner@bench.local", phone="9000000000", password_hash="x", role="owner")
+        farmer = User(full_name="Bench Farmer", email="farmer@bench.local", phone="9000000001", password_hash="x", role="farmer")
+        db.session.add_all([owner, farmer])
+        db.session.flush()
+        for i in range(TRACTORS):
+            db.session.add(
+                Tractor(
+                    owner_id=owner.id,
+                    title=f"Bench tractor {i}",
+                    price_per_hour=Decimal("500"),
+                    pincode="600001",
+                    district="Chennai",
+                    latitude=Decimal("13.0") + Decimal(i) / 100,
+                    longitude=Decimal("80.2"),
+                )
+            )
+        db.session.commit()
+        return farmer.id
+
+
+def writer(db_path: str, args: argparse.Namespace, worker_index: int, farmer_id: int, start, results) -> None:
+    configure_env(Path(db_path), args)
+    from sqlalchemy.exc import OperationalError
+
+    from app import create_app
+    from app.extensions import db
+    from app.models import Tractor
+    from app.services import BookingService
+
+    app = create_app()
+    latencies, locked, other = [], 0, 0
+    with app.app_context():
+        tractor_ids = [row.id for row in Tractor.query.order_by(Tractor.id).all()]
+        base = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        start.wait()
+        for i in range(args.bookings):
+            # Distinct (tractor, slot) per booking so only lock contention can fail a write.
+            slot = worker_index * args.bookings + i
+            began = time.perf_counter()
+            try:
+                BookingService.create_booking(
+                    farmer_id=farmer_id,
+                    tractor_id=tractor_ids[slot % len(tractor_ids)],
+                    hours=2,
+                    start_time=base + timedelta(hours=3 * slot),
+                )
+                latencies.append(time.perf_counter() - began)
+            except OperationalError as exc:
+                db.session.rollback()
+                if "locked" in str(exc) or "busy" in str(exc):
+                    locked += 1
+                else:
+                    other += 1
+            except Exception:
+                db.session.rollback()
+                other += 1
+            finally:
+                db.session.remove()
+    results.put(("writer", latencies, locked, other))
+
+
+def reader(db_path: str, args: argparse.Namespace, start, stop, results) -> None:
+    configure_env(Path(db_path), args)
+    from app import create_app
+    from app.extensions import db
+    from app.services import TractorService
+
+    app = create_app()
+    reads, failed = 0, 0
+    with app.app_context():
+        start.wait()
+        while not stop.is_set():
+            try:
+                TractorService.nearby(13.1, 80.2, radius_km=25)
+                reads += 1
+            except Exception:
+                failed += 1
+            finally:
+                db.session.remove()
+    results.put(("reader", reads, failed))
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--writers", type=int, default=4, help="Concurrent booking processes")
+    parser.add_argument("--readers", type=int, default=2, help="Concurrent search processes")
+    parser.add_argument("--bookings", type=int, default=100, help="Bookings per writer")
+    parser.add_argument("--journal-mode", default="WAL")
+    parser.add_argument("--synchronous", default="NORMAL")
+    parser.add_argument("--busy-timeout-ms", type=int, default=5000)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "bench.db"
+        farmer_id = seed(db_path, args)
+        start, stop, results = ctx.Event(), ctx.Event(), ctx.Queue()
+        writers = [
+            ctx.Process(target=writer, args=(str(db_path), args, index, farmer_id, start, results))
+            for index in range(args.writers)
+        ]
+        readers = [ctx.Process(target=reader, args=(str(db_path), args, start, stop, results)) for _ in range(args.readers)]
+        for process in writers + readers:
+            process.start()
+        time.sleep(2.0)  # let every process finish booting before the clock starts
+        began = time.perf_counter()
+        start.set()
+
+        latencies, locked, other, reads, read_failures = [], 0, 0, 0, 0
+        for _ in writers:
+            _kind, worker_latencies, worker_locked, worker_other = results.get()
+            latencies.extend(worker_latencies)
+            locked += worker_locked
+            other += worker_other
+        elapsed = time.perf_counter() - began
+        stop.set()
+        for _ in readers:
+            _kind, worker_reads, worker_failed = results.get()
+            reads += worker_reads
+            read_failures += worker_failed
+        for process in writers + readers:
+            process.join()
+
+    print(f"profile: journal_mode={args.journal_mode} synchronous={args.synchronous} busy_timeout={args.busy_timeout_ms}ms")
+    print(f"writers={args.writers} readers={args.readers} bookings/writer={args.bookings}")
+    print(f"committed: {len(latencies)} in {elapsed:.2f}s ({len(latencies) / elapsed:.1f} bookings/s)")
+    print(
+        "latency ms: "
+        f"p50={percentile(latencies, 50) * 1000:.1f} "
+        f"p95={percentile(latencies, 95) * 1000:.1f} "
+        f"max={max(latencies, default=0) * 1000:.1f}"
+    )
+    print(f"failed: locked={locked} other={other}")
+    print(f"searches during run: {reads} (failed {read_failures})")
+
+
+if __name__ == "__main__":
+    main()
@@ -164,7 +164,7 @@ def create_indexes(cur: sqlite3.Cursor) -> None:
         "ix_payments_owner": "CREATE INDEX ix_payments_owner ON payments(owner_id)",
         "ix_tractors_equipment_type": "CREATE INDEX ix_tractors_equipment_type ON tractors(equipment_type)",
         "ix_tractors_availability_status": "CREATE INDEX ix_tractors_availability_status ON tractors(availability_status)",
-        "ix_chat_messages_booking": "CREATE INDEX ix_chat_messages_booking ON chat_messages(booking_id, created_at)",
+        "ix_chat_messages_booking_cursor": "CREATE INDEX ix_chat_messages_booking_cursor ON chat_messages(booking_id, id)",
         "ix_booking_addons_booking": "CREATE INDEX ix_booking_addons_booking ON booking_addons(booking_id)",
         "ix_users_last_login": "CREATE INDEX ix_users_last_login ON users(last_login)",
     }
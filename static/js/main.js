@@ -29,6 +29,41 @@ function initNotificationDrawer() {
     });
 }
 
+function initEventStream() {
+    const bell = document.getElementById("notifBellBtn");
+    const drawer = document.getElementById("notifDrawer");
+    if (!bell || !drawer || !window.EventSource) return;
+
+    const source = new EventSource("/events/stream");
+
+    source.addEventListener("notification", (e) => {
+        const item = JSON.parse(e.data);
+        let badge = bell.querySelector(".notif-badge");
+        if (!badge) {
+            badge = document.createElement("span");
+            badge.className = "notif-badge";
+            badge.textContent = "0";
+            bell.appendChild(badge);
+        }
+        badge.textContent = String(parseInt(badge.textContent || "0", 10) + 1);
+
+        const row = document.createElement("div");
+        row.className = "drawer-item unread";
+        const title = document.createElement("strong");
+        title.textContent = item.title;
+        const message = document.createElement("p");
+        message.textContent = item.message;
+        row.append(title, message);
+        drawer.querySelector("p.muted")?.remove();
+        drawer.querySelector(".drawer-head")?.after(row);
+        window.dispatchEvent(new CustomEvent("uzg:notification", { detail: item }));
+    });
+
+    source.addEventListener("chat_message", (e) => {
+        window.dispatchEvent(new CustomEvent("uzg:chat_message", { detail: JSON.parse(e.data) }));
+    });
+}
+
 function initStarPickers() {
     document.querySelectorAll(".star-picker").forEach((picker) => {
         const input = picker.closest("form")?.querySelector(".rating-input");
@@ -159,7 +194,7 @@ function initLocalitySearch() {
             const rating = node.querySelector(".search-rating");
             const bookBtn = node.querySelector("a.btn.black");
 
-            image.src = tractor.image ? `/static/${tractor.image}` : "";
+            image.src = tractor.image || "";
             image.alt = tractor.name || "Tractor";
             if (!tractor.image) {
                 image.style.display = "none";
@@ -349,6 +384,7 @@ setTimeout(() => {
 
 document.addEventListener("DOMContentLoaded", () => {
     initNotificationDrawer();
+    initEventStream();
     initStarPickers();
     initPlatformStats();
     initLocalitySearch();
@@ -0,0 +1,119 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+
+from app.extensions import db
+from app.models import Booking, Tractor, User
+
+
+def make_user(role, index=0, **fields):
+    user = User(
+        full_name=f"{role.title()} {index}",
+        email=f"{role}{index}@example.com",
+        phone=f"9{index:09d}" if role == "owner" else f"8{index:09d}",
+        password_hash="x",
+        role=role,
+        **fields,
+    )
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def make_tractor(owner, index=0, pincode="600001", **fields):
+    tractor = Tractor(
+        owner_id=owner.id,
+        title=f"Tractor {index}",
+        price_per_hour=Decimal("500"),
+        pincode=pincode,
+        district="Chennai",
+        village="Velachery",
+        latitude=Decimal("13.0") + Decimal(index) / 100,
+        longitude=Decimal("80.2"),
+        **fields,
+    )
+    db.session.add(tractor)
+    db.session.flush()
+    return tractor
+
+
+def make_booking(tractor, farmer, days_ahead=1, status="completed"):
+    start = datetime.now(timezone.utc) + timedelta(days=days_ahead)
+    booking = Booking(
+        tractor_id=tractor.id,
+        farmer_id=farmer.id,
+        owner_id=tractor.owner_id,
+        status=status,
+        start_time=start,
+        end_time=start + timedelta(hours=2),
+        hours=2,
+        quoted_price_per_hour=Decimal("500"),
+        total_amount=Decimal("1000"),
+    )
+    db.session.add(booking)
+    db.session.flush()
+    return booking
+
+
+def run_concurrently(app, work, items):
+    """Run work(item) in one thread per item, retrying SQLite lock timeouts; returns the errors raised."""
+    barrier = threading.Barrier(len(items))
+    errors = []
+
+    def target(item):
+        with app.app_context():
+            barrier.wait()
+            for _attempt in range(50):
+                try:
+                    work(item)
+                    db.session.commit()
+                    return
+                except OperationalError:
+                    # "database is locked": SQLite has a single writer, so just try again.
+                    db.session.rollback()
+                except Exception as exc:
+                    db.session.rollback()
+                    errors.append(exc)
+                    return
+                finally:
+                    db.session.remove()
+            errors.append(RuntimeError("gave up waiting for the write lock"))
+
+    threads = [threading.Thread(target=target, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+class QueryCounter:
+    """Counts statements sent to an engine while the block runs."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, "before_cursor_execute", self._record)
+
+    def _record(self, _conn, _cursor, statement, *_args):
+        self.statements.append(statement)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+def login(client, user):
+    """Sign `user` in on a test client through the Flask-Login session keys."""
+    with client.session_transaction() as http_session:
+        http_session["_user_id"] = str(user.id)
+        http_session["_fresh"] = True
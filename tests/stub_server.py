@@ -0,0 +1,55 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubServer:
+    """
+    Local HTTP server replaying scripted responses: each GET pops the next
+    (status, body, delay_seconds) from `responses`, repeating the last one.
+    """
+
+    def __init__(self):
+        self.responses = [(200, {}, 0.0)]
+        self.hits = 0
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, body, delay = stub._next()
+                time.sleep(delay)
+                payload = json.dumps(body).encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # the client gave up first
+
+            def log_message(self, *_args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}/forecast"
+
+    def _next(self):
+        with self._lock:
+            self.hits += 1
+            return self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+
+    def script(self, *responses):
+        with self._lock:
+            self.responses = [response if len(response) == 3 else (*response, 0.0) for response in responses]
+
+    def __enter__(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *_exc_info):
+        self._server.shutdown()
+        self._server.server_close()
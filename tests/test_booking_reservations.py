@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.errors import AppError
+from app.extensions import db
+from app.models import Booking, TractorReservation
+from app.services import BookingService
+from tests.factories import make_booking, make_tractor, make_user, run_concurrently
+
+THREADS = 8
+SLOT_START = datetime(2030, 1, 7, 8, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def listing(file_app):
+    owner = make_user("owner")
+    farmers = [make_user("farmer", index) for index in range(THREADS)]
+    tractor = make_tractor(owner)
+    db.session.commit()
+    return file_app, owner, farmers, tractor
+
+
+def book(farmer, tractor, start=SLOT_START, hours=2):
+    booking = BookingService.create_booking(farmer.id, tractor.id, hours, start_time=start)
+    db.session.commit()
+    return booking
+
+
+def test_overlapping_reservation_is_rejected_by_the_database(listing):
+    _app, _owner, farmers, tractor = listing
+    book(farmers[0], tractor)
+    # Skip create_booking's overlap pre-check, as a parallel request that passed it would.
+    booking = make_booking(tractor, farmers[1])
+    booking.start_time = SLOT_START + timedelta(hours=1)
+    booking.end_time = SLOT_START + timedelta(hours=3)
+    db.session.flush()
+
+    with pytest.raises(AppError) as error:
+        BookingService._reserve_slot(booking)
+
+    assert error.value.status_code == 409
+    assert TractorReservation.query.count() == 1
+
+
+def test_adjacent_slots_are_accepted(listing):
+    _app, _owner, farmers, tractor = listing
+    book(farmers[0], tractor)
+    book(farmers[1], tractor, start=SLOT_START + timedelta(hours=2))
+    book(farmers[2], tractor, start=SLOT_START - timedelta(hours=1), hours=1)
+
+    assert TractorReservation.query.filter_by(tractor_id=tractor.id).count() == 3
+
+
+def test_parallel_bookings_of_one_slot_commit_once(listing):
+    app, _owner, farmers, tractor = listing
+
+    errors = run_concurrently(
+        app,
+        lambda farmer_id: BookingService.create_booking(farmer_id, tractor.id, 2, start_time=SLOT_START),
+        [farmer.id for farmer in farmers],
+    )
+
+    assert len(errors) == THREADS - 1
+    assert all(isinstance(error, AppError) and error.status_code == 409 for error in errors)
+    assert Booking.query.filter_by(tractor_id=tractor.id).count() == 1
+    assert TractorReservation.query.filter_by(tractor_id=tractor.id).count() == 1
+
+
+@pytest.mark.parametrize("status", ["cancelled", "rejected"])
+def test_cancelled_booking_frees_its_slot(listing, status):
+    _app, owner, farmers, tractor = listing
+    booking = book(farmers[0], tractor)
+
+    BookingService.transition_booking(booking, status, owner)
+    db.session.commit()
+
+    assert TractorReservation.query.filter_by(booking_id=booking.id).count() == 0
+    assert book(farmers[1], tractor).status == "pending"
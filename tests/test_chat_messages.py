@@ -0,0 +1,61 @@
+from sqlalchemy import text
+
+from app.extensions import db
+from app.models import ChatMessage
+from app.schema_compat import apply_schema_fixes
+from app.services import ChatService
+from tests.factories import make_booking, make_tractor, make_user
+
+
+def seed_chat(messages):
+    owner = make_user("owner")
+    farmer = make_user("farmer")
+    booking = make_booking(make_tractor(owner), farmer)
+    other = make_booking(make_tractor(owner, 1), farmer, days_ahead=2)
+    for index in range(messages):
+        for row in (booking, other):
+            db.session.add(ChatMessage(booking_id=row.id, sender_id=farmer.id, message=f"message {index}"))
+    db.session.commit()
+    return booking, farmer
+
+
+def test_cursor_pages_walk_one_booking_in_id_order(app):
+    booking, farmer = seed_chat(25)
+
+    latest = ChatService.list_messages(booking.id, farmer, limit=10)
+    older = ChatService.list_messages(booking.id, farmer, before_id=latest[0].id, limit=10)
+    newer = ChatService.list_messages(booking.id, farmer, after_id=older[-1].id, limit=10)
+
+    assert [row.message for row in latest] == [f"message {index}" for index in range(15, 25)]
+    assert [row.message for row in older] == [f"message {index}" for index in range(5, 15)]
+    assert [row.id for row in newer] == [row.id for row in latest]
+    assert {row.booking_id for row in latest + older + newer} == {booking.id}
+
+
+def test_cursor_query_needs_no_sort(app):
+    booking, _farmer = seed_chat(3)
+    plan = db.session.execute(
+        text(
+            "EXPLAIN QUERY PLAN SELECT id FROM chat_messages "
+            "WHERE booking_id = :booking_id AND id > :after_id ORDER BY id LIMIT 100"
+        ),
+        {"booking_id": booking.id, "after_id": 0},
+    ).fetchall()
+    detail = " ".join(row[-1] for row in plan)
+
+    # SQLite may pick either booking_id index (both end in the rowid); neither needs a sort.
+    assert "SEARCH chat_messages USING" in detail
+    assert "booking_id=?" in detail
+    assert "TEMP B-TREE" not in detail
+
+
+def test_schema_fixes_replace_the_created_at_index(file_app):
+    db.session.execute(text("DROP INDEX ix_chat_messages_booking_cursor"))
+    db.session.execute(text("CREATE INDEX ix_chat_messages_booking ON chat_messages (booking_id, created_at)"))
+    db.session.commit()
+
+    apply_schema_fixes(file_app)
+
+    names = {row[0] for row in db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert "ix_chat_messages_booking_cursor" in names
+    assert "ix_chat_messages_booking" not in names
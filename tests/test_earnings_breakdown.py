@@ -0,0 +1,57 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from app.extensions import db
+from app.models import OwnerEarning
+from app.services import EarningService
+from tests.factories import QueryCounter, make_booking, make_tractor, make_user
+
+
+def seed_earnings(count):
+    owner = make_user("owner")
+    farmer = make_user("farmer")
+    tractor = make_tractor(owner)
+    same_time = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    for index in range(count):
+        booking = make_booking(tractor, farmer, days_ahead=index + 1, status="paid")
+        db.session.add(
+            OwnerEarning(
+                owner_id=owner.id,
+                booking_id=booking.id,
+                gross_amount=Decimal("1000"),
+                platform_fee=Decimal("100"),
+                net_amount=Decimal("900"),
+                # Ties on created_at must still page without gaps or repeats.
+                created_at=same_time if index % 3 else datetime(2026, 10, 2 + index, tzinfo=timezone.utc),
+            )
+        )
+    db.session.commit()
+    return owner
+
+
+def test_breakdown_pages_cover_every_earning_once(app):
+    owner = seed_earnings(23)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page = EarningService.breakdown_page(owner.id, cursor=cursor, per_page=5)
+        seen.extend(item["booking_id"] for item in page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 5
+    assert len(seen) == 23
+    assert len(set(seen)) == 23
+
+
+def test_breakdown_page_uses_a_keyset_filter_not_offset(app):
+    owner = seed_earnings(12)
+    first = EarningService.breakdown_page(owner.id, per_page=5)
+
+    with QueryCounter(db.engine) as queries:
+        EarningService.breakdown_page(owner.id, cursor=first["next_cursor"], per_page=5)
+
+    assert queries.count == 1
+    assert "owner_earnings.created_at < ?" in queries.statements[0]
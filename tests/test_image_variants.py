@@ -0,0 +1,54 @@
+import io
+
+import pytest
+from PIL import Image
+from werkzeug.datastructures import FileStorage
+
+from app.extensions import db
+from app.models import Job, Tractor
+from app.services import FileService, JobService, MediaStorage, TractorService
+from tests.factories import make_user
+
+
+@pytest.fixture
+def upload_root(app, tmp_path):
+    root = str(tmp_path / "uploads")
+    app.config["UPLOAD_DIR"] = root
+    app.config["JOBS_EAGER"] = False
+    app.extensions.pop("media_backend", None)
+    return root
+
+
+def photo(size=(1600, 1200)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (90, 140, 40)).save(buffer, "PNG")
+    return FileStorage(io.BytesIO(buffer.getvalue()), filename="photo.png")
+
+
+def test_upload_stores_only_the_detail_image(app, upload_root):
+    paths = FileService.save_image(photo(), upload_root)
+
+    assert list(paths) == ["image_path"]
+    assert MediaStorage.exists(paths["image_path"])
+
+
+def test_card_and_thumbnail_are_built_by_the_job(app, upload_root):
+    owner = make_user("owner")
+    payload = {"title": "Swaraj 744", "price_per_hour": "900", "pincode": "600001"}
+    payload.update(FileService.save_image(photo(), upload_root))
+    tractor = TractorService.create_tractor(owner.id, payload)
+
+    assert tractor.image_card_path is None
+    assert tractor.card_image == tractor.image_path
+    assert Job.query.filter_by(name="media.image_variants").count() == 1
+
+    assert JobService.run_pending(limit=10) == 1
+    db.session.expire_all()
+    tractor = db.session.get(Tractor, tractor.id)
+    widths = {}
+    for column in ("image_card_path", "image_thumb_path"):
+        key = getattr(tractor, column)
+        assert MediaStorage.exists(key)
+        with Image.open(MediaStorage.backend()._path(key)) as image:
+            widths[column] = image.width
+    assert widths == {"image_card_path": 480, "image_thumb_path": 160}
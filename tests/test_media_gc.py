@@ -0,0 +1,45 @@
+import io
+import os
+
+import pytest
+from PIL import Image
+
+from app.extensions import db
+from app.models import MediaObject
+from app.services import FileService, MediaStorage
+from tests.factories import make_tractor, make_user
+
+
+@pytest.fixture
+def upload_root(app, tmp_path):
+    root = str(tmp_path / "uploads")
+    app.config["UPLOAD_DIR"] = root
+    app.extensions.pop("media_backend", None)
+    return root
+
+
+def upload(root, colour):
+    buffer = io.BytesIO()
+    Image.new("RGB", (400, 300), colour).save(buffer, "PNG")
+    return FileService.write_variants(io.BytesIO(buffer.getvalue()), root)
+
+
+def test_gc_keeps_current_images_and_deletes_replaced_ones(app, upload_root):
+    tractor = make_tractor(make_user("owner"), **upload(upload_root, (10, 20, 30)))
+    replaced = {column: getattr(tractor, column) for column in ("image_path", "image_card_path", "image_thumb_path")}
+    for column, key in upload(upload_root, (200, 100, 0)).items():
+        setattr(tractor, column, key)
+    addon = make_tractor(tractor.owner, 1, equipment_type="Rotavator", **upload(upload_root, (0, 128, 0)))
+    equipment_image = addon.image_path
+    db.session.commit()
+
+    removed = MediaStorage.collect_garbage(0)
+
+    kept = {tractor.image_path, tractor.image_card_path, tractor.image_thumb_path, equipment_image}
+    assert set(replaced.values()) <= set(removed)
+    assert not kept & set(removed)
+    for key in kept:
+        assert MediaStorage.exists(key)
+        assert db.session.get(MediaObject, key).ref_count == 1
+    for key in replaced.values():
+        assert not os.path.exists(os.path.join(upload_root, *key.split("/")))
@@ -0,0 +1,173 @@
+import threading
+import time
+
+import pytest
+
+from app.services.http_client import CircuitOpenError, OutboundHTTP, UpstreamError
+from app.services.weather_service import SingleFlightCache, WeatherService
+from tests.stub_server import StubServer
+
+FORECAST = {"daily": {"precipitation_probability_max": [10, 70]}}
+DRY_FORECAST = {"daily": {"precipitation_probability_max": [10, 20]}}
+
+
+@pytest.fixture
+def stub():
+    with StubServer() as server:
+        yield server
+
+
+def client(**options):
+    return OutboundHTTP(**{"retries": 2, "backoff": 0.01, "breaker_threshold": 2, "breaker_cooldown": 0.3, **options})
+
+
+def host_metrics(http):
+    return next(iter(http.metrics().values()))
+
+
+def test_retries_a_5xx_then_returns_the_body(stub):
+    stub.script((503, {}), (200, FORECAST))
+    http = client()
+
+    assert http.get_json(stub.url, timeout=2) == FORECAST
+    assert stub.hits == 2
+    assert host_metrics(http)["retries"] == 1
+
+
+def test_gives_up_at_the_deadline(stub):
+    stub.script((200, FORECAST, 2.0))
+    http = client()
+
+    started = time.monotonic()
+    with pytest.raises(UpstreamError):
+        http.get_json(stub.url, timeout=0.3)
+
+    assert time.monotonic() - started < 1.5
+
+
+def test_breaker_opens_after_consecutive_5xx_and_short_circuits(stub):
+    stub.script((500, {}))
+    http = client(retries=0)
+
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            http.get_json(stub.url, timeout=2)
+    hits = stub.hits
+    with pytest.raises(CircuitOpenError):
+        http.get_json(stub.url, timeout=2)
+
+    assert stub.hits == hits
+    assert host_metrics(http)["state"] == "open"
+
+
+def test_half_open_probe_closes_the_breaker_on_success(stub):
+    stub.script((500, {}), (500, {}), (200, FORECAST))
+    http = client(retries=0)
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            http.get_json(stub.url, timeout=2)
+
+    time.sleep(0.35)
+    assert host_metrics(http)["state"] == "half_open"
+    assert http.get_json(stub.url, timeout=2) == FORECAST
+    assert host_metrics(http)["state"] == "closed"
+
+
+def test_half_open_allows_one_probe_and_reopens_when_it_fails(stub):
+    stub.script((500, {}), (500, {}), (500, {}, 0.3))
+    http = client(retries=0)
+    for _ in range(2):
+        with pytest.raises(UpstreamError):
+            http.get_json(stub.url, timeout=2)
+    time.sleep(0.35)
+
+    probe_errors = []
+
+    def probe():
+        try:
+            http.get_json(stub.url, timeout=2)
+        except UpstreamError as exc:
+            probe_errors.append(exc)
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    time.sleep(0.1)
+    with pytest.raises(CircuitOpenError):
+        http.get_json(stub.url, timeout=2)
+    prober.join()
+
+    assert len(probe_errors) == 1 and not isinstance(probe_errors[0], CircuitOpenError)
+    assert stub.hits == 3
+    assert host_metrics(http)["state"] == "open"
+
+
+def test_client_errors_do_not_open_the_breaker(stub):
+    stub.script((404, {"error": "unknown location"}))
+    http = client()
+
+    for _ in range(5):
+        with pytest.raises(UpstreamError) as excinfo:
+            http.get_json(stub.url, timeout=2)
+        assert not isinstance(excinfo.value, CircuitOpenError)
+
+    metrics = host_metrics(http)
+    assert stub.hits == 5  # not retried either
+    assert metrics["state"] == "closed"
+    assert metrics["failures"] == 5
+
+
+def test_concurrent_weather_misses_share_one_upstream_call(app, stub):
+    stub.script((200, FORECAST, 0.3))
+    app.config["WEATHER_API_URL"] = stub.url
+    results = []
+
+    def lookup():
+        with app.app_context():
+            results.append(WeatherService.rain_probability(13.08, 80.27))
+
+    threads = [threading.Thread(target=lookup) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [70] * 10
+    assert stub.hits == 1
+
+
+def test_expired_weather_is_served_stale_while_one_refresh_runs(app, stub):
+    stub.script((200, FORECAST), (200, DRY_FORECAST, 0.5))
+    app.config.update(WEATHER_API_URL=stub.url, WEATHER_CACHE_TTL=0.2, WEATHER_CACHE_STALE_SECONDS=60)
+    assert WeatherService.rain_probability(13.08, 80.27) == 70
+    time.sleep(0.3)
+
+    started = time.monotonic()
+    stale = [WeatherService.rain_probability(13.08, 80.27) for _ in range(5)]
+
+    assert stale == [70] * 5
+    assert time.monotonic() - started < 0.3  # not waiting on the slow refresh
+    deadline = time.monotonic() + 5
+    while WeatherService.rain_probability(13.08, 80.27) != 20 and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert WeatherService.rain_probability(13.08, 80.27) == 20
+    assert stub.hits == 2
+
+
+class SaturatedPool:
+    def __init__(self):
+        self.attempts = 0
+
+    def submit(self, *_args, **_kwargs):
+        self.attempts += 1
+        return None
+
+
+def test_saturated_pool_leaves_the_refresh_to_a_later_caller():
+    pool = SaturatedPool()
+    cache = SingleFlightCache(ttl=0, stale_ttl=60, refresh_pool=pool)
+    cache._entries["key"] = ("stale", time.monotonic())
+
+    assert cache.get("key", lambda: "fresh") == "stale"
+    assert cache.get("key", lambda: "fresh") == "stale"
+    assert pool.attempts == 2
+    assert not cache._inflight
@@ -0,0 +1,59 @@
+import base64
+
+from app.extensions import db
+from tests.factories import login, make_booking, make_tractor, make_user
+
+BOOKINGS = 7
+
+
+def seed_owner_bookings():
+    owner = make_user("owner")
+    farmer = make_user("farmer")
+    tractor = make_tractor(owner)
+    for index in range(BOOKINGS):
+        make_booking(tractor, farmer, days_ahead=index + 1, status="pending")
+    db.session.commit()
+    return owner
+
+
+def test_unpaged_requests_keep_the_full_list_body(app):
+    owner = seed_owner_bookings()
+    client = app.test_client()
+    login(client, owner)
+
+    for url in ("/owner/bookings", f"/bookings/{owner.id}"):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert isinstance(response.json, list)
+        assert len(response.json) == BOOKINGS
+        assert "X-Next-Cursor" not in response.headers
+
+
+def test_paged_requests_walk_every_booking_with_an_opaque_cursor(app):
+    owner = seed_owner_bookings()
+    client = app.test_client()
+    login(client, owner)
+
+    seen, cursor = [], None
+    while True:
+        query = {"limit": 3} if cursor is None else {"limit": 3, "cursor": cursor}
+        body = client.get("/owner/bookings", query_string=query).json
+        seen.extend(item["booking_id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+        assert "+" not in cursor and ":" not in cursor and "=" not in cursor
+        base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+
+    assert len(seen) == BOOKINGS
+    assert len(set(seen)) == BOOKINGS
+
+
+def test_malformed_cursor_is_rejected(app):
+    owner = seed_owner_bookings()
+    client = app.test_client()
+    login(client, owner)
+
+    response = client.get("/owner/bookings", query_string={"cursor": "2026-10-01T00:00:00+00:00_5"})
+
+    assert response.status_code == 400
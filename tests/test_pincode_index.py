@@ -0,0 +1,54 @@
+import os
+
+import pytest
+
+from app.services.pincode_index import PincodeIndex
+
+
+def build_index(tmp_path, rows, name="pincodes"):
+    source = tmp_path / f"{name}.csv"
+    source.write_text("pincode,latitude,longitude,district\n" + "".join(f"{row}\n" for row in rows))
+    output = tmp_path / f"{name}.bin"
+    PincodeIndex.build(str(source), str(output))
+    return str(output)
+
+
+@pytest.mark.parametrize(
+    ("query", "centroid"),
+    [
+        # Two 0.1-degree cells south of the centroid, about 12 km away.
+        ((12.99, 80.2), (13.10, 80.2)),
+        # Two cells west at 30N, where a longitude cell is only about 9.6 km wide.
+        ((30.0, 80.099), (30.0, 80.24)),
+    ],
+)
+def test_lookup_finds_centroids_beyond_the_neighbouring_cells(tmp_path, query, centroid):
+    index = PincodeIndex(build_index(tmp_path, [f"600001,{centroid[0]},{centroid[1]},Chennai"]))
+
+    found = index.lookup(*query, max_km=15.0)
+
+    assert found is not None
+    assert found["pincode"] == "600001"
+    assert found["distance_km"] < 15.0
+
+
+def test_lookup_ignores_centroids_beyond_max_km(tmp_path):
+    index = PincodeIndex(build_index(tmp_path, ["600001,13.30,80.2,Chennai"]))
+
+    assert index.lookup(13.0, 80.2, max_km=15.0) is None
+
+
+def test_reloading_the_index_unmaps_the_previous_file(app, tmp_path):
+    path = build_index(tmp_path, ["600001,13.0,80.2,Chennai"])
+    app.config["PINCODE_INDEX_PATH"] = path
+    first = PincodeIndex.for_app()
+
+    os.replace(build_index(tmp_path, ["600002,13.0,80.2,Chennai"], name="rebuilt"), path)
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+    second = PincodeIndex.for_app()
+
+    assert second is not first
+    assert first._buf.closed
+    assert first.lookup(13.0, 80.2) is None
+    assert second.lookup(13.0, 80.2)["pincode"] == "600002"
@@ -0,0 +1,37 @@
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models import Booking, Payment
+from app.services import BookingService
+from tests.factories import make_booking, make_tractor, make_user, run_concurrently
+
+THREADS = 12
+
+
+def test_concurrent_sequence_values_are_unique(file_app):
+    def take(_index):
+        BookingService._next_receipt_sequence("20260101")
+
+    errors = run_concurrently(file_app, take, range(THREADS))
+
+    assert not errors
+    assert BookingService._next_receipt_sequence("20260101") == THREADS + 1
+
+
+def test_concurrent_payments_get_distinct_receipt_numbers(file_app):
+    owner = make_user("owner")
+    farmer = make_user("farmer")
+    tractor = make_tractor(owner)
+    booking_ids = [make_booking(tractor, farmer, days_ahead=index + 1).id for index in range(THREADS)]
+    db.session.commit()
+
+    def pay(booking_id):
+        BookingService.transition_booking(db.session.get(Booking, booking_id), "paid", None)
+
+    errors = run_concurrently(file_app, pay, booking_ids)
+
+    assert not [error for error in errors if isinstance(error, IntegrityError)]
+    assert not errors
+    numbers = [payment.receipt_number for payment in Payment.query.all()]
+    assert len(numbers) == THREADS
+    assert len(set(numbers)) == THREADS
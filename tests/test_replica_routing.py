@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import insert
+
+from app import create_app
+from app.config import TestingConfig
+from app.db_routing import PRIMARY_UNTIL_KEY, REPLICA_BIND
+from app.decorators import read_replica
+from app.extensions import db
+from app.models import User
+from app.services import AnalyticsService
+from tests.factories import make_user
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """Primary and replica as two SQLite files, so a read shows which one served it."""
+    monkeypatch.setattr(TestingConfig, "SQLALCHEMY_DATABASE_URI", f"sqlite:///{tmp_path / 'primary.db'}")
+    monkeypatch.setattr(TestingConfig, "DATABASE_REPLICA_URL", f"sqlite:///{tmp_path / 'replica.db'}")
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        db.metadata.create_all(db.engines[REPLICA_BIND])
+        make_user("owner")
+        make_user("farmer")
+        db.session.commit()
+        db.session.remove()
+        with db.engines[REPLICA_BIND].begin() as connection:
+            # The replica has only caught up with the first user.
+            connection.execute(
+                insert(User).values(full_name="Owner 0", email="owner0@example.com", password_hash="x", role="owner")
+            )
+        yield app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    # init_app registers a MetaData per bind key on the shared extension; later apps have no replica.
+    db.metadatas.pop(REPLICA_BIND, None)
+
+
+@read_replica
+def count_users():
+    return User.query.count()
+
+
+def test_read_replica_view_reads_from_the_replica(replica_app):
+    with replica_app.test_request_context():
+        assert count_users() == 1
+        assert User.query.count() == 2
+
+
+def test_reads_after_a_write_stay_on_the_primary(replica_app):
+    @read_replica
+    def write_then_read():
+        make_user("farmer", 1)
+        return User.query.count()
+
+    with replica_app.test_request_context():
+        assert write_then_read() == 3
+
+
+def test_client_is_pinned_to_the_primary_after_committing(replica_app):
+    with replica_app.test_request_context() as context:
+        make_user("farmer", 1)
+        db.session.commit()
+        assert context.session[PRIMARY_UNTIL_KEY] > 0
+        assert count_users() == 3
+
+
+def test_admin_kpis_are_computed_on_the_primary(replica_app):
+    @read_replica
+    def dashboard():
+        kpis = AnalyticsService.admin_kpis()
+        return kpis, User.query.count()
+
+    AnalyticsService.invalidate_admin_kpis()
+    with replica_app.test_request_context():
+        kpis, replica_users = dashboard()
+
+    assert kpis["total_users"] == 2
+    assert replica_users == 1
@@ -0,0 +1,16 @@
+from app.extensions import db
+from app.schema_compat import SCHEMA_FIX_VERSION, apply_schema_fixes, recorded_fix_version
+
+
+def test_schema_fixes_leave_other_databases_to_alembic(app, monkeypatch):
+    created = []
+    monkeypatch.setattr(db, "create_all", lambda *args, **kwargs: created.append(True))
+    monkeypatch.setitem(app.config, "SQLALCHEMY_DATABASE_URI", "postgresql://app@db.internal/uzhavango")
+
+    assert apply_schema_fixes(app) is False
+    assert not created
+
+
+def test_schema_fixes_run_on_sqlite(file_app):
+    assert apply_schema_fixes(file_app) is True
+    assert recorded_fix_version(db.session) == SCHEMA_FIX_VERSION
@@ -0,0 +1,66 @@
+import importlib.util
+import os
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import DateTime, column, create_engine, literal, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.extensions import db
+from app.models import Booking, DailyRevenueRollup
+from app.time_buckets import time_bucket
+
+# Late evening UTC is already the next day (and week/month) in India, where the app runs.
+CASES = [
+    (datetime(2026, 10, 11, 23, 30, tzinfo=timezone.utc), "day", date(2026, 10, 11)),
+    (datetime(2026, 10, 11, 23, 30, tzinfo=timezone.utc), "week", date(2026, 10, 5)),
+    (datetime(2026, 10, 12, 0, 30, tzinfo=timezone.utc), "week", date(2026, 10, 12)),
+    (datetime(2026, 9, 30, 20, 0, tzinfo=timezone.utc), "month", date(2026, 9, 1)),
+]
+
+
+def bucket_of(connection, moment, unit):
+    return connection.execute(select(time_bucket(literal(moment, DateTime(timezone=True)), unit))).scalar()
+
+
+@pytest.mark.parametrize("moment, unit, expected", CASES)
+def test_sqlite_buckets_by_utc_date(app, moment, unit, expected):
+    assert bucket_of(db.session, moment, unit) == expected
+
+
+def test_postgresql_buckets_timestamptz_in_utc():
+    compiled = str(time_bucket(Booking.created_at, "week").compile(dialect=postgresql.dialect()))
+
+    assert compiled == "CAST(date_trunc('week', bookings.created_at AT TIME ZONE 'UTC') AS DATE)"
+
+
+def test_postgresql_date_bucket_matches_the_expression_index():
+    compiled = str(time_bucket(DailyRevenueRollup.day, "week").compile(dialect=postgresql.dialect()))
+
+    with open(os.path.join(os.path.dirname(__file__), "..", "docs", "SCHEMA.sql")) as schema:
+        assert f"ON daily_revenue_rollups(({compiled.replace('daily_revenue_rollups.', '')}))" in schema.read()
+
+
+def test_migration_index_expressions_match_the_query_buckets():
+    versions = os.path.join(os.path.dirname(__file__), "..", "migrations", "versions")
+    path = os.path.join(versions, "c8f1d3a6e942_rollup_time_bucket_indexes.py")
+    spec = importlib.util.spec_from_file_location("rollup_time_bucket_indexes", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    for dialect in (postgresql.dialect(), sqlite.dialect()):
+        for unit in ("week", "month"):
+            expected = str(time_bucket(column("day"), unit).compile(dialect=dialect))
+            assert migration.BUCKET_INDEXES[dialect.name][f"ix_daily_revenue_rollups_{unit}"] == expected
+
+
+@pytest.mark.skipif(not os.getenv("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to run against PostgreSQL")
+@pytest.mark.parametrize("moment, unit, expected", CASES)
+def test_postgresql_buckets_match_sqlite(moment, unit, expected):
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"])
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SET TIME ZONE 'Asia/Kolkata'"))
+            assert bucket_of(connection, moment, unit) == expected
+    finally:
+        engine.dispose()
@@ -0,0 +1,44 @@
+from app.extensions import db
+from tests.factories import QueryCounter, make_booking, make_tractor, make_user
+
+# Platform settings, pincode demand, tractors joined to owners, completed jobs per owner.
+MAX_CATALOG_STATEMENTS = 5
+
+
+def seed_catalog(listings, owners=10):
+    farmer = make_user("farmer")
+    owner_rows = [make_user("owner", index, is_verified_owner=bool(index % 2)) for index in range(owners)]
+    tractors = [make_tractor(owner_rows[index % owners], index) for index in range(listings)]
+    for index, tractor in enumerate(tractors[:20]):
+        make_booking(tractor, farmer, days_ahead=index + 1)
+    db.session.commit()
+
+
+def test_catalog_query_count_is_bounded(app):
+    seed_catalog(listings=50)
+    client = app.test_client()
+
+    with QueryCounter(db.engine) as queries:
+        response = client.get("/tractors?pincode=600001")
+
+    assert response.status_code == 200
+    assert response.json["count"] == 50
+    assert queries.count <= MAX_CATALOG_STATEMENTS, "\n".join(queries.statements)
+
+
+def test_catalog_query_count_does_not_grow_with_listings(app):
+    seed_catalog(listings=5, owners=5)
+    client = app.test_client()
+    client.get("/tractors?pincode=600001")  # warm the platform settings cache
+    with QueryCounter(db.engine) as few:
+        client.get("/tractors?pincode=600001")
+
+    owner = make_user("owner", 99)
+    for index in range(45):
+        make_tractor(owner, 100 + index)
+    db.session.commit()
+    with QueryCounter(db.engine) as many:
+        response = client.get("/tractors?pincode=600001")
+
+    assert response.json["count"] == 50
+    assert many.count == few.count
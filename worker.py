@@ -0,0 +1,8 @@
+from app import create_app
+from app.services import JobService
+
+app = create_app()
+
+if __name__ == "__main__":
+    with app.app_context():
+        JobService.run_worker()